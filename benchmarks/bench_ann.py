@@ -0,0 +1,49 @@
+"""
+Benchmark the IVF approximate search backend against exact gallery search.
+Reports recall@1 and per-query latency for several nprobe settings.
+
+Usage:
+    python benchmarks/bench_ann.py --identities 5000 --samples 30
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core.gallery_index import GalleryIndex
+from src.core.ann_index import IVFIndex, measure_recall
+from benchmarks.synthetic import make_gallery, make_queries
+
+def main():
+    parser = argparse.ArgumentParser(description="IVF recall/latency benchmark")
+    parser.add_argument("--identities", type=int, default=1000, help="Number of enrolled users")
+    parser.add_argument("--samples", type=int, default=30, help="Samples per user")
+    parser.add_argument("--dim", type=int, default=2564, help="Feature dimensionality")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries")
+    parser.add_argument("--nlist", type=int, default=None, help="Number of IVF cells")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32],
+                        help="nprobe values to evaluate")
+    args = parser.parse_args()
+
+    print(f"🔄 Generating {args.identities} x {args.samples} gallery ({args.dim} dims)...")
+    feature_dict = make_gallery(args.identities, args.samples, args.dim)
+    queries, _ = make_queries(feature_dict, args.queries)
+
+    exact = GalleryIndex.from_feature_dict(feature_dict)
+    start = time.perf_counter()
+    ivf = IVFIndex.from_feature_dict(feature_dict, nlist=args.nlist)
+    print(f"✅ Exact index: {exact.size} samples, {exact.memory_footprint() / 1024 / 1024:.1f} MB")
+    print(f"✅ IVF index: {ivf.nlist} cells, trained in {time.perf_counter() - start:.2f} s")
+
+    print(f"\n{'nprobe':>8} {'recall@1':>10} {'id recall':>10} {'exact ms':>10} {'ivf ms':>10} {'speedup':>8}")
+    for nprobe in args.nprobe:
+        result = measure_recall(exact, ivf, queries, nprobe=nprobe)
+        speedup = result["exact_ms"] / result["ann_ms"] if result["ann_ms"] > 0 else float("inf")
+        print(f"{nprobe:>8} {result['recall_at_1']:>10.3f} {result['identity_recall_at_1']:>10.3f} "
+              f"{result['exact_ms']:>10.2f} {result['ann_ms']:>10.2f} {speedup:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark face detection latency and recall against the detection width.
+Each width is compared with detection at native resolution: a face counts as
+found when a box at the reduced width overlaps a native box with IoU >= 0.5.
+
+Recall needs frames with faces, use a recording or a folder of face images;
+synthetic frames only measure latency.
+
+Usage:
+    python benchmarks/bench_detection_scale.py --video recording.mp4 --widths 160 240 320 480
+    python benchmarks/bench_detection_scale.py --images data/faces --min-face 40
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core.face_detector import create_detector
+from src.core.tracker import box_iou
+
+def load_frames(video, images, count, width, height, seed=0):
+    """Read frames from a video file or image folder, or generate synthetic frames."""
+    if video:
+        cap = cv2.VideoCapture(video)
+        frames = []
+        while len(frames) < count:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(frame)
+        cap.release()
+        return frames
+
+    if images:
+        paths = sorted(glob.glob(os.path.join(images, '**', '*.jpg'), recursive=True) +
+                       glob.glob(os.path.join(images, '**', '*.png'), recursive=True))
+        frames = [cv2.imread(path) for path in paths[:count]]
+        return [frame for frame in frames if frame is not None]
+
+    rng = np.random.default_rng(seed)
+    base = cv2.GaussianBlur(rng.integers(0, 256, (height, width, 3), dtype=np.uint8), (15, 15), 0)
+    return [np.roll(base, shift * 7, axis=1) for shift in range(count)]
+
+def run_detection(detector, frames):
+    """Detect faces in every frame, returning the boxes per frame and ms/frame."""
+    boxes = []
+    start = time.perf_counter()
+    for frame in frames:
+        boxes.append(detector.detect(frame))
+    return boxes, (time.perf_counter() - start) * 1000 / len(frames)
+
+def recall(reference, boxes, iou_threshold=0.5):
+    """Fraction of reference boxes matched by a box with enough overlap."""
+    total = sum(len(frame_boxes) for frame_boxes in reference)
+    if total == 0:
+        return None
+    found = 0
+    for expected, detected in zip(reference, boxes):
+        found += sum(1 for box in expected if any(box_iou(box, other) >= iou_threshold for other in detected))
+    return found / total
+
+def main():
+    parser = argparse.ArgumentParser(description="Face detection latency and recall per detection width")
+    parser.add_argument("--widths", type=int, nargs="+", default=[160, 240, 320, 480], help="Detection widths to test")
+    parser.add_argument("--video", help="Read frames from a video file")
+    parser.add_argument("--images", help="Read frames from a folder of images")
+    parser.add_argument("--frames", type=int, default=100, help="Number of frames")
+    parser.add_argument("--backend", default="haar", help="Face detector backend")
+    parser.add_argument("--min-face", type=int, default=None, help="Minimum face size in full-resolution pixels")
+    parser.add_argument("--width", type=int, default=1280, help="Synthetic frame width")
+    parser.add_argument("--height", type=int, default=720, help="Synthetic frame height")
+    args = parser.parse_args()
+
+    frames = load_frames(args.video, args.images, args.frames, args.width, args.height)
+    if not frames:
+        print("❌ No frames to benchmark")
+        return
+    print(f"✅ {len(frames)} frames of {frames[0].shape[1]}x{frames[0].shape[0]}")
+
+    detector = create_detector(args.backend)
+    if args.min_face is not None:
+        detector.min_face_size = args.min_face
+
+    detector.detection_width = None
+    reference, native_ms = run_detection(detector, frames)
+    face_count = sum(len(frame_boxes) for frame_boxes in reference)
+    if face_count == 0:
+        print("⚠️ No faces found at native resolution, reporting latency only")
+
+    print(f"\n{'width':>8} {'ms/frame':>9} {'speed-up':>9} {'faces':>6} {'recall':>7}")
+    print(f"{'native':>8} {native_ms:>9.2f} {1.0:>8.2f}x {face_count:>6} {'-':>7}")
+    for width in args.widths:
+        detector.detection_width = width
+        boxes, ms = run_detection(detector, frames)
+        value = recall(reference, boxes)
+        recall_text = "-" if value is None else f"{value:.1%}"
+        print(f"{width:>8} {ms:>9.2f} {native_ms / ms:>8.2f}x {sum(len(b) for b in boxes):>6} {recall_text:>7}")
+
+if __name__ == "__main__":
+    main()
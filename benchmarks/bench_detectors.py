@@ -0,0 +1,68 @@
+"""
+Benchmark the face detector backends on the same frames.
+Reports detection latency per frame and recall against a reference backend
+(a face counts as found when a box overlaps a reference box with IoU >= 0.5).
+Backends whose model files are missing fall back to Haar and are skipped.
+
+Recall needs frames with faces, use a recording or a folder of face images;
+synthetic frames only measure latency.
+
+Usage:
+    python benchmarks/bench_detectors.py --video recording.mp4
+    python benchmarks/bench_detectors.py --images data/faces --reference yunet --width 480
+"""
+
+import argparse
+import os
+import sys
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core.face_detector import BACKENDS, create_detector
+from benchmarks.bench_detection_scale import load_frames, run_detection, recall
+
+def main():
+    parser = argparse.ArgumentParser(description="Face detector backend latency and recall benchmark")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), help="Backends to test")
+    parser.add_argument("--reference", default="haar", help="Backend whose detections count as ground truth")
+    parser.add_argument("--video", help="Read frames from a video file")
+    parser.add_argument("--images", help="Read frames from a folder of images")
+    parser.add_argument("--frames", type=int, default=100, help="Number of frames")
+    parser.add_argument("--width", type=int, default=None,
+                        help="Detection width for every backend (default: DETECTION_WIDTH)")
+    parser.add_argument("--frame-width", type=int, default=1280, help="Synthetic frame width")
+    parser.add_argument("--frame-height", type=int, default=720, help="Synthetic frame height")
+    args = parser.parse_args()
+
+    frames = load_frames(args.video, args.images, args.frames, args.frame_width, args.frame_height)
+    if not frames:
+        print("❌ No frames to benchmark")
+        return
+    print(f"✅ {len(frames)} frames of {frames[0].shape[1]}x{frames[0].shape[0]}")
+
+    def make(backend):
+        detector = create_detector(backend)
+        if args.width is not None:
+            detector.detection_width = args.width
+        return detector
+
+    reference_detector = make(args.reference)
+    reference, _ = run_detection(reference_detector, frames)
+    if sum(len(boxes) for boxes in reference) == 0:
+        print(f"⚠️ The {reference_detector.name} reference found no faces, reporting latency only")
+
+    print(f"\n{'backend':>8} {'ms/frame':>9} {'faces':>6} {'recall':>7}")
+    for backend in args.backends:
+        detector = make(backend)
+        if detector.name != backend:
+            print(f"{backend:>8} {'skipped, model file not found':>24}")
+            continue
+        # Warm up (DNN backends allocate their buffers on the first frame)
+        detector.detect(frames[0])
+        boxes, ms = run_detection(detector, frames)
+        value = recall(reference, boxes)
+        recall_text = "-" if value is None else f"{value:.1%}"
+        print(f"{backend:>8} {ms:>9.2f} {sum(len(b) for b in boxes):>6} {recall_text:>7}")
+
+if __name__ == "__main__":
+    main()
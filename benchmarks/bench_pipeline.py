@@ -0,0 +1,75 @@
+"""
+Benchmark the full attendance pipeline on recorded footage.
+Replays a video file or image folder through AttendanceProcessor as fast as
+possible (motion gate, scheduler, detection, tracking, recognition and
+attendance recording) and reports the throughput and per-frame latency.
+
+Attendance is recorded in a temporary copy of the configured database, so
+replays see the registered users without changing the real records.
+
+Usage:
+    python benchmarks/bench_pipeline.py --source recording.mp4
+    python benchmarks/bench_pipeline.py --source data/replay_frames --workers 0 2 --frames 500
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+import cv2
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core.attendance import AttendanceProcessor
+from src.core.frame_source import open_source
+from src.core.pipeline import run_source
+from benchmarks.bench_motion_gate import synthetic_clip
+from config.settings import DB_PATH
+
+def write_synthetic_source(directory, frames):
+    """Write the synthetic idle/busy clip of bench_motion_gate as an image folder."""
+    for i, frame in enumerate(synthetic_clip(frames // 2, frames - frames // 2, 640, 480)):
+        cv2.imwrite(os.path.join(directory, f"frame_{i:05d}.png"), frame)
+
+def main():
+    parser = argparse.ArgumentParser(description="Full attendance pipeline replay benchmark")
+    parser.add_argument("--source", help="Video file or image folder (default: synthetic clip)")
+    parser.add_argument("--frames", type=int, default=None, help="Stop after this many frames")
+    parser.add_argument("--workers", type=int, nargs="+", default=[0], help="Recognition worker counts to test")
+    args = parser.parse_args()
+
+    temp_dir = tempfile.mkdtemp(prefix="bench_pipeline_")
+    try:
+        source_path = args.source
+        if source_path is None:
+            source_path = os.path.join(temp_dir, "frames")
+            os.makedirs(source_path)
+            write_synthetic_source(source_path, args.frames or 300)
+
+        db_path = os.path.join(temp_dir, "facebase.db")
+        if os.path.exists(DB_PATH):
+            shutil.copy(DB_PATH, db_path)
+
+        print(f"\n{'workers':>8} {'frames':>7} {'frames/s':>9} {'ms/frame':>9} {'with faces':>11} {'detections':>11}")
+        for workers in args.workers:
+            source = open_source(source_path, realtime=False)
+            if not source.is_opened():
+                print(f"❌ Could not open source: {source_path}")
+                return
+            processor = AttendanceProcessor(workers, db_path)
+            try:
+                stats = run_source(source, processor, args.frames)
+                detections = processor.scheduler.detection_count
+            finally:
+                processor.close()
+                source.release()
+            ms = stats["seconds"] * 1000 / max(1, stats["frames"])
+            print(f"{workers:>8} {stats['frames']:>7} {stats['fps']:>9.1f} {ms:>9.2f} "
+                  f"{stats['frames_with_faces']:>11} {detections:>11}")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark PCA dimensionality reduction of the face descriptor.
+Reports identification accuracy, per-query latency and gallery memory for several target dimensions.
+
+Usage:
+    python benchmarks/bench_projection.py --dims 64 128 256
+    python benchmarks/bench_projection.py --embeddings data/models/face_embeddings.pkl
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import time
+
+import numpy as np
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core.gallery_index import GalleryIndex
+from src.core.projection import PCAProjection
+from benchmarks.synthetic import make_gallery, make_queries
+
+def split_embeddings(path):
+    """Split stored embeddings into gallery (even samples) and queries (odd samples)."""
+    with open(path, 'rb') as f:
+        feature_dict = pickle.load(f)
+
+    gallery = {}
+    queries = []
+    truth = []
+    for user_id, features in feature_dict.items():
+        gallery[user_id] = features[0::2]
+        queries.extend(features[1::2])
+        truth.extend([user_id] * len(features[1::2]))
+    return gallery, np.array(queries, dtype=np.float32), np.array(truth, dtype=object)
+
+def evaluate(index, queries, truth):
+    """Return (accuracy, mean ms per query) for one-at-a-time top-1 search."""
+    predicted = np.empty(len(queries), dtype=np.int64)
+    start = time.perf_counter()
+    for q, query in enumerate(queries):
+        predicted[q] = index.search(query[np.newaxis], k=1)[1][0, 0]
+    elapsed = (time.perf_counter() - start) * 1000 / len(queries)
+    return float(np.mean(index.label_of(predicted) == truth)), elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="PCA projection accuracy/latency benchmark")
+    parser.add_argument("--embeddings", help="Use a stored embeddings pickle instead of synthetic data")
+    parser.add_argument("--identities", type=int, default=1000, help="Number of synthetic users")
+    parser.add_argument("--samples", type=int, default=30, help="Synthetic samples per user")
+    parser.add_argument("--queries", type=int, default=300, help="Number of synthetic queries")
+    parser.add_argument("--spread", type=float, default=1.2, help="Synthetic intra-user noise level")
+    parser.add_argument("--dims", type=int, nargs="+", default=[64, 128, 256], help="Target dimensions")
+    parser.add_argument("--whiten", action="store_true", help="Use whitened PCA")
+    args = parser.parse_args()
+
+    if args.embeddings:
+        gallery, queries, truth = split_embeddings(args.embeddings)
+        print(f"✅ Loaded {len(gallery)} users from {args.embeddings}, {len(queries)} held-out queries")
+    else:
+        gallery = make_gallery(args.identities, args.samples, spread=args.spread)
+        queries, truth = make_queries(gallery, args.queries, spread=args.spread)
+        print(f"✅ Generated {args.identities} x {args.samples} synthetic gallery, {len(queries)} queries")
+
+    all_features = np.array([f for features in gallery.values() for f in features], dtype=np.float32)
+
+    print(f"\n{'dims':>6} {'accuracy':>9} {'ms/query':>9} {'gallery MB':>11} {'variance':>9}")
+    index = GalleryIndex.from_feature_dict(gallery)
+    accuracy, ms = evaluate(index, queries, truth)
+    print(f"{index.dim:>6} {accuracy:>9.3f} {ms:>9.3f} {index.memory_footprint() / 1024 / 1024:>11.1f} {'100.0%':>9}")
+
+    for dims in args.dims:
+        projection = PCAProjection(dims, whiten=args.whiten).fit(all_features)
+        projected = {user_id: projection.transform(np.asarray(features)) for user_id, features in gallery.items()}
+        index = GalleryIndex.from_feature_dict(projected)
+        accuracy, ms = evaluate(index, projection.transform(queries), truth)
+        retained = projection.explained_variance_ratio.sum() * 100
+        memory = (index.memory_footprint() + projection.memory_footprint()) / 1024 / 1024
+        print(f"{projection.n_components:>6} {accuracy:>9.3f} {ms:>9.3f} {memory:>11.1f} {retained:>8.1f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark the two-stage prototype prefilter against exhaustive gallery search.
+Reports top-1 agreement, distance computations saved and per-query latency.
+
+Usage:
+    python benchmarks/bench_prototypes.py --identities 2000 --prototypes 1 5
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core.gallery_index import GalleryIndex
+from src.core.prototypes import PrototypeMatcher, compute_prototype_dict
+from benchmarks.synthetic import make_gallery, make_queries
+
+def time_queries(searcher, queries):
+    """Run queries one at a time and return (top-1 indices, mean ms per query)."""
+    indices = np.empty(len(queries), dtype=np.int64)
+    start = time.perf_counter()
+    for q, query in enumerate(queries):
+        indices[q] = searcher.search(query[np.newaxis], k=1)[1][0, 0]
+    return indices, (time.perf_counter() - start) * 1000 / len(queries)
+
+def main():
+    parser = argparse.ArgumentParser(description="Prototype prefilter benchmark")
+    parser.add_argument("--identities", type=int, default=1000, help="Number of enrolled users")
+    parser.add_argument("--samples", type=int, default=30, help="Samples per user")
+    parser.add_argument("--dim", type=int, default=2564, help="Feature dimensionality")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries")
+    parser.add_argument("--prototypes", type=int, nargs="+", default=[1, 5], help="Prototypes per user")
+    parser.add_argument("--top-m", type=int, nargs="+", default=[1, 5, 20], help="Candidate users rescored")
+    args = parser.parse_args()
+
+    print(f"🔄 Generating {args.identities} x {args.samples} gallery ({args.dim} dims)...")
+    feature_dict = make_gallery(args.identities, args.samples, args.dim)
+    queries, _ = make_queries(feature_dict, args.queries)
+
+    index = GalleryIndex.from_feature_dict(feature_dict)
+    exact_indices, exact_ms = time_queries(index, queries)
+    exact_labels = index.label_of(exact_indices)
+    print(f"✅ Exhaustive search: {index.size} comparisons, {exact_ms:.2f} ms per query")
+
+    print(f"\n{'protos':>7} {'top-M':>6} {'agree':>7} {'comparisons':>12} {'reduction':>10} {'ms':>8}")
+    for n_prototypes in args.prototypes:
+        prototype_dict = compute_prototype_dict(feature_dict, n_prototypes)
+        for top_m in args.top_m:
+            matcher = PrototypeMatcher(index, prototype_dict, top_m=top_m)
+            indices, ms = time_queries(matcher, queries)
+            stats = matcher.get_stats()
+            agree = np.mean(index.label_of(indices) == exact_labels)
+            per_query = stats["distance_computations"] / stats["queries"]
+            print(f"{n_prototypes:>7} {top_m:>6} {agree:>7.3f} {per_query:>12.0f} "
+                  f"{stats['reduction']:>9.1f}x {ms:>8.2f}")
+
+if __name__ == "__main__":
+    main()
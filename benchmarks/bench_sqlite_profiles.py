@@ -0,0 +1,122 @@
+"""
+Benchmark the SQLite connection profiles under concurrent reads and writes.
+One writer thread records attendance (one event and one commit per write, like
+the synchronous recording path) while reader threads run the queries of the
+analytics window, each thread on its own connection as in the application.
+Reports writes/s, reads/s, the slowest write and the writes that failed
+(e.g. "database is locked") for every profile in SQLITE_PROFILES.
+
+Usage:
+    python benchmarks/bench_sqlite_profiles.py
+    python benchmarks/bench_sqlite_profiles.py --readers 4 --seconds 10 --profiles default wal
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.database.db_manager import DatabaseManager
+from config.settings import SQLITE_PROFILES
+
+def prepare_database(db_path, profile, users, days):
+    """Create a database with registered users and some attendance history."""
+    db = DatabaseManager(db_path, profile)
+    db.cursor.executemany("INSERT INTO users (id, name) VALUES (?, ?)",
+                          [(str(i), f"User {i}") for i in range(users)])
+    start = date(2020, 1, 1)
+    events = [(str(i), f"User {i}", (start + timedelta(days=d)).isoformat(), "09:00:00")
+              for d in range(days) for i in range(users)]
+    db.record_attendance_many(events)
+    db.close()
+
+def writer(db_path, profile, users, stop_event, result):
+    """Record one attendance event per commit until stopped."""
+    db = DatabaseManager(db_path, profile)
+    day = date(2030, 1, 1)
+    i = 0
+    while not stop_event.is_set():
+        user_id = str(i % users)
+        if i and i % users == 0:
+            day += timedelta(days=1)
+        start = time.perf_counter()
+        outcome = db.record_attendance_many([(user_id, f"User {user_id}", day.isoformat(), "09:00:00")])
+        result["slowest_ms"] = max(result["slowest_ms"], (time.perf_counter() - start) * 1000)
+        if outcome is None:
+            result["failed"] += 1
+        else:
+            result["writes"] += 1
+        i += 1
+    db.close()
+
+def reader(db_path, profile, stop_event, result, lock):
+    """Run the analytics queries until stopped."""
+    db = DatabaseManager(db_path, profile)
+    reads = 0
+    while not stop_event.is_set():
+        for period in ('daily', 'monthly', None):
+            db.get_attendance_statistics(period)
+        db.get_attendance_records(date="2020-01-01")
+        reads += 1
+    db.close()
+    with lock:
+        result["reads"] += reads
+
+def run_profile(profile, readers, seconds, users, days, temp_dir):
+    """Run the concurrent workload against a fresh database with one profile."""
+    db_path = os.path.join(temp_dir, f"{profile}.db")
+    prepare_database(db_path, profile, users, days)
+
+    write_result = {"writes": 0, "failed": 0, "slowest_ms": 0.0}
+    read_result = {"reads": 0}
+    lock = threading.Lock()
+    stop_event = threading.Event()
+    threads = [threading.Thread(target=writer, args=(db_path, profile, users, stop_event, write_result))]
+    threads += [threading.Thread(target=reader, args=(db_path, profile, stop_event, read_result, lock))
+                for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop_event.set()
+    for thread in threads:
+        thread.join()
+
+    return {
+        "writes_per_s": write_result["writes"] / seconds,
+        "reads_per_s": read_result["reads"] / seconds,
+        "slowest_write_ms": write_result["slowest_ms"],
+        "failed": write_result["failed"],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite connection profile benchmark")
+    parser.add_argument("--profiles", nargs="+", default=list(SQLITE_PROFILES), help="Profiles to compare")
+    parser.add_argument("--readers", type=int, default=2, help="Concurrent reader threads")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each run")
+    parser.add_argument("--users", type=int, default=200, help="Registered users")
+    parser.add_argument("--days", type=int, default=60, help="Days of attendance history")
+    args = parser.parse_args()
+
+    # Failed writes are counted, not logged
+    logging.disable(logging.CRITICAL)
+    temp_dir = tempfile.mkdtemp(prefix="bench_sqlite_")
+    try:
+        print(f"\n{args.users} users, {args.users * args.days} attendance records, "
+              f"1 writer and {args.readers} readers for {args.seconds:.0f} s per profile")
+        print(f"\n{'profile':<12} {'writes/s':>9} {'reads/s':>8} {'slowest write':>14} {'failed':>7}")
+        for profile in args.profiles:
+            stats = run_profile(profile, args.readers, args.seconds, args.users, args.days, temp_dir)
+            print(f"{profile:<12} {stats['writes_per_s']:>9.1f} {stats['reads_per_s']:>8.1f} "
+                  f"{stats['slowest_write_ms']:>11.1f} ms {stats['failed']:>7}")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
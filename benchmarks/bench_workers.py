@@ -0,0 +1,87 @@
+"""
+Benchmark recognition throughput against the number of worker processes.
+Reports frames per second and speed-up for in-process recognition and for
+RecognitionPool with an increasing number of workers.
+
+Usage:
+    python benchmarks/bench_workers.py --workers 1 2 4 8
+    python benchmarks/bench_workers.py --video recording.mp4 --frames 200
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core.face_recognition import FaceRecognizer
+from src.core.recognition_pool import RecognitionPool
+
+def load_frames(video, count, width, height, seed=0):
+    """Read frames from a video file, or generate textured synthetic frames."""
+    if video:
+        cap = cv2.VideoCapture(video)
+        frames = []
+        while len(frames) < count:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(frame)
+        cap.release()
+        return frames
+
+    rng = np.random.default_rng(seed)
+    base = cv2.GaussianBlur(rng.integers(0, 256, (height, width, 3), dtype=np.uint8), (15, 15), 0)
+    return [np.roll(base, shift * 7, axis=1) for shift in range(count)]
+
+def run_local(frames):
+    """Detect and recognize every frame in this process, returning frames/sec."""
+    recognizer = FaceRecognizer()
+    start = time.perf_counter()
+    for frame in frames:
+        regions = recognizer.detect_faces(frame)
+        recognizer.recognize_faces([region[5] for region in regions])
+    return len(frames) / (time.perf_counter() - start)
+
+def run_pool(frames, workers):
+    """Detect and recognize every frame with a worker pool, returning frames/sec."""
+    pool = RecognitionPool(workers)
+    try:
+        # Start the workers outside the timed region
+        pool.recognize_frames(frames[:workers])
+
+        start = time.perf_counter()
+        batch = workers * 2
+        for i in range(0, len(frames), batch):
+            pool.recognize_frames(frames[i:i + batch])
+        return len(frames) / (time.perf_counter() - start)
+    finally:
+        pool.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Recognition worker pool throughput benchmark")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Worker counts to test")
+    parser.add_argument("--video", help="Read frames from a video file instead of synthetic frames")
+    parser.add_argument("--frames", type=int, default=120, help="Number of frames")
+    parser.add_argument("--width", type=int, default=640, help="Synthetic frame width")
+    parser.add_argument("--height", type=int, default=480, help="Synthetic frame height")
+    args = parser.parse_args()
+    if min(args.workers) < 1:
+        parser.error("--workers counts must be at least 1 (in-process recognition is always measured)")
+
+    frames = load_frames(args.video, args.frames, args.width, args.height)
+    print(f"✅ {len(frames)} frames of {frames[0].shape[1]}x{frames[0].shape[0]}, {os.cpu_count()} CPU cores")
+
+    baseline = run_local(frames)
+    print(f"\n{'workers':>8} {'frames/s':>9} {'speed-up':>9}")
+    print(f"{'local':>8} {baseline:>9.1f} {1.0:>8.2f}x")
+    for workers in args.workers:
+        fps = run_pool(frames, workers)
+        print(f"{workers:>8} {fps:>9.1f} {fps / baseline:>8.2f}x")
+
+if __name__ == "__main__":
+    main()
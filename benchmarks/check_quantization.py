@@ -0,0 +1,96 @@
+"""
+Accuracy regression check for quantized gallery storage.
+Compares float32, float16 and int8 matching with a float64 reference and
+reports file size, load time and memory for each mode. Exits with status 1
+if any mode drifts beyond the allowed tolerances.
+
+Usage:
+    python benchmarks/check_quantization.py
+    python benchmarks/check_quantization.py --embeddings data/models/face_embeddings.bin
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core.gallery_index import GalleryIndex
+from src.core.embedding_store import EmbeddingStore, load_feature_dict
+from config.settings import STRANGER_THRESHOLD
+from benchmarks.synthetic import make_gallery, make_queries
+
+# Tolerances for a mode to pass the check
+MIN_IDENTITY_AGREEMENT = 0.99
+MAX_DISTANCE_ERROR = 0.01
+
+def reference_search(feature_dict, queries):
+    """Exact float64 top-1 search, returning (labels, distances)."""
+    labels = [user_id for user_id, features in feature_dict.items() for _ in features]
+    matrix = np.array([f for features in feature_dict.values() for f in features], dtype=np.float64)
+    scores = queries.astype(np.float64) @ matrix.T
+    best = np.argmax(scores, axis=1)
+    return np.array(labels, dtype=object)[best], 1.0 - scores[np.arange(len(queries)), best]
+
+def main():
+    parser = argparse.ArgumentParser(description="Quantized storage accuracy regression check")
+    parser.add_argument("--embeddings", help="Check a stored embeddings file instead of synthetic data")
+    parser.add_argument("--identities", type=int, default=500, help="Number of synthetic users")
+    parser.add_argument("--samples", type=int, default=30, help="Synthetic samples per user")
+    parser.add_argument("--queries", type=int, default=300, help="Number of queries")
+    args = parser.parse_args()
+
+    if args.embeddings:
+        if args.embeddings.endswith('.pkl'):
+            feature_dict = load_feature_dict(args.embeddings)
+        else:
+            feature_dict = EmbeddingStore.open(args.embeddings).to_feature_dict()
+        print(f"✅ Loaded {len(feature_dict)} users from {args.embeddings}")
+    else:
+        feature_dict = make_gallery(args.identities, args.samples)
+        print(f"✅ Generated {args.identities} x {args.samples} synthetic gallery")
+    queries, _ = make_queries(feature_dict, args.queries)
+
+    reference_labels, reference_distances = reference_search(feature_dict, queries)
+    reference_known = reference_distances < STRANGER_THRESHOLD
+
+    print(f"\n{'storage':>8} {'id agree':>9} {'known agree':>12} {'max dist err':>13} "
+          f"{'file MB':>8} {'load ms':>8} {'index MB':>9}  result")
+
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for storage in ['float64', 'float32', 'float16', 'int8']:
+            # On-disk round trip
+            path = os.path.join(tmp_dir, f"embeddings_{storage}.bin")
+            EmbeddingStore.write(path, feature_dict, storage)
+            start = time.perf_counter()
+            store = EmbeddingStore.open(path)
+
+            # Index in the same precision (float64 files are indexed as float32)
+            index_storage = 'float32' if storage == 'float64' else storage
+            index = GalleryIndex(store.matrix, store.labels, store.user_ids, storage=index_storage, scales=store.scales)
+            load_ms = (time.perf_counter() - start) * 1000
+            distances, indices = index.search(queries, k=1)
+            labels = index.label_of(indices[:, 0])
+
+            identity_agreement = np.mean(labels == reference_labels)
+            known_agreement = np.mean((distances[:, 0] < STRANGER_THRESHOLD) == reference_known)
+            distance_error = np.max(np.abs(distances[:, 0] - reference_distances))
+            passed = identity_agreement >= MIN_IDENTITY_AGREEMENT and distance_error <= MAX_DISTANCE_ERROR
+            failed = failed or not passed
+
+            print(f"{storage:>8} {identity_agreement:>9.3f} {known_agreement:>12.3f} {distance_error:>13.5f} "
+                  f"{os.path.getsize(path) / 1024 / 1024:>8.2f} {load_ms:>8.1f} "
+                  f"{index.memory_footprint() / 1024 / 1024:>9.2f}  {'PASS' if passed else 'FAIL'}")
+
+    if failed:
+        print("❌ Quantized storage accuracy regression detected")
+        sys.exit(1)
+    print("✅ All storage modes within tolerance")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Synthetic face-feature galleries for the benchmark scripts.
+Generates identity clusters shaped like the 2,564-dim descriptor without needing camera data.
+"""
+
+import numpy as np
+
+def make_gallery(identities=1000, samples=30, dim=2564, spread=0.6, seed=0):
+    """
+    Build a {user_id: [feature, ...]} dictionary of L2-normalized vectors.
+    Each identity is a random non-negative centre; samples are noisy copies of it,
+    'spread' controlling how far pose samples drift from the centre.
+    """
+    rng = np.random.default_rng(seed)
+    feature_dict = {}
+    for identity in range(identities):
+        centre = np.abs(rng.standard_normal(dim)).astype(np.float32)
+        centre /= np.linalg.norm(centre)
+        noise = rng.standard_normal((samples, dim)).astype(np.float32) * spread / np.sqrt(dim)
+        vectors = centre + noise
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        feature_dict[str(identity + 1)] = list(vectors)
+    return feature_dict
+
+def make_queries(feature_dict, count=200, spread=0.6, seed=1):
+    """
+    Draw query vectors as fresh noisy views of random enrolled samples.
+    Returns (queries, true_user_ids).
+    """
+    rng = np.random.default_rng(seed)
+    user_ids = list(feature_dict.keys())
+    dim = len(feature_dict[user_ids[0]][0])
+
+    truth = [user_ids[i] for i in rng.integers(0, len(user_ids), count)]
+    queries = np.empty((count, dim), dtype=np.float32)
+    for q, user_id in enumerate(truth):
+        samples = feature_dict[user_id]
+        base = samples[rng.integers(0, len(samples))]
+        vector = base + rng.standard_normal(dim).astype(np.float32) * spread / np.sqrt(dim)
+        queries[q] = vector / np.linalg.norm(vector)
+    return queries, np.array(truth, dtype=object)
@@ -12,14 +12,83 @@ MODELS_DIR = os.path.join(DATA_DIR, 'models')
 
 # Database settings
 DB_PATH = os.path.join(BASE_DIR, 'facebase.db')
+USER_CACHE_SIZE = 10000  # Users kept in the in-memory user directory (least recently used are evicted)
+USER_CACHE_TTL = 300  # Seconds before a cached user is reloaded, picks up changes made by other processes
+ATTENDANCE_WRITE_BEHIND = True  # Record attendance on a background writer thread instead of in the frame loop
+ATTENDANCE_BATCH_SIZE = 50  # Attendance events written per transaction by the background writer
+ATTENDANCE_FLUSH_INTERVAL = 0.5  # Seconds the background writer waits to fill a batch
+SQLITE_PROFILE = "wal"  # Connection profile applied to every database connection (a key of SQLITE_PROFILES)
+SQLITE_PROFILES = {
+    # SQLite defaults: rollback journal, readers block the attendance writer and vice versa
+    "default": {"journal_mode": "DELETE", "synchronous": "FULL", "cache_size": -2000,
+                "mmap_size": 0, "temp_store": "DEFAULT", "busy_timeout": 5000},
+    # Write-ahead log: readers and the writer run concurrently, commits skip the fsync until checkpoints
+    "wal": {"journal_mode": "WAL", "synchronous": "NORMAL", "cache_size": -16000,
+            "mmap_size": 268435456, "temp_store": "MEMORY", "busy_timeout": 5000},
+    # Write-ahead log with an fsync on every commit, no committed record is lost on power failure
+    "wal_durable": {"journal_mode": "WAL", "synchronous": "FULL", "cache_size": -16000,
+                    "mmap_size": 268435456, "temp_store": "MEMORY", "busy_timeout": 5000},
+}
 
 # Face recognition settings
+FACE_DETECTOR = "haar"  # Detection backend: "haar", "lbp" (faster cascade), "yunet" or "ssd" (OpenCV DNN models)
 FACE_CASCADE_PATH = "haarcascade_frontalface_default.xml"
-EMBEDDINGS_PATH = os.path.join(MODELS_DIR, 'face_embeddings.pkl')
+LBP_CASCADE_PATH = os.path.join(MODELS_DIR, 'lbpcascade_frontalface_improved.xml')  # From opencv/data/lbpcascades
+YUNET_MODEL_PATH = os.path.join(MODELS_DIR, 'face_detection_yunet_2023mar.onnx')  # From the OpenCV model zoo
+SSD_CONFIG_PATH = os.path.join(MODELS_DIR, 'deploy.prototxt')  # ResNet-10 SSD face detector from opencv/samples/dnn
+SSD_MODEL_PATH = os.path.join(MODELS_DIR, 'res10_300x300_ssd_iter_140000.caffemodel')
+DNN_CONFIDENCE = 0.6  # Minimum face score of the yunet and ssd detectors
+DETECTION_WIDTH = 320  # Width of the downscaled copy faces are detected on (None detects at full resolution)
+MIN_FACE_SIZE = 60  # Smallest face to detect, in pixels of the full-resolution frame
+EMBEDDINGS_PATH = os.path.join(MODELS_DIR, 'face_embeddings.pkl')  # Legacy pickle, see migrate_embeddings.py
+EMBEDDINGS_STORE_PATH = os.path.join(MODELS_DIR, 'face_embeddings.bin')
+EMBEDDINGS_SEGMENTS_DIR = os.path.join(MODELS_DIR, 'segments')  # Append-only enrollment segments not yet compacted
+PROTOTYPES_PATH = os.path.join(MODELS_DIR, 'face_prototypes.pkl')
+PROJECTION_PATH = os.path.join(MODELS_DIR, 'face_projection.pkl')
+EMBEDDING_STORAGE = "float32"  # On-disk feature precision: "float64", "float32", "float16" or "int8" (matching GALLERY_STORAGE avoids a copy at startup)
+MODEL_RELOAD_INTERVAL = 2.0  # Seconds between checks for newly enrolled users while attendance is running
+COMPACTION_SEGMENT_LIMIT = 8  # Merge enrollment segments into the base store in the background once this many are pending
 STRANGER_THRESHOLD = 0.5  # Threshold for cosine distance (0-1, lower is better match)
 
+# Gallery search settings
+SEARCH_BACKEND = "exact"  # "exact" brute-force search or "ivf" approximate search for very large galleries
+IVF_NLIST = None  # Number of IVF clusters (None uses about the square root of the gallery size)
+IVF_NPROBE = 8  # Clusters scanned per query: higher improves recall, lower reduces latency
+USE_PROTOTYPE_PREFILTER = False  # Match per-user prototypes first, then rescore only the closest users
+GALLERY_STORAGE = "float32"  # In-memory gallery precision: "float32", "float16" or "int8" (per-vector scale)
+PROTOTYPES_PER_USER = 1  # 1 uses the centroid, more uses k-means prototypes (e.g. one per capture pose)
+PROTOTYPE_TOP_M = 5  # Number of candidate users whose full samples are rescored
+
+# Dimensionality reduction settings
+PROJECTION_DIM = None  # PCA output size (e.g. 64-256), None keeps the full 2,564-dim descriptor
+PROJECTION_WHITEN = False  # Scale PCA components to unit variance
+PROJECTION_STRANGER_THRESHOLD = 0.5  # Cosine distance threshold used when the projection is active
+PROJECTION_REFIT_DRIFT = 0.05  # Refit between compactions once new samples lose this much more variance than the gallery
+
+# Attendance processing settings
+RECOGNITION_WORKERS = 0  # Worker processes for detection and recognition (0 runs them in the attendance process)
+DETECTION_POLICY = "adaptive"  # "every_frame", "fixed" (every DETECTION_INTERVAL frames) or "adaptive"
+DETECTION_INTERVAL = 3  # Detect on one frame out of N with the "fixed" policy
+DETECTION_MIN_INTERVAL = 1  # Adaptive interval while faces or motion are present
+DETECTION_MAX_INTERVAL = 10  # Adaptive interval reached when the scene stays empty and static
+CAMERA_FPS = 30  # Frame rate the display should keep up with (bounds the adaptive interval)
+MOTION_THRESHOLD = 4.0  # Mean pixel difference (0-255) between frame thumbnails counted as motion
+MOTION_GATE = True  # Skip face detection on static scenes and limit it to moving regions
+MOTION_GATE_METHOD = "difference"  # "difference" against a running average or "mog2" background subtractor
+MOTION_GATE_WIDTH = 160  # Width of the downscaled frame used for motion detection
+MOTION_PIXEL_THRESHOLD = 25  # Grey-level change (0-255) for a pixel to count as moving
+MOTION_MIN_AREA = 0.002  # Fraction of the frame that must move before detection runs
+MOTION_ROI_PADDING = 0.5  # Margin around moving regions, relative to their size
+MOTION_FULL_FRAME_AREA = 0.3  # Moving fraction above which the whole frame is searched
+TRACK_IOU_THRESHOLD = 0.3  # Minimum box overlap to continue a face track between detections
+TRACK_MAX_MISSED = 5  # Detections a track may go unmatched before it ends
+TRACK_RECHECK_INTERVAL = 15  # Detections between recognitions that confirm a track's identity
+TRACK_MIN_VOTES = 3  # Votes for the winning identity before attendance or a stranger is recorded for a track
+TRACK_VOTE_WINDOW = 15  # Most recent recognition votes kept per track
+
 # Camera settings
 CAMERA_INDEX = 1  # Default camera index (0 is usually the built-in webcam)
+FRAME_SOURCE = None  # Video file, RTSP/HTTP URL or image folder to read instead of the camera (None uses CAMERA_INDEX)
 
 # Image capture settings
 FACE_SAMPLE_COUNT = 30  # Number of face samples to capture per person
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""
+Convert the legacy pickle face features into the memory-mapped feature store.
+Run once after upgrading; training and recognition then use the new store.
+
+Usage:
+    python migrate_embeddings.py
+    python migrate_embeddings.py --storage int8
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from src.core.embedding_store import EmbeddingStore, migrate_pickle
+from config.settings import EMBEDDINGS_PATH, EMBEDDINGS_STORE_PATH, EMBEDDING_STORAGE
+
+def migrate_embeddings():
+    """Migrate the pickle feature file and verify the written store."""
+    parser = argparse.ArgumentParser(description="Migrate pickle face features to the binary store")
+    parser.add_argument("--input", default=EMBEDDINGS_PATH, help="Legacy pickle feature file")
+    parser.add_argument("--output", default=EMBEDDINGS_STORE_PATH, help="Feature store to create")
+    parser.add_argument("--storage", default=EMBEDDING_STORAGE, choices=['float64', 'float32', 'float16', 'int8'],
+                        help="Storage mode of the feature store")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"❌ Error: Pickle feature file not found at {args.input}")
+        return False
+    if os.path.exists(args.output):
+        print(f"⚠️ Overwriting existing feature store at {args.output}")
+
+    try:
+        print(f"🔄 Migrating {args.input} to {args.output} ({args.storage})...")
+        rows = migrate_pickle(args.input, args.output, args.storage)
+
+        start = time.perf_counter()
+        store = EmbeddingStore.open(args.output)
+        open_ms = (time.perf_counter() - start) * 1000
+        if store.size != rows:
+            print(f"❌ Error: Store holds {store.size} rows, expected {rows}")
+            return False
+
+        print(f"✅ Migrated {rows} features of {len(store.user_ids)} users "
+              f"({os.path.getsize(args.input) / 1024 / 1024:.1f} MB -> "
+              f"{os.path.getsize(args.output) / 1024 / 1024:.1f} MB, opens in {open_ms:.1f} ms)")
+        print(f"📊 The pickle file is no longer read and can be removed: {args.input}")
+        return True
+    except Exception as e:
+        print(f"❌ Error migrating features: {e}")
+        return False
+
+if __name__ == "__main__":
+    sys.exit(0 if migrate_embeddings() else 1)
@@ -0,0 +1,200 @@
+"""
+Approximate nearest-neighbour index for the Face Recognition Attendance System.
+Implements an inverted-file (IVF) cosine index in NumPy for very large galleries.
+"""
+
+import os
+import sys
+import time
+import numpy as np
+
+# Add project root to path to allow imports from src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.core.gallery_index import GalleryIndex
+from src.core.quantization import quantize
+from src.utils.vector_utils import assign_to_centroids, l2_normalize, spherical_kmeans
+
+# Number of samples per cluster used to train the coarse quantizer
+TRAINING_SAMPLES_PER_LIST = 64
+
+
+class IVFIndex(GalleryIndex):
+    """Inverted-file index over the gallery.
+
+    The mean-centred samples are clustered with spherical k-means into ``nlist`` cells and
+    stored contiguously cell by cell. A query is compared with the cell
+    centroids first and only the samples of the ``nprobe`` closest cells are
+    scored. Returned distances are exact cosine distances of the scanned
+    samples, so thresholds such as STRANGER_THRESHOLD keep their meaning; a
+    missed neighbour can only make a match look further away, never closer.
+    """
+
+    def __init__(self, matrix, labels, label_names, storage='float32', scales=None,
+                 nlist=None, nprobe=8, n_iter=10, seed=0):
+        """Create an IVF index from prepared arrays.
+
+        Args:
+            matrix: (N, D) array of L2-normalized features grouped by label
+            labels: (N,) array of indices into label_names
+            label_names: List of user IDs
+            storage: In-memory storage mode ('float32', 'float16' or 'int8')
+            scales: Per-row scales when matrix is already int8-quantized
+            nlist: Number of cells (defaults to about sqrt(N))
+            nprobe: Number of cells scanned per query
+            n_iter: k-means iterations used to train the cells
+            seed: Random seed for the k-means initialization
+        """
+        # Cells are trained on float32 data, the final storage is applied afterwards
+        super().__init__(matrix, labels, label_names, storage='float32', scales=scales)
+
+        if nlist is None:
+            nlist = int(np.sqrt(self.size))
+        self.nlist = max(1, min(nlist, self.size))
+        self.nprobe = nprobe
+        self.n_iter = n_iter
+        self.seed = seed
+        self.train()
+
+        if storage != 'float32':
+            self.matrix, self.scales = quantize(self.matrix, storage)
+            self.storage = storage
+
+    def train(self):
+        """Cluster the samples and reorder the matrix cell by cell."""
+        start = time.perf_counter()
+
+        # Descriptors share a large common component, so cluster them around
+        # their mean to get balanced cells. (x - mean) . c is computed as
+        # x . c - bias to avoid centring the whole matrix.
+        rng = np.random.default_rng(self.seed)
+        sample_size = min(self.size, self.nlist * TRAINING_SAMPLES_PER_LIST)
+        rows = np.sort(rng.choice(self.size, sample_size, replace=False))
+        self.mean = self.matrix.mean(axis=0)
+        sample = l2_normalize(self.matrix[rows] - self.mean)
+
+        self.centroids = spherical_kmeans(sample, self.nlist, n_iter=self.n_iter, seed=self.seed)
+        self.bias = self.centroids @ self.mean
+        assignments, _ = assign_to_centroids(self.matrix, self.centroids, self.bias)
+
+        # Store every cell as a contiguous slice of the matrix
+        order = np.argsort(assignments, kind='stable')
+        list_sizes = np.bincount(assignments, minlength=self.nlist)
+        self.list_offsets = np.concatenate(([0], np.cumsum(list_sizes))).astype(np.int64)
+        self.matrix = np.ascontiguousarray(self.matrix[order])
+        self.labels = np.ascontiguousarray(self.labels[order])
+
+        # Original row of each stored sample, and the identity-grouped order
+        self.row_ids = order.astype(np.int64)
+        self.identity_order = np.argsort(self.labels, kind='stable')
+
+        self.train_time = time.perf_counter() - start
+
+    def memory_footprint(self):
+        """Return the memory used by the index arrays in bytes."""
+        return (super().memory_footprint() + self.centroids.nbytes + self.mean.nbytes + self.list_offsets.nbytes
+                + self.row_ids.nbytes + self.identity_order.nbytes)
+
+    def probe_lists(self, queries, nprobe=None):
+        """Return the indices of the cells to scan for each query."""
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+        coarse = queries @ self.centroids.T - self.bias
+        if nprobe < self.nlist:
+            return np.argpartition(-coarse, nprobe - 1, axis=1)[:, :nprobe]
+        return np.broadcast_to(np.arange(self.nlist), (len(queries), self.nlist))
+
+    def search(self, queries, k=1, nprobe=None):
+        """Find the approximate k nearest samples of each query.
+
+        Args:
+            queries: (Q, D) array of L2-normalized query features
+            k: Number of neighbours to return
+            nprobe: Cells to scan (defaults to the index setting)
+
+        Returns:
+            tuple: (distances, indices) arrays of shape (Q, k) sorted by
+            increasing cosine distance
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        k = min(k, self.size)
+        distances = np.empty((len(queries), k))
+        indices = np.empty((len(queries), k), dtype=np.int64)
+        if k == 0:
+            return distances, indices
+
+        probes = self.probe_lists(queries, nprobe)
+        for q, (query, lists) in enumerate(zip(queries, probes)):
+            rows, scores = self._scan(query, lists)
+            if len(rows) < k:
+                # Not enough candidates in the probed cells, scan everything
+                rows, scores = self._scan(query, np.arange(self.nlist))
+
+            if k < len(rows):
+                top = np.argpartition(-scores, k - 1)[:k]
+            else:
+                top = np.arange(len(rows))
+            top = top[np.argsort(-scores[top])]
+
+            indices[q] = rows[top]
+            distances[q] = 1.0 - scores[top]
+
+        return np.clip(distances, 0.0, 2.0), indices
+
+    def _scan(self, query, lists):
+        """Score the samples of the given cells against one query."""
+        rows = []
+        scores = []
+        for cell in lists:
+            start, end = self.list_offsets[cell], self.list_offsets[cell + 1]
+            if end > start:
+                rows.append(np.arange(start, end))
+                scores.append(self.score_rows(query, start, end)[0])
+
+        if not rows:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        return np.concatenate(rows), np.concatenate(scores)
+
+    def best_per_identity(self, queries):
+        """Compute the exact best similarity of each query to every identity."""
+        scores = self.similarities(queries)[:, self.identity_order]
+        return np.maximum.reduceat(scores, self.offsets, axis=1)
+
+
+def measure_recall(exact_index, ann_index, queries, nprobe=None):
+    """Compare approximate top-1 results with exact search.
+
+    Queries are issued one at a time, as they are for a single face in a
+    camera frame, so the latencies reflect per-face matching cost.
+
+    Args:
+        exact_index: GalleryIndex built from the same features
+        ann_index: IVFIndex to evaluate
+        queries: (Q, D) array of L2-normalized query features
+        nprobe: Cells to scan (defaults to the index setting)
+
+    Returns:
+        dict: recall@1 on samples and on identities, and mean query latency
+        in milliseconds for both indexes
+    """
+    queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+    exact_indices = np.empty(len(queries), dtype=np.int64)
+    ann_indices = np.empty(len(queries), dtype=np.int64)
+
+    start = time.perf_counter()
+    for q, query in enumerate(queries):
+        exact_indices[q] = exact_index.search(query[np.newaxis], k=1)[1][0, 0]
+    exact_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for q, query in enumerate(queries):
+        ann_indices[q] = ann_index.search(query[np.newaxis], k=1, nprobe=nprobe)[1][0, 0]
+    ann_time = time.perf_counter() - start
+
+    same_sample = ann_index.row_ids[ann_indices] == exact_indices
+    same_identity = ann_index.label_of(ann_indices) == exact_index.label_of(exact_indices)
+
+    return {
+        "recall_at_1": float(np.mean(same_sample)),
+        "identity_recall_at_1": float(np.mean(same_identity)),
+        "exact_ms": exact_time * 1000 / len(queries),
+        "ann_ms": ann_time * 1000 / len(queries),
+    }
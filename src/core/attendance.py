@@ -7,21 +7,66 @@ import cv2
 import sys
 import os
 import logging
+import queue
 import time
 from datetime import datetime
 
 # Add project root to path to allow imports from config
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 from src.core.face_recognition import FaceRecognizer
+from src.core.recognition_pool import RecognitionPool
+from src.core.scheduler import DetectionScheduler
+from src.core.tracker import FaceTracker
+from src.core.motion import MotionGate
 from src.database.db_manager import DatabaseManager
+from src.database.attendance_writer import AttendanceWriter
+from config.settings import (RECOGNITION_WORKERS, DETECTION_POLICY, DETECTION_INTERVAL, DETECTION_MIN_INTERVAL,
+                             DETECTION_MAX_INTERVAL, CAMERA_FPS, MOTION_THRESHOLD, TRACK_IOU_THRESHOLD,
+                             TRACK_MAX_MISSED, TRACK_RECHECK_INTERVAL, TRACK_MIN_VOTES, TRACK_VOTE_WINDOW,
+                             MOTION_GATE, MOTION_GATE_METHOD, MOTION_GATE_WIDTH, MOTION_PIXEL_THRESHOLD,
+                             MOTION_MIN_AREA, MOTION_ROI_PADDING, MOTION_FULL_FRAME_AREA, DB_PATH,
+                             ATTENDANCE_WRITE_BEHIND)
 
 class AttendanceProcessor:
-    def __init__(self):
-        """Initialize components for attendance processing."""
-        self.face_recognizer = FaceRecognizer()
-        self.db_manager = DatabaseManager()
+    def __init__(self, workers=RECOGNITION_WORKERS, db_path=DB_PATH, face_recognizer=None, db_manager=None,
+                 attendance_writer=None):
+        """Initialize components for attendance processing.
+        
+        Args:
+            workers: Recognition worker processes (0 recognizes in this process)
+            db_path: SQLite database attendance is recorded in
+            face_recognizer: FaceRecognizer shared with other processors (one
+                is created if None and workers is 0; the workers load their own)
+            db_manager: DatabaseManager shared with other processors (one is
+                opened on db_path if None); a shared one is not closed by close()
+            attendance_writer: AttendanceWriter shared with other processors
+                (one is started if None and ATTENDANCE_WRITE_BEHIND is set);
+                a shared one is not closed by close()
+        """
+        self.pool = RecognitionPool(workers) if workers > 0 else None
+        # With a worker pool this process only tracks and draws, the model stays in the workers
+        if face_recognizer is None and self.pool is None:
+            face_recognizer = FaceRecognizer()
+        self.face_recognizer = face_recognizer
+        self.scheduler = DetectionScheduler(DETECTION_POLICY, DETECTION_INTERVAL, DETECTION_MIN_INTERVAL,
+                                            DETECTION_MAX_INTERVAL, CAMERA_FPS, MOTION_THRESHOLD)
+        self.tracker = FaceTracker(TRACK_IOU_THRESHOLD, TRACK_MAX_MISSED, TRACK_RECHECK_INTERVAL,
+                                   TRACK_MIN_VOTES, TRACK_VOTE_WINDOW)
+        self.motion_gate = None
+        if MOTION_GATE:
+            self.motion_gate = MotionGate(MOTION_GATE_METHOD, MOTION_GATE_WIDTH, MOTION_PIXEL_THRESHOLD,
+                                          MOTION_MIN_AREA, MOTION_ROI_PADDING, MOTION_FULL_FRAME_AREA)
+        self.gated_frames = 0  # Frames skipped because the scene was static
+        self.last_annotations = []  # Boxes drawn on the last detected frame, reused on skipped frames
+        self.owns_db = db_manager is None
+        self.db_manager = db_manager if db_manager is not None else DatabaseManager(db_path)
+        self.owns_writer = attendance_writer is None and ATTENDANCE_WRITE_BEHIND
+        self.attendance_writer = AttendanceWriter(db_path) if self.owns_writer else attendance_writer
         self.logged_users = {}  # Track users who have been logged with timestamp
-        self.logged_strangers = {}  # Track strangers that have been logged with timestamp
+        self.logged_names = {}  # Names of logged users, read by the display without querying the database
+        self.attendance_status = {}  # Per logged user, True if recorded now, False if already recorded today
+        self.attendance_results = queue.Queue()  # Write results from the writer thread, applied by the frame loop
+        self.logged_strangers = {}  # Track IDs of strangers that have been logged with timestamp
         self.log_cooldown = 10  # Cooldown in seconds before logging the same event again
         self.daily_stats = {
             "total_seen": 0, 
@@ -33,24 +78,167 @@ class AttendanceProcessor:
     def process_frame(self, frame):
         """Process a video frame for attendance.
         
+        Frames skipped by the motion gate or the detection scheduler are drawn
+        with the boxes of the last detected frame.
+        
         Args:
             frame: The camera frame to process
             
         Returns:
             tuple: (processed frame with annotations, number of faces detected)
         """
-        # Get face regions from frame
-        face_regions = self.face_recognizer.detect_faces(frame)
+        if self.pool is not None:
+            # The model is only loaded in the worker processes
+            return self.process_frames([frame])[0]
+        
+        detect, rois = self.plan_frame(frame)
+        if not detect:
+            return self.redraw_frame(frame)
+        
+        start = time.perf_counter()
+        boxes, tracks = self.recognize_frame(frame, rois)
+        self.scheduler.record_detection(len(boxes), time.perf_counter() - start)
+        return self.annotate_frame(frame, boxes, tracks)
+    
+    def process_frames(self, frames):
+        """Process several video frames, in parallel when a worker pool is configured.
+        
+        Args:
+            frames: List of camera frames
+            
+        Returns:
+            list: One (processed frame, number of faces detected) tuple per frame
+        """
+        if self.pool is None:
+            return [self.process_frame(frame) for frame in frames]
+        
+        # Workers detect in the motion regions, then recognize only the tracks that need it
+        plans = [self.plan_frame(frame) for frame in frames]
+        detected = [index for index, (detect, _) in enumerate(plans) if detect]
+        frame_tracks = []
+        
+        def select(position, boxes):
+            # Called in frame order; votes of earlier frames in the batch are not in yet
+            tracks = self.tracker.update(boxes)
+            frame_tracks.append(tracks)
+            return [i for i, track in enumerate(tracks) if self.tracker.needs_recognition(track)]
+        
+        start = time.perf_counter()
+        results = self.pool.recognize_frames([frames[index] for index in detected],
+                                             [plans[index][1] for index in detected], select)
+        elapsed = time.perf_counter() - start
+        
+        outputs = {index: (result, tracks) for index, result, tracks in zip(detected, results, frame_tracks)}
+        processed = []
+        for index, frame in enumerate(frames):
+            if index not in outputs:
+                processed.append(self.redraw_frame(frame))
+                continue
+            (boxes, indices, ids, distances, known), tracks = outputs[index]
+            self.scheduler.record_detection(len(boxes), elapsed / max(1, self.pool.workers))
+            for i, user_id, distance, is_known in zip(indices, ids, distances, known):
+                tracks[i].add_vote(user_id, distance, is_known)
+            processed.append(self.annotate_frame(frame, boxes, tracks))
+        return processed
+    
+    def plan_frame(self, frame):
+        """Decide whether and where to detect faces in a frame.
+        
+        A static scene without faces is skipped entirely. When only some
+        regions move and nobody is being tracked, detection is limited to
+        those regions; tracked faces may stand still, so the whole frame is
+        searched while tracks are active.
+        
+        Returns:
+            tuple: (detect, rois) with rois None for the whole frame
+        """
+        if self.motion_gate is None:
+            return self.scheduler.should_detect(frame), None
+        
+        motion = self.motion_gate.check(frame)
+        if not motion.has_motion and not self.last_annotations:
+            self.gated_frames += 1
+            self.scheduler.skip_frame()
+            return False, None
+        
+        detect = self.scheduler.should_detect(frame, motion.has_motion)
+        rois = motion.rois if motion.has_motion and not self.last_annotations else None
+        return detect, rois
+    
+    def redraw_frame(self, frame):
+        """Draw the boxes of the last detected frame on a skipped frame."""
+        for x, y, w, h, label, is_stranger in self.last_annotations:
+            FaceRecognizer.draw_face_box(frame, x, y, w, h, label, is_stranger)
+        return frame, len(self.last_annotations)
+    
+    def recognize_frame(self, frame, rois=None):
+        """Detect the faces of a frame and recognize the tracks that need it.
+        
+        Faces continuing a track whose identity is already voted are not
+        recognized again until the tracker asks for a confirmation.
+        
+        Args:
+            frame: The camera frame
+            rois: Optional regions to limit detection to
+            
+        Returns:
+            tuple: (boxes, tracks) with the (x, y, w, h) box and the Track of
+            each detected face
+        """
+        # Pick up newly enrolled users in the background
+        self.face_recognizer.check_for_updates()
+        
+        # Get face regions from frame and link them to the existing tracks
+        face_regions = self.face_recognizer.detect_faces(frame, rois)
+        boxes = [region[:4] for region in face_regions]
+        tracks = self.tracker.update(boxes)
+        
+        # Recognize the faces that need it with a single gallery query
+        pending = [i for i, track in enumerate(tracks) if self.tracker.needs_recognition(track)]
+        ids, distances, known = self.face_recognizer.recognize_faces(
+            [face_regions[i][5] for i in pending]
+        )
+        for i, user_id, distance, is_known in zip(pending, ids, distances, known):
+            tracks[i].add_vote(user_id, distance, is_known)
+        return boxes, tracks
+    
+    def annotate_frame(self, frame, boxes, tracks):
+        """Record attendance for recognized faces and draw the face boxes.
+        
+        Attendance and stranger events are only recorded once a track's
+        identity is confirmed by enough votes.
+        
+        Args:
+            frame: The camera frame to annotate
+            boxes: (x, y, w, h) box of each detected face
+            tracks: Track of each face, holding its voted identity
+            
+        Returns:
+            tuple: (processed frame with annotations, number of faces detected)
+        """
         current_time = time.time()
+        annotations = []
         
         # Update stats
-        if face_regions:
+        if boxes:
             self.daily_stats["total_seen"] += 1
         
+        # Apply the attendance writes that finished since the last frame
+        self.apply_attendance_results()
+        
+        # Forget strangers whose track ended, track IDs are never reused
+        if self.logged_strangers:
+            active = {track.track_id for track in self.tracker.tracks}
+            self.logged_strangers = {track_id: logged for track_id, logged in self.logged_strangers.items()
+                                     if track_id in active}
+        
         # Process each detected face
-        for (x, y, w, h, gray_face, color_face) in face_regions:
-            # Try to recognize the face with deep learning
-            user_id, confidence, is_known = self.face_recognizer.recognize_face(gray_face, color_face)
+        for (x, y, w, h), track in zip(boxes, tracks):
+            user_id, distance, is_known, vote_count = track.identity()
+            confirmed = self.tracker.is_confirmed(track, vote_count)
+            
+            # Convert distance to confidence score (0-100), strangers vote for None
+            confidence = (1 - distance) * 100
             
             if user_id and is_known:
                 # Update recognized count
@@ -68,15 +256,12 @@ class AttendanceProcessor:
                 else:
                     name = user_details['name']
                 
-                    # Record attendance if not already logged today
-                    if user_id not in self.logged_users:
-                        success = self.db_manager.record_attendance(user_id, name)
-                        if success:
-                            self.daily_stats["attendance_recorded"] += 1
-                            logging.info(f"✅ Attendance recorded for {name} (ID: {user_id})")
-                            self.logged_users[user_id] = current_time
-                    else:
-                        # Only log "already recorded" if enough time has passed since last log
+                    # Record attendance once the track is confirmed, if not already logged today
+                    if confirmed and user_id not in self.logged_users:
+                        self.logged_users[user_id] = current_time
+                        self.record_attendance(user_id, name)
+                    elif confirmed and user_id in self.attendance_status:
+                        # Only log "already recorded" once the write finished and enough time has passed since last log
                         last_log_time = self.logged_users.get(user_id, 0)
                         if current_time - last_log_time > self.log_cooldown:
                             logging.info(f"ℹ️ Attendance already recorded today for {user_id}")
@@ -91,19 +276,70 @@ class AttendanceProcessor:
                 label = f"Unknown ({confidence:.1f})"
                 is_stranger = True
                 
-                # Generate a simple hash based on face position and size to identify unique strangers
-                stranger_id = f"stranger_{x}_{y}_{w}_{h}"
+                # The track follows the same stranger while they move
+                stranger_id = track.track_id
                 
                 # Only log stranger detection if it's a new stranger or enough time has passed
                 last_log_time = self.logged_strangers.get(stranger_id, 0)
-                if current_time - last_log_time > self.log_cooldown:
-                    logging.warning(f"⚠️ Stranger detected with confidence {confidence:.1f}")
+                if confirmed and current_time - last_log_time > self.log_cooldown:
+                    logging.warning(f"⚠️ Stranger detected (track {stranger_id}) with confidence {confidence:.1f}")
                     self.logged_strangers[stranger_id] = current_time  # Update timestamp
             
             # Draw the face box with label
-            self.face_recognizer.draw_face_box(frame, x, y, w, h, label, is_stranger)
+            FaceRecognizer.draw_face_box(frame, x, y, w, h, label, is_stranger)
+            annotations.append((x, y, w, h, label, is_stranger))
+        
+        self.last_annotations = annotations
+        return frame, len(boxes)
+    
+    def record_attendance(self, user_id, name):
+        """Record attendance for a user, in the background when a writer is configured.
+        
+        The user is marked as logged right away so later frames do not record
+        them again; on_attendance_result() handles the outcome.
+        """
+        if self.attendance_writer is None:
+            now = datetime.now()
+            results = self.db_manager.record_attendance_many(
+                [(user_id, name, now.strftime("%Y-%m-%d"), now.strftime("%H:%M:%S"))])
+            self.on_attendance_result(user_id, name, results[0] if results else None)
+            return
+        
+        # The callback runs on the writer thread, it only queues the result
+        future = self.attendance_writer.submit(user_id, name)
+        future.add_done_callback(lambda f: self.attendance_results.put((user_id, name, f.result())))
+    
+    def apply_attendance_results(self):
+        """Apply the results queued by the attendance writer (on the frame loop thread)."""
+        while True:
+            try:
+                user_id, name, recorded = self.attendance_results.get_nowait()
+            except queue.Empty:
+                return
+            self.on_attendance_result(user_id, name, recorded)
+    
+    def on_attendance_result(self, user_id, name, recorded):
+        """Handle the result of an attendance write.
+        
+        Args:
+            user_id: ID of the user
+            name: Name of the user
+            recorded: True if recorded, False if already recorded today, None
+                if the write failed
+        """
+        if recorded is None:
+            # Try again the next time the user is recognized
+            self.logged_users.pop(user_id, None)
+            return
         
-        return frame, len(face_regions)
+        if recorded:
+            self.daily_stats["attendance_recorded"] += 1
+            logging.info(f"✅ Attendance recorded for {name} (ID: {user_id})")
+        else:
+            logging.info(f"ℹ️ Attendance already recorded today for {user_id}")
+        # The display lists the users in logged_names with their status
+        self.attendance_status[user_id] = bool(recorded)
+        self.logged_names[user_id] = name
     
     def get_statistics(self):
         """Get attendance processing statistics.
@@ -129,6 +365,9 @@ class AttendanceProcessor:
             "strangers_detected": self.daily_stats["strangers_detected"],
             "unique_users": unique_users_today,
             "total_records": len(today_records),
+            "scheduler": self.scheduler.get_stats(),
+            "motion_gated_frames": self.gated_frames,
+            "user_cache": self.db_manager.get_cache_stats(),
         }
         
         return stats
@@ -147,7 +386,10 @@ class AttendanceProcessor:
     def reset_logged_users(self):
         """Reset the set of logged users."""
         self.logged_users = {}
+        self.logged_names = {}
+        self.attendance_status = {}
         self.logged_strangers = {}
+        self.tracker.reset()
         self.daily_stats = {
             "total_seen": 0, 
             "recognized": 0, 
@@ -155,6 +397,21 @@ class AttendanceProcessor:
             "strangers_detected": 0
         }
     
+    def release_thread(self):
+        """Close the database connections of the calling thread (they reopen on next use).
+
+        Threads other than the one calling close(), like the pipeline's
+        recognition thread, read through connections of their own.
+        """
+        self.db_manager.close()
+
     def close(self):
         """Close any open resources."""
-        self.db_manager.close()
\ No newline at end of file
+        if self.pool is not None:
+            self.pool.close()
+        if self.owns_writer:
+            # Writes every pending attendance event before returning
+            self.attendance_writer.close()
+            self.apply_attendance_results()
+        if self.owns_db:
+            self.db_manager.close()
\ No newline at end of file
@@ -0,0 +1,282 @@
+"""
+Enrollment log module for the Face Recognition Attendance System.
+Appends new enrollments as small segment files next to the base feature store
+and periodically compacts them into the base in the background.
+
+Layout on disk:
+
+    face_embeddings.bin             base store, metadata['compacted_through'] = S
+    segments/segment_00000001.bin   one store file per enrollment batch
+    segments/segment_00000002.bin   ...
+
+Every file is written to a temporary name first and then linked or renamed
+into place, so readers only ever see complete files. A snapshot is the base
+plus all segments with a sequence number above ``compacted_through``.
+"""
+
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+# Add project root to path to allow imports from src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.core.embedding_store import EmbeddingStore
+
+SEGMENT_PATTERN = re.compile(r"^segment_(\d{8})\.bin$")
+COMPACTION_LOCK = ".compaction.lock"
+STALE_LOCK_SECONDS = 600  # A compaction lock older than this was left by a crashed process
+LOCK_POLL_SECONDS = 0.05  # Wait between attempts to take the compaction lock
+SNAPSHOT_RETRIES = 5
+
+
+def merge_stores(stores, user_ids=None):
+    """Merge the users of several stores into a {user_id: [feature, ...]} dictionary.
+
+    Samples of a user found in several stores are concatenated in store order.
+
+    Args:
+        stores: EmbeddingStore objects to merge
+        user_ids: Only collect these users (all users if None)
+    """
+    wanted = {str(user_id) for user_id in user_ids} if user_ids is not None else None
+    blocks = {}
+    for store in stores:
+        for user_id in store.user_ids:
+            if wanted is not None and user_id not in wanted:
+                continue
+            blocks.setdefault(user_id, []).append(store.user_features(user_id))
+    return {user_id: list(np.concatenate(parts, axis=0)) for user_id, parts in blocks.items()}
+
+
+class EmbeddingLog:
+    """Base feature store plus an append-only log of enrollment segments."""
+
+    def __init__(self, base_path, segments_dir, storage='float32'):
+        """Create the log.
+
+        Args:
+            base_path: Compacted base store file
+            segments_dir: Directory holding the segment files
+            storage: Storage mode used for new segments and compacted bases
+        """
+        self.base_path = base_path
+        self.segments_dir = segments_dir
+        self.storage = storage
+        self._lock = threading.Lock()
+        self.compaction_thread = None
+
+    def segment_paths(self):
+        """Return the (sequence, path) pairs of all segment files, oldest first."""
+        if not os.path.isdir(self.segments_dir):
+            return []
+
+        segments = []
+        for name in os.listdir(self.segments_dir):
+            match = SEGMENT_PATTERN.match(name)
+            if match:
+                segments.append((int(match.group(1)), os.path.join(self.segments_dir, name)))
+        return sorted(segments)
+
+    def open_base(self):
+        """Open the base store, or return None if it does not exist yet."""
+        if not os.path.exists(self.base_path):
+            return None
+        return EmbeddingStore.open(self.base_path)
+
+    @staticmethod
+    def compacted_through(base):
+        """Sequence number of the last segment merged into a base store (0 if none)."""
+        return int(base.metadata.get('compacted_through', 0)) if base is not None else 0
+
+    def open_snapshot(self):
+        """Open a consistent view of the base store and its pending segments.
+
+        A compaction running at the same time may replace the base and delete
+        segments while they are being listed; the view is retried until the
+        pending segments continue the base without a gap.
+
+        Returns:
+            tuple: (base, segments, sequence) with base an EmbeddingStore or
+            None, segments the list of pending segment stores and sequence
+            the number of the last segment included in the view
+        """
+        for _ in range(SNAPSHOT_RETRIES):
+            base = self.open_base()
+            through = self.compacted_through(base)
+            pending = [(seq, path) for seq, path in self.segment_paths() if seq > through]
+
+            # Segments are numbered consecutively, a gap means a compaction got in between
+            if [seq for seq, _ in pending] != list(range(through + 1, through + 1 + len(pending))):
+                continue
+            try:
+                segments = [EmbeddingStore.open(path) for _, path in pending]
+            except FileNotFoundError:
+                continue
+            return base, segments, pending[-1][0] if pending else through
+
+        raise RuntimeError(f"Could not open a consistent snapshot of {self.base_path}")
+
+    def to_feature_dict(self):
+        """Return every stored feature as a {user_id: [feature, ...]} dictionary."""
+        base, segments, _ = self.open_snapshot()
+        return merge_stores(([base] if base is not None else []) + segments)
+
+    def user_features(self, user_ids):
+        """Return all samples of the given users across the base and segments.
+
+        Args:
+            user_ids: User IDs to collect
+
+        Returns:
+            dict: Mapping of each found user ID to its list of feature vectors
+        """
+        base, segments, _ = self.open_snapshot()
+        return merge_stores(([base] if base is not None else []) + segments, user_ids)
+
+    def acquire_compaction_lock(self, wait=False):
+        """Take the cross-process lock that serializes compactions and segment numbering.
+
+        Args:
+            wait: Wait until the lock is free instead of giving up
+
+        Returns:
+            int: File descriptor of the lock file, or None if another process
+            holds the lock and wait is False
+        """
+        os.makedirs(self.segments_dir, exist_ok=True)
+        lock_path = os.path.join(self.segments_dir, COMPACTION_LOCK)
+        while True:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > STALE_LOCK_SECONDS:
+                    os.remove(lock_path)
+            except OSError:
+                pass
+
+            try:
+                return os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if not wait:
+                    return None
+            time.sleep(LOCK_POLL_SECONDS)
+
+    def release_compaction_lock(self, lock_fd):
+        """Release a lock taken with acquire_compaction_lock()."""
+        os.close(lock_fd)
+        os.remove(os.path.join(self.segments_dir, COMPACTION_LOCK))
+
+    def pending_segment_count(self):
+        """Number of segments not yet merged into the base store."""
+        through = self.compacted_through(self.open_base())
+        return sum(1 for seq, _ in self.segment_paths() if seq > through)
+
+    def append(self, feature_dict):
+        """Write new samples as the next segment of the log.
+
+        Only the new samples are written, so the cost does not depend on the
+        size of the gallery. The sequence number is chosen under the
+        compaction lock: a compaction finishing in between could otherwise
+        merge the last segments and leave the new one numbered at or below
+        the base's compacted_through, where readers ignore it. The segment is
+        linked into place under its final name, which fails instead of
+        overwriting if another writer claimed the same sequence number first.
+
+        Args:
+            feature_dict: Mapping of user IDs to lists of new feature vectors
+
+        Returns:
+            int: Sequence number of the written segment, or None if there was
+            nothing to write
+        """
+        if not any(len(features) > 0 for features in feature_dict.values()):
+            return None
+
+        os.makedirs(self.segments_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.segments_dir, prefix=".tmp_", suffix=".bin")
+        os.close(fd)
+
+        with self._lock:
+            lock_fd = None
+            try:
+                lock_fd = self.acquire_compaction_lock(wait=True)
+                through = self.compacted_through(self.open_base())
+                sequence = max([through] + [seq for seq, _ in self.segment_paths()]) + 1
+                while True:
+                    EmbeddingStore.write(tmp_path, feature_dict, self.storage, metadata={'sequence': sequence})
+                    try:
+                        os.link(tmp_path, os.path.join(self.segments_dir, f"segment_{sequence:08d}.bin"))
+                        return sequence
+                    except FileExistsError:
+                        sequence += 1
+            finally:
+                if lock_fd is not None:
+                    self.release_compaction_lock(lock_fd)
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+    def compact(self):
+        """Merge all pending segments into a new base store.
+
+        The new base is written atomically and records the last merged
+        sequence number, after which the merged segments are deleted. Only
+        one compaction runs at a time across processes, and appends wait for
+        it to finish before numbering their segment.
+
+        Returns:
+            int: Number of merged segments, or None if another compaction is
+            running or there was nothing to merge
+        """
+        lock_fd = self.acquire_compaction_lock()
+        if lock_fd is None:
+            return None
+
+        try:
+            base, segments, sequence = self.open_snapshot()
+            if not segments:
+                return None
+
+            stores = ([base] if base is not None else []) + segments
+            feature_dict = merge_stores(stores)
+            for store in stores:
+                store.close()
+
+            EmbeddingStore.write(self.base_path, feature_dict, self.storage,
+                                 metadata={'compacted_through': sequence})
+
+            # The new base covers these segments, readers skip them from now on
+            for seq, path in self.segment_paths():
+                if seq <= sequence:
+                    os.remove(path)
+            return len(segments)
+        finally:
+            self.release_compaction_lock(lock_fd)
+
+    def compact_in_background(self):
+        """Start a compaction in a background thread unless one is running.
+
+        The thread is not a daemon, so the process waits for the new base to
+        be written before it exits.
+
+        Returns:
+            threading.Thread: The compaction thread
+        """
+        if self.compaction_thread is not None and self.compaction_thread.is_alive():
+            return self.compaction_thread
+
+        def run():
+            start = time.perf_counter()
+            try:
+                merged = self.compact()
+                if merged:
+                    print(f"✅ Compacted {merged} enrollment segments into {self.base_path} "
+                          f"in {time.perf_counter() - start:.2f} s")
+            except Exception as e:
+                print(f"❌ Error compacting enrollment segments: {e}")
+
+        self.compaction_thread = threading.Thread(target=run, name="EmbeddingCompaction")
+        self.compaction_thread.start()
+        return self.compaction_thread
@@ -0,0 +1,272 @@
+"""
+Embedding storage module for the Face Recognition Attendance System.
+Reads and writes the face feature store shared by training and recognition.
+
+The store is a single binary file made of a fixed 64-byte header, a
+contiguous row-major feature matrix (optionally followed by per-row int8
+scales) and a JSON label table mapping each user ID to its block of rows:
+
+    offset  size  field
+    0       8     magic b"FRAEMB\\0\\0"
+    8       4     format version (uint32)
+    12      4     storage code (uint32, see STORAGE_CODES)
+    16      8     number of rows (uint64)
+    24      8     feature dimension (uint64)
+    32      8     matrix offset (uint64, 64-byte aligned)
+    40      8     scales offset (uint64, 0 when there are no scales)
+    48      8     label table offset (uint64)
+    56      8     label table size (uint64)
+
+The matrix is opened with ``np.memmap`` so startup does not read the whole
+file and read-only pages are shared between processes.
+"""
+
+import json
+import os
+import pickle
+import struct
+import sys
+import tempfile
+
+import numpy as np
+
+# Add project root to path to allow imports from src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.core.quantization import STORAGE_DTYPES, dequantize, quantize
+
+MAGIC = b"FRAEMB\0\0"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sIIQQQQQQ")
+ALIGNMENT = 64
+
+# Storage mode of the matrix as written in the header
+STORAGE_CODES = {'float64': 0, 'float32': 1, 'float16': 2, 'int8': 3}
+STORAGE_NAMES = {code: name for name, code in STORAGE_CODES.items()}
+
+
+def _align(offset):
+    """Round an offset up to the next ALIGNMENT boundary."""
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class EmbeddingStore:
+    """Read-only, memory-mapped view of a feature store file."""
+
+    def __init__(self, path):
+        """Open a store file.
+
+        Args:
+            path: Store file written by EmbeddingStore.write()
+
+        Raises:
+            ValueError: If the file is not a store or has an unsupported version
+                or storage code
+        """
+        self.path = path
+
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ValueError(f"{path} is too small to be an embedding store")
+
+            (magic, version, storage_code, rows, dim, matrix_offset,
+             scales_offset, table_offset, table_size) = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not an embedding store")
+            if version > FORMAT_VERSION:
+                raise ValueError(f"{path} uses store format {version}, newer than supported {FORMAT_VERSION}")
+            if storage_code not in STORAGE_NAMES:
+                raise ValueError(f"{path} uses unknown storage code {storage_code}")
+
+            f.seek(table_offset)
+            table = json.loads(f.read(table_size).decode('utf-8'))
+
+        self.version = version
+        self.storage = STORAGE_NAMES[storage_code]
+        self.metadata = table.get('metadata', {})
+
+        dtype = STORAGE_DTYPES[self.storage]
+        if rows > 0:
+            self.matrix = np.memmap(path, dtype=dtype, mode='r', offset=matrix_offset, shape=(rows, dim))
+        else:
+            self.matrix = np.empty((0, dim), dtype=dtype)
+        self.scales = None
+        if scales_offset:
+            self.scales = np.memmap(path, dtype=np.float32, mode='r', offset=scales_offset, shape=(rows,))
+
+        # Label/offset table: one contiguous block of rows per user
+        self.user_ids = [entry[0] for entry in table['users']]
+        self.starts = np.array([entry[1] for entry in table['users']], dtype=np.int64)
+        self.counts = np.array([entry[2] for entry in table['users']], dtype=np.int64)
+
+    @classmethod
+    def open(cls, path):
+        """Open a store file (alias of the constructor)."""
+        return cls(path)
+
+    @property
+    def size(self):
+        """Number of stored samples."""
+        return self.matrix.shape[0]
+
+    @property
+    def dim(self):
+        """Feature dimensionality."""
+        return self.matrix.shape[1]
+
+    @property
+    def labels(self):
+        """int32 array mapping every row to its index in user_ids."""
+        return np.repeat(np.arange(len(self.user_ids), dtype=np.int32), self.counts)
+
+    def user_features(self, user_id):
+        """Return the samples of one user as a float32 (S, D) array."""
+        i = self.user_ids.index(user_id)
+        start, end = self.starts[i], self.starts[i] + self.counts[i]
+        scales = self.scales[start:end] if self.scales is not None else None
+        return dequantize(self.matrix[start:end], scales)
+
+    def to_feature_dict(self):
+        """Return the store content as a {user_id: [feature, ...]} dictionary."""
+        return {user_id: list(self.user_features(user_id)) for user_id in self.user_ids}
+
+    def close(self):
+        """Release the memory maps."""
+        self.matrix = None
+        self.scales = None
+
+    @staticmethod
+    def write(path, feature_dict, storage='float32', metadata=None):
+        """Write a {user_id: [feature, ...]} dictionary as a store file.
+
+        The file is written to a temporary name and renamed into place, so
+        readers never see a partially written store.
+
+        Args:
+            path: Destination file
+            feature_dict: Mapping of user IDs to lists of feature vectors
+            storage: 'float64', 'float32', 'float16' or 'int8'
+            metadata: Optional JSON-serializable dictionary kept in the table
+
+        Returns:
+            int: Number of rows written
+        """
+        user_ids = [str(user_id) for user_id, features in feature_dict.items() if len(features) > 0]
+        blocks = [np.asarray(feature_dict[user_id], dtype=np.float32) for user_id in user_ids]
+        counts = [len(block) for block in blocks]
+        if blocks:
+            matrix = np.concatenate(blocks, axis=0)
+        else:
+            matrix = np.empty((0, 0), dtype=np.float32)
+        return EmbeddingStore.write_arrays(path, matrix, user_ids, counts, storage, metadata)
+
+    @staticmethod
+    def write_arrays(path, matrix, user_ids, counts, storage='float32', metadata=None):
+        """Write a feature matrix whose rows are grouped by user.
+
+        Args:
+            path: Destination file
+            matrix: (N, D) array of features, users in contiguous blocks
+            user_ids: User ID of each block
+            counts: Number of rows of each block
+            storage: 'float64', 'float32', 'float16' or 'int8'
+            metadata: Optional JSON-serializable dictionary kept in the table
+
+        Returns:
+            int: Number of rows written
+        """
+        data, scales = quantize(matrix, storage)
+        rows, dim = data.shape
+
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64) if len(counts) else []
+        table = json.dumps({
+            'users': [[str(user_id), int(start), int(count)]
+                      for user_id, start, count in zip(user_ids, starts, counts)],
+            'metadata': metadata or {},
+        }).encode('utf-8')
+
+        matrix_offset = _align(HEADER.size)
+        scales_offset = _align(matrix_offset + data.nbytes) if scales is not None else 0
+        table_offset = _align((scales_offset + scales.nbytes) if scales is not None else matrix_offset + data.nbytes)
+
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, STORAGE_CODES[storage], rows, dim,
+                             matrix_offset, scales_offset, table_offset, len(table))
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=".bin")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(header)
+                f.seek(matrix_offset)
+                f.write(data.tobytes())
+                if scales is not None:
+                    f.seek(scales_offset)
+                    f.write(scales.tobytes())
+                f.seek(table_offset)
+                f.write(table)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return rows
+
+
+def load_feature_dict(path):
+    """Load a legacy pickle feature file.
+
+    Reads the original layout (a dict of lists of vectors) as well as the
+    quantized pickle layout {'storage': mode, 'users': {user_id: {'data':
+    ..., 'scales': ...}}}, converting quantized data back to float32.
+
+    Args:
+        path: Feature file to read
+
+    Returns:
+        dict: Mapping of user IDs to lists of feature vectors
+    """
+    with open(path, 'rb') as f:
+        payload = pickle.load(f)
+
+    if isinstance(payload, dict) and 'storage' in payload and 'users' in payload:
+        return {
+            user_id: list(dequantize(entry['data'], entry['scales']))
+            for user_id, entry in payload['users'].items()
+        }
+    return payload
+
+
+def load_features(store_path, legacy_path=None):
+    """Load all stored features, preferring the binary store.
+
+    Args:
+        store_path: Binary store file
+        legacy_path: Pickle file used when the store does not exist yet
+
+    Returns:
+        dict: Mapping of user IDs to lists of feature vectors ({} if none)
+    """
+    if os.path.exists(store_path):
+        return EmbeddingStore.open(store_path).to_feature_dict()
+    if legacy_path and os.path.exists(legacy_path):
+        return load_feature_dict(legacy_path)
+    return {}
+
+
+def migrate_pickle(pickle_path, store_path, storage='float32'):
+    """Convert a pickle feature file into a binary store.
+
+    Args:
+        pickle_path: Existing pickle feature file
+        store_path: Store file to create
+        storage: Storage mode of the new store
+
+    Returns:
+        int: Number of rows written
+    """
+    feature_dict = load_feature_dict(pickle_path)
+    return EmbeddingStore.write(store_path, feature_dict, storage,
+                                metadata={'migrated_from': os.path.basename(pickle_path)})
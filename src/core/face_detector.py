@@ -0,0 +1,260 @@
+"""
+Face detection module for the Face Recognition Attendance System.
+Wraps the available CPU face detectors behind one interface so recognition,
+training and registration all use the detector selected in the settings.
+
+Backends:
+    haar: OpenCV's frontal face Haar cascade (bundled with OpenCV)
+    lbp: LBP frontal face cascade, faster but less accurate than Haar
+    yunet: OpenCV's YuNet CNN detector (cv2.FaceDetectorYN, OpenCV >= 4.5.4)
+    ssd: OpenCV DNN ResNet-10 SSD face detector (Caffe model)
+
+The LBP cascade and the DNN models are not shipped with the opencv-python
+wheels, they are read from local files in the models directory.
+"""
+
+import os
+import sys
+import threading
+
+import cv2
+import numpy as np
+
+# Add project root to path to allow imports from config
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from config.settings import (FACE_DETECTOR, FACE_CASCADE_PATH, LBP_CASCADE_PATH, YUNET_MODEL_PATH,
+                             SSD_CONFIG_PATH, SSD_MODEL_PATH, DNN_CONFIDENCE, DETECTION_WIDTH, MIN_FACE_SIZE)
+
+# Supported detection backends
+BACKENDS = ("haar", "lbp", "yunet", "ssd")
+
+
+def detection_scale(frame_width, detection_width):
+    """Scale factor from a frame of this width to the detection width (at most 1)."""
+    if not detection_width or frame_width <= detection_width:
+        return 1.0
+    return detection_width / float(frame_width)
+
+
+class FaceDetector:
+    """Common interface of the detection backends.
+
+    detect() downscales the image to ``detection_width``, lets the backend
+    find faces and maps the boxes back to the coordinates of the image, so
+    face crops can be cut at full resolution.
+    """
+
+    name = None
+    # Whether the backend works on BGR images rather than grayscale
+    needs_color = False
+    # Smallest face, in detection pixels, the backend can find
+    min_window = 24
+
+    def __init__(self, detection_width=DETECTION_WIDTH, min_face_size=MIN_FACE_SIZE):
+        """Set the detection resolution.
+
+        Args:
+            detection_width: Width of the downscaled copy faces are detected
+                on, None detects at full resolution
+            min_face_size: Smallest face to detect, in full-resolution pixels
+        """
+        self.detection_width = detection_width
+        self.min_face_size = min_face_size
+        # OpenCV DNN networks are not safe to run from several threads at once
+        self.lock = threading.Lock()
+
+    def detect(self, image, frame_width=None):
+        """Detect faces in an image.
+
+        Args:
+            image: BGR or grayscale frame, or a region of a frame
+            frame_width: Width of the full frame the region belongs to, which
+                sets the scale (defaults to the image width)
+
+        Returns:
+            list: (x, y, w, h) boxes in the coordinates of the image
+        """
+        if self.needs_color and image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        elif not self.needs_color and image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+        scale = detection_scale(frame_width or image.shape[1], self.detection_width)
+        small = image
+        if scale < 1.0:
+            small = cv2.resize(image, (max(1, int(image.shape[1] * scale)), max(1, int(image.shape[0] * scale))),
+                               interpolation=cv2.INTER_AREA)
+
+        # The smallest face worth detecting, expressed at the detection scale
+        min_size = max(self.min_window, int(round(self.min_face_size * scale)))
+        with self.lock:
+            boxes = self.detect_scaled(small, min_size)
+
+        height, width = image.shape[:2]
+        faces = []
+        for (x, y, w, h) in boxes:
+            x0, y0 = max(0, int(round(x / scale))), max(0, int(round(y / scale)))
+            x1, y1 = min(width, int(round((x + w) / scale))), min(height, int(round((y + h) / scale)))
+            if x1 > x0 and y1 > y0:
+                faces.append((x0, y0, x1 - x0, y1 - y0))
+        return faces
+
+    def detect_scaled(self, image, min_size):
+        """Backend detection on the downscaled image.
+
+        Args:
+            image: Grayscale or BGR image, see needs_color
+            min_size: Smallest face side to report, in pixels of the image
+
+        Returns:
+            list: (x, y, w, h) boxes in the coordinates of the image
+        """
+        raise NotImplementedError
+
+
+class CascadeDetector(FaceDetector):
+    """Haar or LBP cascade classifier."""
+
+    def __init__(self, name, path, scale_factor=1.3, min_neighbors=5, **kwargs):
+        """Load the cascade.
+
+        Args:
+            name: Backend name
+            path: Cascade XML file
+            scale_factor: Image pyramid step of detectMultiScale
+            min_neighbors: Overlapping detections required to keep a face
+        """
+        super().__init__(**kwargs)
+        self.name = name
+        self.cascade = cv2.CascadeClassifier(path)
+        if self.cascade.empty():
+            raise IOError(f"Could not load cascade {path}")
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+
+    def detect_scaled(self, image, min_size):
+        return self.cascade.detectMultiScale(image, self.scale_factor, self.min_neighbors,
+                                             minSize=(min_size, min_size))
+
+
+class YuNetDetector(FaceDetector):
+    """OpenCV's YuNet face detector, a small CNN run by the DNN module."""
+
+    name = "yunet"
+    needs_color = True
+    min_window = 10
+
+    def __init__(self, model_path, confidence=0.6, **kwargs):
+        """Load the ONNX model.
+
+        Args:
+            model_path: YuNet .onnx file
+            confidence: Minimum face score
+        """
+        super().__init__(**kwargs)
+        if not hasattr(cv2, 'FaceDetectorYN'):
+            raise IOError("cv2.FaceDetectorYN needs OpenCV 4.5.4 or newer")
+        self.detector = cv2.FaceDetectorYN.create(model_path, "", (320, 320), confidence)
+        self.input_size = (320, 320)
+
+    def detect_scaled(self, image, min_size):
+        size = (image.shape[1], image.shape[0])
+        if size != self.input_size:
+            self.detector.setInputSize(size)
+            self.input_size = size
+
+        _, faces = self.detector.detect(image)
+        if faces is None:
+            return []
+        boxes = []
+        for face in faces:
+            x, y, w, h = (int(round(v)) for v in face[:4])
+            if min(w, h) >= min_size:
+                boxes.append((x, y, w, h))
+        return boxes
+
+
+class SSDDetector(FaceDetector):
+    """ResNet-10 SSD face detector run by the OpenCV DNN module."""
+
+    name = "ssd"
+    needs_color = True
+    min_window = 12
+
+    # Input size and mean colour the Caffe model was trained with
+    INPUT_SIZE = (300, 300)
+    MEAN = (104.0, 177.0, 123.0)
+
+    def __init__(self, config_path, model_path, confidence=0.6, **kwargs):
+        """Load the Caffe network.
+
+        Args:
+            config_path: deploy.prototxt file
+            model_path: .caffemodel weights
+            confidence: Minimum face score
+        """
+        super().__init__(**kwargs)
+        self.net = cv2.dnn.readNetFromCaffe(config_path, model_path)
+        self.confidence = confidence
+
+    def detect_scaled(self, image, min_size):
+        height, width = image.shape[:2]
+        blob = cv2.dnn.blobFromImage(cv2.resize(image, self.INPUT_SIZE), 1.0, self.INPUT_SIZE, self.MEAN)
+        self.net.setInput(blob)
+        detections = self.net.forward()[0, 0]
+
+        boxes = []
+        for detection in detections[detections[:, 2] >= self.confidence]:
+            x0, y0, x1, y1 = detection[3:7] * np.array([width, height, width, height])
+            x0, y0 = max(0, int(x0)), max(0, int(y0))
+            w, h = min(width, int(x1)) - x0, min(height, int(y1)) - y0
+            if min(w, h) >= min_size:
+                boxes.append((x0, y0, w, h))
+        return boxes
+
+
+def create_detector(backend=FACE_DETECTOR, **kwargs):
+    """Create a face detector for a backend.
+
+    Falls back to the Haar cascade when the backend's model files are missing
+    or cannot be loaded.
+
+    Args:
+        backend: One of BACKENDS
+        **kwargs: detection_width and min_face_size overrides
+
+    Returns:
+        FaceDetector: The detector
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown face detector '{backend}', expected one of {list(BACKENDS)}")
+
+    model_files = {"lbp": [LBP_CASCADE_PATH], "yunet": [YUNET_MODEL_PATH],
+                   "ssd": [SSD_CONFIG_PATH, SSD_MODEL_PATH]}.get(backend, [])
+    missing = [path for path in model_files if not os.path.exists(path)]
+    if missing:
+        print(f"⚠️ Model file not found for the {backend} face detector: {missing[0]}, using the Haar cascade")
+    elif backend != "haar":
+        try:
+            if backend == "lbp":
+                return CascadeDetector("lbp", LBP_CASCADE_PATH, **kwargs)
+            if backend == "yunet":
+                return YuNetDetector(YUNET_MODEL_PATH, DNN_CONFIDENCE, **kwargs)
+            return SSDDetector(SSD_CONFIG_PATH, SSD_MODEL_PATH, DNN_CONFIDENCE, **kwargs)
+        except (IOError, cv2.error) as e:
+            print(f"⚠️ Could not load the {backend} face detector ({e}), using the Haar cascade")
+
+    return CascadeDetector("haar", cv2.data.haarcascades + FACE_CASCADE_PATH, **kwargs)
+
+
+_shared_detector = None
+_shared_lock = threading.Lock()
+
+def get_face_detector():
+    """Return the detector selected in the settings, created once per process."""
+    global _shared_detector
+    with _shared_lock:
+        if _shared_detector is None:
+            _shared_detector = create_detector()
+            print(f"✅ Face detector: {_shared_detector.name}")
+        return _shared_detector
@@ -1,30 +1,64 @@
 """
 Face recognition module for the Face Recognition Attendance System.
-Handles face detection and recognition using KNN-based approach.
+Handles face detection and recognition using nearest-neighbour search.
 """
 
 import cv2
 import numpy as np
 import os
 import sys
+import time
 import pickle
-from sklearn.preprocessing import Normalizer
-from sklearn.neighbors import KNeighborsClassifier
+import threading
 
 # Add project root to path to allow imports from config
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
-from config.settings import FACE_CASCADE_PATH, EMBEDDINGS_PATH, STRANGER_THRESHOLD
+from src.core.face_detector import get_face_detector
+from src.core.feature_extraction import FeatureExtractor
+from src.core.gallery_index import GalleryIndex, SegmentedIndex, pack_feature_dict
+from src.core.ann_index import IVFIndex
+from src.core.prototypes import PrototypeMatcher
+from src.core.projection import PCAProjection
+from src.core.embedding_store import load_feature_dict
+from src.core.embedding_log import EmbeddingLog, merge_stores
+from src.core.quantization import dequantize
+from config.settings import (EMBEDDINGS_PATH, EMBEDDINGS_STORE_PATH, EMBEDDINGS_SEGMENTS_DIR,
+                             PROTOTYPES_PATH, PROJECTION_PATH,
+                             STRANGER_THRESHOLD, SEARCH_BACKEND, IVF_NLIST, IVF_NPROBE,
+                             USE_PROTOTYPE_PREFILTER, PROTOTYPES_PER_USER, PROTOTYPE_TOP_M,
+                             PROJECTION_DIM, PROJECTION_STRANGER_THRESHOLD, GALLERY_STORAGE,
+                             MODEL_RELOAD_INTERVAL)
+
+# Attributes that make up the loaded model, swapped together on a full reload
+MODEL_ATTRIBUTES = ('gallery_index', 'prototype_matcher', 'delta_index', 'searcher', 'projection',
+                    'stranger_threshold', 'embedding_store', 'segments', 'segment_sequence',
+                    'feature_dict', 'model_version')
 
 class FaceRecognizer:
     def __init__(self):
         """Initialize face detector and recognizer."""
-        # For face detection
-        self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + FACE_CASCADE_PATH)
+        # For face detection, shared with training and registration
+        self.detector = get_face_detector()
         
         # For advanced recognition using local features
-        self.knn_model = None
+        self.gallery_index = None
+        self.prototype_matcher = None
+        self.delta_index = None
+        self.searcher = None
+        self.projection = None
+        self.stranger_threshold = STRANGER_THRESHOLD
+        self.embedding_log = EmbeddingLog(EMBEDDINGS_STORE_PATH, EMBEDDINGS_SEGMENTS_DIR)
+        self.embedding_store = None
+        self.segments = []
+        self.segment_sequence = 0
         self.feature_dict = {}
-        self.l2_normalizer = Normalizer('l2')
+        self.feature_extractor = FeatureExtractor()
+        
+        # Hot reload state, the model lock only guards swapping in a new model
+        self.model_lock = threading.Lock()
+        self.model_version = self.stored_model_version()
+        self.last_reload_check = time.time()
+        self.reload_thread = None
         
         # Initialize models
         self.initialize_models()
@@ -32,44 +66,280 @@ class FaceRecognizer:
     def initialize_models(self):
         """Load trained face recognition models."""
         try:
-            # Load feature dictionary for KNN recognition
-            if os.path.exists(EMBEDDINGS_PATH):
-                with open(EMBEDDINGS_PATH, 'rb') as f:
-                    self.feature_dict = pickle.load(f)
-                print(f"✅ Face features loaded from {EMBEDDINGS_PATH}")
+            # Memory-map the feature store and its pending enrollment segments,
+            # or fall back to the legacy pickle
+            self.embedding_store, self.segments, self.segment_sequence = self.embedding_log.open_snapshot()
+            if self.embedding_store is not None:
+                print(f"✅ Face features mapped from {EMBEDDINGS_STORE_PATH} "
+                      f"({self.embedding_store.size} samples, format v{self.embedding_store.version})")
+            elif os.path.exists(EMBEDDINGS_PATH):
+                self.feature_dict = load_feature_dict(EMBEDDINGS_PATH)
+                print(f"✅ Face features loaded from {EMBEDDINGS_PATH} "
+                      f"(run migrate_embeddings.py for faster startup)")
+            elif not self.segments:
+                print(f"❗ Face features not found at {EMBEDDINGS_STORE_PATH}")
+                return
+            if self.segments:
+                print(f"✅ {len(self.segments)} pending enrollment segments mapped from {EMBEDDINGS_SEGMENTS_DIR}")
                 
-                # Create KNN model from the features
-                if self.feature_dict:
-                    self.create_knn_model()
-            else:
-                print(f"❗ Face features not found at {EMBEDDINGS_PATH}")
+            # Load the dimensionality reduction fitted at training time
+            if PROJECTION_DIM:
+                self.load_projection()
+            
+            # Build the search indexes from the features
+            self.build_gallery_index()
+            self.build_delta_index()
                 
         except Exception as e:
             print(f"❌ Error loading models: {e}")
     
-    def create_knn_model(self):
-        """Create a KNN model from the stored face features."""
+    def load_projection(self):
+        """Load the PCA projection saved by the trainer, if any."""
+        if not os.path.exists(PROJECTION_PATH):
+            print(f"⚠️ Projection not found at {PROJECTION_PATH}, using full descriptors until retrained")
+            return
+            
+        try:
+            self.projection = PCAProjection.load(PROJECTION_PATH)
+            self.stranger_threshold = PROJECTION_STRANGER_THRESHOLD
+            print(f"✅ Projection loaded ({self.projection.n_components} dims) from {PROJECTION_PATH}")
+        except Exception as e:
+            print(f"❌ Error loading projection: {e}")
+            self.projection = None
+    
+    def project(self, features):
+        """Apply the dimensionality reduction to descriptors, if one is loaded."""
+        if self.projection is None:
+            return features
+        return self.projection.transform(features)
+    
+    def build_gallery_index(self):
+        """Build the in-memory gallery index from the stored face features."""
+        try:
+            start = time.perf_counter()
+            
+            if self.embedding_store is not None:
+                # Rows of the store are used in place when the storage modes match
+                store = self.embedding_store
+                matrix, scales, labels, label_names = store.matrix, store.scales, store.labels, store.user_ids
+            else:
+                matrix, labels, label_names = pack_feature_dict(self.feature_dict)
+                scales = None
+            
+            if self.projection is not None:
+                matrix, scales = self.project(dequantize(matrix, scales)), None
+            
+            if SEARCH_BACKEND == "ivf":
+                index = IVFIndex(matrix, labels, label_names, storage=GALLERY_STORAGE, scales=scales,
+                                 nlist=IVF_NLIST, nprobe=IVF_NPROBE)
+            else:
+                index = GalleryIndex(matrix, labels, label_names, storage=GALLERY_STORAGE, scales=scales)
+            index.build_time = time.perf_counter() - start
+            
+            if index.size > 0:
+                self.gallery_index = index
+                print(f"✅ Gallery index ({SEARCH_BACKEND}, {GALLERY_STORAGE}) built with {index.size} features from "
+                      f"{index.identity_count} users in {index.build_time * 1000:.1f} ms "
+                      f"({index.memory_footprint() / 1024 / 1024:.1f} MB)")
+                
+                if USE_PROTOTYPE_PREFILTER:
+                    self.build_prototype_matcher()
+        except Exception as e:
+            print(f"❌ Error building gallery index: {e}")
+            self.gallery_index = None
+        
+        self.update_searcher()
+    
+    def build_delta_index(self):
+        """Build a small exact index over the enrollment segments not yet compacted."""
         try:
-            features = []
-            labels = []
-            
-            for user_id, user_features in self.feature_dict.items():
-                for feature in user_features:
-                    features.append(feature)
-                    labels.append(user_id)
-            
-            if len(features) > 0:
-                self.knn_model = KNeighborsClassifier(n_neighbors=1, metric='cosine')
-                self.knn_model.fit(features, labels)
-                print(f"✅ KNN model created with {len(features)} features")
+            self.delta_index = self.make_delta_index(self.segments)
+            if self.delta_index is not None:
+                print(f"✅ Delta index built with {self.delta_index.size} recently enrolled features "
+                      f"from {self.delta_index.identity_count} users")
         except Exception as e:
-            print(f"❌ Error creating KNN model: {e}")
-            self.knn_model = None
+            print(f"❌ Error building delta index: {e}")
+            self.delta_index = None
+        
+        self.update_searcher()
     
-    def detect_faces(self, frame):
-        """Detect faces in a frame and return face regions."""
+    def make_delta_index(self, segments):
+        """Create an exact GalleryIndex over segment stores (None if there are none)."""
+        if not segments:
+            return None
+        matrix, labels, label_names = pack_feature_dict(merge_stores(segments))
+        if self.projection is not None:
+            matrix = self.project(matrix)
+        return GalleryIndex(matrix, labels, label_names, storage=GALLERY_STORAGE)
+    
+    def combine_searcher(self, delta_index, prototype_matcher=None):
+        """Return the object used for matching the base gallery together with a delta index."""
+        base = prototype_matcher or self.prototype_matcher or self.gallery_index
+        if delta_index is None:
+            return base
+        if base is None:
+            return delta_index
+        return SegmentedIndex(self.gallery_index, delta_index, base)
+    
+    def update_searcher(self):
+        """Combine the base gallery and the delta index into the object used for matching."""
+        self.searcher = self.combine_searcher(self.delta_index)
+    
+    def stored_model_version(self):
+        """Return a cheap fingerprint of the files the model is loaded from.
+        
+        Appending or compacting segments changes the modification time of the
+        segment directory or the base store, retraining the projection or the
+        prototypes changes their files. The entries are, in order: base store,
+        segment directory, projection, prototypes.
+        """
+        version = []
+        for path in (EMBEDDINGS_STORE_PATH, EMBEDDINGS_SEGMENTS_DIR, PROJECTION_PATH, PROTOTYPES_PATH):
+            try:
+                stat = os.stat(path)
+                version.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                version.append(None)
+        return tuple(version)
+    
+    def check_for_updates(self, force=False):
+        """Start a background reload if the stored model changed.
+        
+        Called from the frame loop; the check itself is a few stat calls and
+        runs at most every MODEL_RELOAD_INTERVAL seconds.
+        
+        Args:
+            force: Check now regardless of the interval
+            
+        Returns:
+            bool: True if a reload was started
+        """
+        now = time.time()
+        if not force and now - self.last_reload_check < MODEL_RELOAD_INTERVAL:
+            return False
+        self.last_reload_check = now
+        
+        if self.reload_thread is not None and self.reload_thread.is_alive():
+            return False
+        version = self.stored_model_version()
+        if version == self.model_version:
+            return False
+        
+        self.reload_thread = threading.Thread(target=self.reload_models, args=(version,),
+                                              name="ModelReload", daemon=True)
+        self.reload_thread.start()
+        return True
+    
+    def reload_models(self, version=None):
+        """Load model changes and swap them in without blocking recognition.
+        
+        New enrollment segments on top of the same base store only rebuild the
+        small delta index, and prototypes rewritten by the enrollment only
+        replace the prototypes of the users that changed. A compacted base or
+        a new projection loads a complete model. Either way the new search
+        structures are built first and swapped in under the model lock in one
+        step.
+        
+        Args:
+            version: Fingerprint from stored_model_version(), read if None
+            
+        Returns:
+            bool: True if a new model was swapped in
+        """
+        start = time.perf_counter()
+        version = version or self.stored_model_version()
+        try:
+            base, segments, sequence = self.embedding_log.open_snapshot()
+            same_base = (self.embedding_store is not None and base is not None and
+                         self.embedding_log.compacted_through(base) ==
+                         self.embedding_log.compacted_through(self.embedding_store))
+            # The trainer rewrites the prototypes on every enrollment, so they
+            # do not decide between an incremental and a full reload
+            same_projection = version[2] == self.model_version[2]
+            
+            if same_base and same_projection and version[0] == self.model_version[0]:
+                # Only new segments: index them and keep the base index
+                new_segments = segments[len(self.segments):]
+                delta_index = self.make_delta_index(segments)
+                prototype_matcher, changed = self.prototype_matcher, 0
+                if self.prototype_matcher is not None and version[3] != self.model_version[3]:
+                    prototype_matcher, changed = self.prototype_matcher.with_prototypes(self.load_prototype_dict())
+                searcher = self.combine_searcher(delta_index, prototype_matcher)
+                with self.model_lock:
+                    self.segments, self.segment_sequence = segments, sequence
+                    self.delta_index, self.searcher = delta_index, searcher
+                    self.prototype_matcher = prototype_matcher
+                    self.model_version = version
+                added = sum(segment.size for segment in new_segments)
+                print(f"🔄 Model reloaded incrementally: {added} new features from {len(new_segments)} segments, "
+                      f"prototypes of {changed} users updated "
+                      f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+            else:
+                reason = "new projection" if same_base and not same_projection else "new base store"
+                # Build a complete model off the frame loop and adopt it
+                fresh = FaceRecognizer()
+                with self.model_lock:
+                    for name in MODEL_ATTRIBUTES:
+                        setattr(self, name, getattr(fresh, name))
+                    self.model_version = version
+                size = sum(index.size for index in (self.gallery_index, self.delta_index) if index is not None)
+                print(f"🔄 Model fully reloaded ({reason}) with {size} features "
+                      f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+            return True
+        except Exception as e:
+            print(f"❌ Error reloading models: {e}")
+            return False
+    
+    def build_prototype_matcher(self):
+        """Build the two-stage prototype matcher in front of the gallery index."""
+        if SEARCH_BACKEND != "exact":
+            print(f"⚠️ Prototype prefilter requires the exact search backend, not '{SEARCH_BACKEND}'")
+            return
+            
+        try:
+            matcher = PrototypeMatcher(self.gallery_index, self.load_prototype_dict(),
+                                       top_m=PROTOTYPE_TOP_M, n_prototypes=PROTOTYPES_PER_USER)
+            self.prototype_matcher = matcher
+            
+            # Expected comparisons per query: all prototypes plus the top-M users' samples
+            per_user = self.gallery_index.size / max(1, self.gallery_index.identity_count)
+            expected = len(matcher.prototypes) + min(PROTOTYPE_TOP_M, self.gallery_index.identity_count) * per_user
+            print(f"✅ Prototype prefilter ready with {len(matcher.prototypes)} prototypes "
+                  f"(~{expected:.0f} instead of {self.gallery_index.size} comparisons per face)")
+        except Exception as e:
+            print(f"❌ Error building prototype matcher: {e}")
+            self.prototype_matcher = None
+    
+    def load_prototype_dict(self):
+        """Load the prototypes saved by the trainer, projected like the gallery."""
+        if not os.path.exists(PROTOTYPES_PATH):
+            return {}
+        with open(PROTOTYPES_PATH, 'rb') as f:
+            prototype_dict = pickle.load(f)
+        
+        # Prototypes are stored as full descriptors
+        return {user_id: self.project(prototypes) for user_id, prototypes in prototype_dict.items()}
+    
+    def detect_faces(self, frame, rois=None):
+        """Detect faces in a frame and return face regions.
+        
+        The detector works on a downscaled copy (see DETECTION_WIDTH); the
+        boxes are mapped back so the face crops are cut from the full-resolution frame.
+        
+        Args:
+            frame: BGR camera frame
+            rois: Optional (x, y, w, h) regions to search instead of the whole frame
+        """
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        faces = self.face_cascade.detectMultiScale(gray, 1.3, 5)
+        image = frame if self.detector.needs_color else gray
+        if rois is None:
+            faces = self.detector.detect(image)
+        else:
+            # Search only the given regions and map the boxes back to the frame
+            faces = []
+            for (rx, ry, rw, rh) in rois:
+                for (x, y, w, h) in self.detector.detect(image[ry:ry+rh, rx:rx+rw], frame.shape[1]):
+                    faces.append((x + rx, y + ry, w, h))
         face_regions = []
         
         for (x, y, w, h) in faces:
@@ -83,96 +353,92 @@ class FaceRecognizer:
     def extract_face_features(self, face_img):
         """Extract features from a face image for enhanced recognition."""
         try:
-            # Resize for consistency
-            face = cv2.resize(face_img, (100, 100))
-            
-            # Calculate histograms in different regions
-            features = []
-            h, w = face.shape[:2]
-            
-            # Convert to grayscale if not already
-            if len(face.shape) > 2:
-                gray = cv2.cvtColor(face, cv2.COLOR_BGR2GRAY)
-            else:
-                gray = face
-                
-            # Calculate histograms for different face regions
-            regions = [(0, 0, w//2, h//2), (w//2, 0, w//2, h//2), 
-                      (0, h//2, w//2, h//2), (w//2, h//2, w//2, h//2)]
-            
-            for (x, y, rw, rh) in regions:
-                roi = gray[y:y+rh, x:x+rw]
-                hist = cv2.calcHist([roi], [0], None, [16], [0, 256])
-                hist = cv2.normalize(hist, hist).flatten()
-                features.extend(hist)
-            
-            # Add LBPH-like features
-            lbp = self.get_lbp_features(gray)
-            features.extend(lbp)
-            
-            # Normalize the feature vector
-            features = np.array(features)
-            features = self.l2_normalizer.transform([features])[0]
-            
-            return features
-            
+            return self.feature_extractor.extract_face_features(face_img)
         except Exception as e:
             print(f"❌ Error extracting face features: {e}")
             return None
     
-    def get_lbp_features(self, gray_img):
-        """Extract LBP-like features manually."""
-        h, w = gray_img.shape
-        lbp_features = []
-        
-        # Calculate simple gradient features in different directions
-        for i in range(1, h-1, 4):
-            for j in range(1, w-1, 4):
-                # Get the 3x3 neighborhood
-                patch = gray_img[i-1:i+2, j-1:j+2]
-                center = patch[1, 1]
-                # Calculate gradient magnitudes
-                dx = abs(int(patch[1, 2]) - int(patch[1, 0]))
-                dy = abs(int(patch[2, 1]) - int(patch[0, 1]))
-                diag1 = abs(int(patch[2, 2]) - int(patch[0, 0]))
-                diag2 = abs(int(patch[2, 0]) - int(patch[0, 2]))
-                
-                lbp_features.extend([dx, dy, diag1, diag2])
+    def extract_batch_features(self, face_imgs):
+        """Extract features for several face images at once.
         
-        return lbp_features
+        Returns:
+            numpy.ndarray: (N, 2564) feature matrix, or None on error
+        """
+        try:
+            return self.feature_extractor.extract_batch(face_imgs)
+        except Exception as e:
+            print(f"❌ Error extracting face features: {e}")
+            return None
     
-    def recognize_face(self, gray_face, color_face):
-        """Recognize a face and return ID and confidence."""
+    def get_lbp_features(self, gray_img):
+        """Extract LBP-like gradient features from a grayscale face."""
+        return self.feature_extractor.get_gradient_features(gray_img).tolist()
+    
+    def recognize_faces(self, face_batch):
+        """Recognize several faces with a single nearest-neighbour query.
+        
+        Args:
+            face_batch: List of color face crops
+            
+        Returns:
+            tuple: (ids, distances, is_known) arrays with one entry per face.
+                ids holds the nearest user ID as a string (None when no model
+                is available), distances the cosine distance to that sample
+                and is_known whether it is below the stranger threshold.
+        """
+        count = len(face_batch)
+        ids = np.full(count, None, dtype=object)
+        distances = np.ones(count, dtype=np.float64)
+        is_known = np.zeros(count, dtype=bool)
+        
+        # Take the current model in one step, a reload may swap it at any time
+        with self.model_lock:
+            searcher, projection, stranger_threshold = self.searcher, self.projection, self.stranger_threshold
+        
+        # Check if a gallery is available
+        if searcher is None or count == 0:
+            return ids, distances, is_known
+            
         try:
-            # Check if KNN model is available
-            if self.knn_model is None:
-                return None, 0, False
-                
-            # Extract features from the face
-            face_features = self.extract_face_features(color_face)
-            if face_features is None:
-                return None, 0, False
+            # Extract features for all faces at once
+            features = self.extract_batch_features(face_batch)
+            if features is None:
+                return ids, distances, is_known
+            if projection is not None:
+                features = projection.transform(features)
                 
-            # Get prediction from the KNN model
-            user_id = self.knn_model.predict([face_features])[0]
-            # Get distance to the nearest neighbor
-            distances, _ = self.knn_model.kneighbors([face_features])
-            distance = distances[0][0]
-            
-            # Check if the distance is below the threshold
-            if distance < STRANGER_THRESHOLD:
-                # Convert distance to confidence score (0-100)
-                confidence = (1 - distance) * 100
-                return str(user_id), confidence, True
-            else:
-                # This is a stranger
-                return None, (1 - distance) * 100, False
+            # One neighbour query gives both the label and its distance
+            neighbor_distances, neighbor_indices = searcher.search(features, k=1)
+            distances = neighbor_distances[:, 0].astype(np.float64)
+            ids = searcher.label_of(neighbor_indices[:, 0])
+            is_known = distances < stranger_threshold
+            
+            return ids, distances, is_known
             
         except Exception as e:
-            print(f"❌ Error recognizing face: {e}")
+            print(f"❌ Error recognizing faces: {e}")
+            return np.full(count, None, dtype=object), np.ones(count, dtype=np.float64), np.zeros(count, dtype=bool)
+    
+    def recognize_face(self, gray_face, color_face):
+        """Recognize a face and return ID and confidence."""
+        # Check if a gallery is available
+        if self.searcher is None:
             return None, 0, False
             
-    def draw_face_box(self, frame, x, y, w, h, label, is_stranger=False):
+        ids, distances, is_known = self.recognize_faces([color_face])
+        if ids[0] is None:
+            return None, 0, False
+            
+        # Convert distance to confidence score (0-100)
+        confidence = (1 - distances[0]) * 100
+        if is_known[0]:
+            return ids[0], confidence, True
+        else:
+            # This is a stranger
+            return None, confidence, False
+            
+    @staticmethod
+    def draw_face_box(frame, x, y, w, h, label, is_stranger=False):
         """Draw box around face with label."""
         # Use red for strangers, blue for known faces
         color = (0, 0, 255) if is_stranger else (255, 0, 0)
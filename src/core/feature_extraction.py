@@ -0,0 +1,173 @@
+"""
+Feature extraction module for the Face Recognition Attendance System.
+Computes the histogram + gradient face descriptor shared by training and recognition.
+"""
+
+import cv2
+import numpy as np
+
+# Size every face crop is resized to before describing it
+FACE_SIZE = (100, 100)
+
+# Number of histogram bins per face quadrant
+HISTOGRAM_BINS = 16
+
+# Spacing (in pixels) between gradient sample points
+GRADIENT_STEP = 4
+
+
+class FeatureExtractor:
+    """Vectorized face descriptor engine.
+
+    The descriptor is made of a 16-bin intensity histogram for each face
+    quadrant (64 values) followed by four absolute gradients (horizontal,
+    vertical and both diagonals) sampled every 4 pixels on the 100x100
+    grayscale face (2,500 values), L2-normalized as a whole.
+    """
+
+    def __init__(self, face_size=FACE_SIZE):
+        """Initialize the extractor for the given face size."""
+        self.face_size = face_size
+
+        # Gradient sample points are centred on rows/columns 1, 5, 9, ...
+        w, h = face_size
+        self.grid_rows = len(range(1, h - 1, GRADIENT_STEP))
+        self.grid_cols = len(range(1, w - 1, GRADIENT_STEP))
+        self.feature_size = 4 * HISTOGRAM_BINS + 4 * self.grid_rows * self.grid_cols
+
+    def prepare_face(self, face_img):
+        """Resize a face crop and convert it to grayscale.
+
+        Args:
+            face_img: Color (BGR) or grayscale face crop of any size
+
+        Returns:
+            numpy.ndarray: uint8 grayscale face of size ``face_size``
+        """
+        # Resize before converting to keep results identical to older models
+        face = cv2.resize(face_img, self.face_size)
+        if len(face.shape) > 2:
+            return cv2.cvtColor(face, cv2.COLOR_BGR2GRAY)
+        return face
+
+    def prepare_faces(self, face_imgs):
+        """Stack a list of face crops into an (N, H, W) grayscale array."""
+        w, h = self.face_size
+        stack = np.empty((len(face_imgs), h, w), dtype=np.uint8)
+        for i, face_img in enumerate(face_imgs):
+            stack[i] = self.prepare_face(face_img)
+        return stack
+
+    def get_histogram_features(self, gray_faces):
+        """Compute the quadrant histograms for a stack of grayscale faces.
+
+        Args:
+            gray_faces: uint8 array of shape (N, H, W)
+
+        Returns:
+            numpy.ndarray: float32 array of shape (N, 64)
+        """
+        n, h, w = gray_faces.shape
+        regions = [(0, 0, w//2, h//2), (w//2, 0, w//2, h//2),
+                   (0, h//2, w//2, h//2), (w//2, h//2, w//2, h//2)]
+
+        histograms = np.empty((n, len(regions) * HISTOGRAM_BINS), dtype=np.float32)
+        for i in range(n):
+            for r, (x, y, rw, rh) in enumerate(regions):
+                roi = gray_faces[i, y:y+rh, x:x+rw]
+                hist = cv2.calcHist([roi], [0], None, [HISTOGRAM_BINS], [0, 256])
+                hist = cv2.normalize(hist, hist).flatten()
+                histograms[i, r*HISTOGRAM_BINS:(r+1)*HISTOGRAM_BINS] = hist
+
+        return histograms
+
+    def get_gradient_features(self, gray_faces):
+        """Compute the sampled gradient magnitudes with strided slicing.
+
+        For every sample point (i, j) the values are, in order,
+        |p[i, j+1] - p[i, j-1]|, |p[i+1, j] - p[i-1, j]|,
+        |p[i+1, j+1] - p[i-1, j-1]| and |p[i+1, j-1] - p[i-1, j+1]|.
+
+        Args:
+            gray_faces: uint8 array of shape (N, H, W) or a single (H, W) face
+
+        Returns:
+            numpy.ndarray: int16 array of shape (N, 4 * rows * cols), or a
+            1-D array when a single face was given
+        """
+        single = gray_faces.ndim == 2
+        faces = gray_faces[np.newaxis] if single else gray_faces
+        faces = faces.astype(np.int16)
+
+        _, h, w = faces.shape
+        rows = len(range(1, h - 1, GRADIENT_STEP))
+        cols = len(range(1, w - 1, GRADIENT_STEP))
+
+        def shifted(dy, dx):
+            # View of the pixels at offset (dy, dx) from every sample point
+            top, left = 1 + dy, 1 + dx
+            return faces[:, top:top + GRADIENT_STEP*(rows - 1) + 1:GRADIENT_STEP,
+                         left:left + GRADIENT_STEP*(cols - 1) + 1:GRADIENT_STEP]
+
+        gradients = np.empty((faces.shape[0], rows, cols, 4), dtype=np.int16)
+        np.abs(shifted(0, 1) - shifted(0, -1), out=gradients[..., 0])
+        np.abs(shifted(1, 0) - shifted(-1, 0), out=gradients[..., 1])
+        np.abs(shifted(1, 1) - shifted(-1, -1), out=gradients[..., 2])
+        np.abs(shifted(1, -1) - shifted(-1, 1), out=gradients[..., 3])
+
+        gradients = gradients.reshape(faces.shape[0], -1)
+        return gradients[0] if single else gradients
+
+    def describe(self, gray_faces):
+        """Compute L2-normalized descriptors for a stack of grayscale faces.
+
+        Args:
+            gray_faces: uint8 array of shape (N, H, W) already at ``face_size``
+
+        Returns:
+            numpy.ndarray: float64 array of shape (N, feature_size)
+        """
+        n = gray_faces.shape[0]
+        features = np.empty((n, self.feature_size), dtype=np.float64)
+        n_hist = 4 * HISTOGRAM_BINS
+        features[:, :n_hist] = self.get_histogram_features(gray_faces)
+        features[:, n_hist:] = self.get_gradient_features(gray_faces)
+
+        # Row-wise L2 normalization, computed the same way as sklearn's Normalizer
+        norms = np.sqrt(np.einsum("ij,ij->i", features, features))
+        norms[norms == 0.0] = 1.0
+        features /= norms[:, np.newaxis]
+
+        return features
+
+    def extract_face_features(self, face_img):
+        """Extract the descriptor of a single face crop.
+
+        Args:
+            face_img: Color (BGR) or grayscale face crop of any size
+
+        Returns:
+            numpy.ndarray: float64 descriptor of length ``feature_size``
+        """
+        gray = self.prepare_face(face_img)
+        return self.describe(gray[np.newaxis])[0]
+
+    def extract_batch(self, face_imgs):
+        """Extract descriptors for several faces in a single call.
+
+        Args:
+            face_imgs: List of face crops of any size, or a uint8 array of
+                shape (N, H, W) holding grayscale faces at ``face_size``
+
+        Returns:
+            numpy.ndarray: float64 array of shape (N, feature_size)
+        """
+        if isinstance(face_imgs, np.ndarray) and face_imgs.ndim == 3:
+            w, h = self.face_size
+            if face_imgs.shape[1:] == (h, w) and face_imgs.dtype == np.uint8:
+                return self.describe(face_imgs)
+
+        if len(face_imgs) == 0:
+            return np.empty((0, self.feature_size), dtype=np.float64)
+
+        return self.describe(self.prepare_faces(face_imgs))
@@ -0,0 +1,201 @@
+"""
+Frame source module for the Face Recognition Attendance System.
+Reads frames from a camera, a video file, a network stream (RTSP/HTTP URL)
+or a folder of images behind one cv2.VideoCapture-like interface, so a
+recorded session can be replayed through the attendance pipeline.
+
+Recorded sources play back at their recorded frame rate by default; with
+realtime=False they are read as fast as possible for benchmarking.
+"""
+
+import os
+import time
+
+import cv2
+
+# Image types read from an image folder
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+class FrameSource:
+    """Common interface of the frame sources.
+
+    read() returns (ret, frame) like cv2.VideoCapture; once a recorded
+    source has no more frames ``finished`` is set and read() returns
+    (False, None).
+    """
+
+    def __init__(self, realtime=True, fps=None):
+        """Set the playback mode.
+
+        Args:
+            realtime: Pace recorded sources to their frame rate, False reads
+                as fast as possible
+            fps: Playback frame rate of recorded sources without their own
+        """
+        self.realtime = realtime
+        self.fps = fps
+        self.finished = False
+        self.frames_read = 0
+        self.next_frame_time = None
+
+    def is_opened(self):
+        """Whether the source can deliver frames."""
+        raise NotImplementedError
+
+    def read_frame(self):
+        """Read the next frame from the underlying source, returns (ret, frame)."""
+        raise NotImplementedError
+
+    def read(self):
+        """Read the next frame, waiting for its time in realtime playback.
+
+        Returns:
+            tuple: (ret, frame) with ret False when no frame is available
+        """
+        if self.finished:
+            return False, None
+        ret, frame = self.read_frame()
+        if not ret:
+            return False, None
+
+        self.wait_for_frame()
+        self.frames_read += 1
+        return True, frame
+
+    def wait_for_frame(self):
+        """Sleep until the next frame is due at the playback frame rate."""
+        if not self.realtime or not self.fps:
+            return
+        now = time.perf_counter()
+        if self.next_frame_time is None or now - self.next_frame_time > 1.0:
+            # First frame, or the reader fell far behind: restart the clock
+            self.next_frame_time = now
+        elif self.next_frame_time > now:
+            time.sleep(self.next_frame_time - now)
+        self.next_frame_time += 1.0 / self.fps
+
+    def release(self):
+        """Close the source."""
+        pass
+
+    def describe(self):
+        """Short description of the source for logs."""
+        return type(self).__name__
+
+
+class CaptureSource(FrameSource):
+    """Camera, video file or network stream read with cv2.VideoCapture."""
+
+    def __init__(self, target, recorded=False, loop=False, reconnect_delay=2.0, **kwargs):
+        """Open the capture.
+
+        Args:
+            target: Camera index, video file path or stream URL
+            recorded: Whether the target is a file with an end, played at
+                its recorded frame rate
+            loop: Restart a recorded file when it ends
+            reconnect_delay: Seconds between reconnection attempts of a
+                camera or stream that stopped delivering frames
+        """
+        super().__init__(**kwargs)
+        self.target = target
+        self.recorded = recorded
+        self.loop = loop
+        self.reconnect_delay = reconnect_delay
+        self.last_reconnect = 0.0
+        self.cap = cv2.VideoCapture(target)
+        if recorded and not self.fps:
+            self.fps = self.cap.get(cv2.CAP_PROP_FPS) or None
+        if not recorded:
+            # Live sources deliver frames at their own pace
+            self.realtime = False
+
+    def is_opened(self):
+        return self.cap.isOpened()
+
+    def read_frame(self):
+        ret, frame = self.cap.read()
+        if ret:
+            return ret, frame
+
+        if self.recorded:
+            if self.loop and self.frames_read > 0:
+                self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                return self.cap.read()
+            self.finished = True
+        elif time.time() - self.last_reconnect > self.reconnect_delay:
+            # Cameras and streams may drop out, try to open them again
+            self.last_reconnect = time.time()
+            self.cap.release()
+            self.cap = cv2.VideoCapture(self.target)
+        return False, None
+
+    def release(self):
+        self.cap.release()
+
+    def describe(self):
+        kind = "video" if self.recorded else "camera" if isinstance(self.target, int) else "stream"
+        return f"{kind} {self.target}"
+
+
+class ImageFolderSource(FrameSource):
+    """Images of a directory read in file name order."""
+
+    def __init__(self, directory, loop=False, **kwargs):
+        """List the images.
+
+        Args:
+            directory: Folder with the images
+            loop: Start again from the first image after the last one
+        """
+        super().__init__(**kwargs)
+        self.directory = directory
+        self.loop = loop
+        self.paths = []
+        if os.path.isdir(directory):
+            self.paths = sorted(os.path.join(directory, f) for f in os.listdir(directory)
+                                if f.lower().endswith(IMAGE_EXTENSIONS))
+        self.position = 0
+
+    def is_opened(self):
+        return len(self.paths) > 0
+
+    def read_frame(self):
+        while self.position < len(self.paths):
+            frame = cv2.imread(self.paths[self.position])
+            self.position += 1
+            if self.loop and self.position == len(self.paths):
+                self.position = 0
+            if frame is not None:
+                return True, frame
+            print(f"⚠️ Could not read image: {self.paths[self.position - 1]}")
+        self.finished = True
+        return False, None
+
+    def describe(self):
+        return f"images {self.directory} ({len(self.paths)} files)"
+
+
+def open_source(source, realtime=True, loop=False, fps=None):
+    """Open a frame source from a camera index, file path, URL or directory.
+
+    Args:
+        source: Camera index (int or digit string), stream URL such as
+            rtsp://..., image directory or video file path
+        realtime: Pace recorded sources to their frame rate, False replays
+            them as fast as possible
+        loop: Restart recorded sources when they end
+        fps: Playback frame rate of image folders (None reads them as fast
+            as possible)
+
+    Returns:
+        FrameSource: The opened source (check is_opened())
+    """
+    if isinstance(source, int) or (isinstance(source, str) and source.isdigit()):
+        return CaptureSource(int(source))
+    if "://" in source:
+        return CaptureSource(source)
+    if os.path.isdir(source):
+        return ImageFolderSource(source, loop=loop, realtime=realtime, fps=fps)
+    return CaptureSource(source, recorded=True, loop=loop, realtime=realtime, fps=fps)
@@ -0,0 +1,258 @@
+"""
+Gallery index module for the Face Recognition Attendance System.
+Holds the enrolled face features in a contiguous matrix for fast cosine search.
+"""
+
+import os
+import sys
+import time
+import numpy as np
+
+# Add project root to path to allow imports from src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.core.quantization import dequantize, quantize, quantized_dot, storage_of
+
+
+def pack_feature_dict(feature_dict):
+    """Pack a {user_id: [feature, ...]} dictionary into gallery arrays.
+
+    Returns:
+        tuple: (matrix, labels, label_names) with the samples of each user
+        in one contiguous block of the float32 matrix
+    """
+    label_names = [user_id for user_id, features in feature_dict.items() if len(features) > 0]
+    blocks = [np.asarray(feature_dict[user_id], dtype=np.float32) for user_id in label_names]
+    counts = [len(block) for block in blocks]
+
+    if blocks:
+        matrix = np.concatenate(blocks, axis=0)
+    else:
+        matrix = np.empty((0, 0), dtype=np.float32)
+    labels = np.repeat(np.arange(len(label_names), dtype=np.int32), counts)
+    return matrix, labels, label_names
+
+
+class GalleryIndex:
+    """Exact cosine-similarity index over L2-normalized face features.
+
+    Samples are stored grouped by identity in a contiguous (N, D) matrix with
+    an int32 label array pointing into ``label_names``. Because every row is
+    unit length, the cosine similarity with a query is a plain dot product
+    and the cosine distance is ``1 - similarity``.
+
+    The matrix is float32 by default and can be kept as float16 or as int8
+    with one scale per row to cut memory; dot products are then computed on
+    the stored values and rescaled.
+    """
+
+    def __init__(self, matrix, labels, label_names, storage='float32', scales=None):
+        """Create an index from prepared arrays.
+
+        Args:
+            matrix: (N, D) array of L2-normalized features grouped by label,
+                either plain floats or already quantized
+            labels: (N,) array of indices into label_names
+            label_names: List of user IDs
+            storage: In-memory storage mode ('float32', 'float16' or 'int8')
+            scales: Per-row scales when matrix is already int8-quantized
+        """
+        if storage_of(matrix, scales) == storage:
+            # Already stored in the requested mode, keep the arrays as they are
+            self.matrix = matrix
+            self.scales = scales
+        else:
+            self.matrix, self.scales = quantize(dequantize(matrix, scales), storage)
+        self.storage = storage
+        self.labels = np.ascontiguousarray(labels, dtype=np.int32)
+        self.label_names = [str(name) for name in label_names]
+
+        # Start offset of each identity block, used for per-identity reductions
+        counts = np.bincount(self.labels, minlength=len(self.label_names))
+        self.offsets = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64)
+        self.counts = counts.astype(np.int64)
+
+    @classmethod
+    def from_feature_dict(cls, feature_dict, **kwargs):
+        """Build an index from a {user_id: [feature, ...]} dictionary.
+
+        Args:
+            feature_dict: Mapping of user IDs to lists of feature vectors
+            **kwargs: Extra options passed to the index constructor
+
+        Returns:
+            GalleryIndex: The built index (empty if there are no features)
+        """
+        start = time.perf_counter()
+        matrix, labels, label_names = pack_feature_dict(feature_dict)
+        index = cls(matrix, labels, label_names, **kwargs)
+        index.build_time = time.perf_counter() - start
+        return index
+
+    @property
+    def size(self):
+        """Number of stored samples."""
+        return self.matrix.shape[0]
+
+    @property
+    def dim(self):
+        """Feature dimensionality."""
+        return self.matrix.shape[1]
+
+    @property
+    def identity_count(self):
+        """Number of enrolled identities."""
+        return len(self.label_names)
+
+    def memory_footprint(self):
+        """Return the memory used by the index arrays in bytes."""
+        scales = self.scales.nbytes if self.scales is not None else 0
+        return self.matrix.nbytes + scales + self.labels.nbytes + self.offsets.nbytes + self.counts.nbytes
+
+    def vectors(self, start=0, end=None):
+        """Return rows start:end of the gallery as float32 vectors."""
+        scales = self.scales[start:end] if self.scales is not None else None
+        return dequantize(self.matrix[start:end], scales)
+
+    def score_rows(self, queries, start=0, end=None):
+        """Compute similarities between queries and the rows start:end."""
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        scales = self.scales[start:end] if self.scales is not None else None
+        return quantized_dot(queries, self.matrix[start:end], scales)
+
+    def similarities(self, queries):
+        """Compute cosine similarities between queries and every sample.
+
+        Args:
+            queries: (Q, D) array of L2-normalized query features
+
+        Returns:
+            numpy.ndarray: float32 array of shape (Q, N)
+        """
+        return self.score_rows(queries)
+
+    def search(self, queries, k=1):
+        """Find the k nearest samples of each query.
+
+        Args:
+            queries: (Q, D) array of L2-normalized query features
+            k: Number of neighbours to return
+
+        Returns:
+            tuple: (distances, indices) arrays of shape (Q, k) sorted by
+            increasing cosine distance
+        """
+        scores = self.similarities(queries)
+        k = min(k, self.size)
+        if k == 0:
+            empty = np.empty((scores.shape[0], 0))
+            return empty, empty.astype(np.int64)
+
+        if k < self.size:
+            # Partial selection of the k best, then sort only those
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(self.size), (scores.shape[0], self.size))
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+
+        indices = np.take_along_axis(top, order, axis=1)
+        distances = 1.0 - np.take_along_axis(top_scores, order, axis=1)
+        return np.clip(distances, 0.0, 2.0), indices
+
+    def best_per_identity(self, queries):
+        """Compute the best similarity of each query to every identity.
+
+        Args:
+            queries: (Q, D) array of L2-normalized query features
+
+        Returns:
+            numpy.ndarray: float32 array of shape (Q, identity_count)
+        """
+        scores = self.similarities(queries)
+        return np.maximum.reduceat(scores, self.offsets, axis=1)
+
+    def search_identities(self, queries, k=1):
+        """Find the k closest identities of each query.
+
+        Args:
+            queries: (Q, D) array of L2-normalized query features
+            k: Number of identities to return
+
+        Returns:
+            tuple: (distances, label_indices) arrays of shape (Q, k) sorted by
+            increasing cosine distance to the identity's closest sample
+        """
+        best = self.best_per_identity(queries)
+        k = min(k, self.identity_count)
+        order = np.argsort(-best, axis=1)[:, :k]
+        distances = 1.0 - np.take_along_axis(best, order, axis=1)
+        return np.clip(distances, 0.0, 2.0), order
+
+    def label_of(self, indices):
+        """Map sample indices to user IDs."""
+        return np.array([self.label_names[label] for label in self.labels[np.ravel(indices)]],
+                        dtype=object).reshape(np.shape(indices))
+
+
+class SegmentedIndex:
+    """Search a base index together with a small index of recent enrollments.
+
+    The base keeps its own search path (exact, IVF or prototype prefilter)
+    while samples appended since the last compaction are searched exactly.
+    Indices returned by search() number the base samples first, followed by
+    the delta samples.
+    """
+
+    def __init__(self, base, delta, base_searcher=None):
+        """Combine two indexes.
+
+        Args:
+            base: GalleryIndex over the compacted feature store
+            delta: GalleryIndex over the pending enrollment segments
+            base_searcher: Object used to search the base (defaults to base)
+        """
+        self.base = base
+        self.delta = delta
+        self.base_searcher = base_searcher or base
+
+    @property
+    def size(self):
+        """Number of stored samples."""
+        return self.base.size + self.delta.size
+
+    @property
+    def identity_count(self):
+        """Number of enrolled identities."""
+        return len(set(self.base.label_names).union(self.delta.label_names))
+
+    def memory_footprint(self):
+        """Return the memory used by both indexes in bytes."""
+        return self.base.memory_footprint() + self.delta.memory_footprint()
+
+    def search(self, queries, k=1):
+        """Find the k nearest samples of each query in the base and the delta.
+
+        Args:
+            queries: (Q, D) array of L2-normalized query features
+            k: Number of neighbours to return
+
+        Returns:
+            tuple: (distances, indices) arrays of shape (Q, k) sorted by
+            increasing cosine distance
+        """
+        base_distances, base_indices = self.base_searcher.search(queries, k)
+        delta_distances, delta_indices = self.delta.search(queries, k)
+
+        distances = np.concatenate([base_distances, delta_distances], axis=1)
+        indices = np.concatenate([base_indices, delta_indices + self.base.size], axis=1)
+        order = np.argsort(distances, axis=1, kind='stable')[:, :min(k, self.size)]
+        return np.take_along_axis(distances, order, axis=1), np.take_along_axis(indices, order, axis=1)
+
+    def label_of(self, indices):
+        """Map sample indices to user IDs."""
+        indices = np.asarray(indices)
+        in_base = indices < self.base.size
+        labels = np.empty(indices.shape, dtype=object)
+        labels[in_base] = self.base.label_of(indices[in_base])
+        labels[~in_base] = self.delta.label_of(indices[~in_base] - self.base.size)
+        return labels
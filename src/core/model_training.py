@@ -1,6 +1,6 @@
 """
 Model training module for Face Recognition Attendance System.
-Handles processing of face data and extraction of features for KNN-based recognition.
+Handles processing of face data and extraction of features for nearest-neighbour recognition.
 """
 
 import cv2
@@ -9,18 +9,30 @@ import os
 import sys
 import pickle
 import shutil
-from sklearn.preprocessing import Normalizer
+import tempfile
 from tqdm import tqdm
 
 # Add project root to path to allow imports from config
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
-from config.settings import DATASET_DIR, MODELS_DIR, EMBEDDINGS_PATH
+from src.core.face_detector import create_detector
+from src.core.feature_extraction import FeatureExtractor
+from src.core.prototypes import compute_prototype_dict
+from src.core.projection import PCAProjection
+from src.core.embedding_store import migrate_pickle
+from src.core.embedding_log import EmbeddingLog
+from config.settings import (DATASET_DIR, MODELS_DIR, EMBEDDINGS_PATH, EMBEDDINGS_STORE_PATH,
+                             EMBEDDINGS_SEGMENTS_DIR, EMBEDDING_STORAGE, COMPACTION_SEGMENT_LIMIT, PROTOTYPES_PATH,
+                             PROTOTYPES_PER_USER, PROJECTION_PATH, PROJECTION_DIM, PROJECTION_WHITEN,
+                             PROJECTION_REFIT_DRIFT)
 
 class ModelTrainer:
     def __init__(self):
         """Initialize face detector and feature extractor for training."""
-        self.detector = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
-        self.l2_normalizer = Normalizer('l2')
+        # The samples are face crops saved by the registration window: search
+        # them at full resolution without the live-stream minimum face size
+        self.detector = create_detector(detection_width=None, min_face_size=0)
+        self.feature_extractor = FeatureExtractor()
+        self.embedding_log = EmbeddingLog(EMBEDDINGS_STORE_PATH, EMBEDDINGS_SEGMENTS_DIR, EMBEDDING_STORAGE)
         
         # Ensure models directory exists
         if not os.path.exists(MODELS_DIR):
@@ -29,66 +41,33 @@ class ModelTrainer:
     def extract_face_features(self, face_img):
         """Extract features from a face image for recognition."""
         try:
-            # Resize for consistency
-            face = cv2.resize(face_img, (100, 100))
-            
-            # Calculate histograms in different regions
-            features = []
-            h, w = face.shape[:2]
-            
-            # Convert to grayscale if not already
-            if len(face.shape) > 2:
-                gray = cv2.cvtColor(face, cv2.COLOR_BGR2GRAY)
-            else:
-                gray = face
-                
-            # Calculate histograms for different face regions
-            regions = [(0, 0, w//2, h//2), (w//2, 0, w//2, h//2), 
-                      (0, h//2, w//2, h//2), (w//2, h//2, w//2, h//2)]
-            
-            for (x, y, rw, rh) in regions:
-                roi = gray[y:y+rh, x:x+rw]
-                hist = cv2.calcHist([roi], [0], None, [16], [0, 256])
-                hist = cv2.normalize(hist, hist).flatten()
-                features.extend(hist)
-            
-            # Add LBPH-like features
-            lbp = self.get_lbp_features(gray)
-            features.extend(lbp)
-            
-            # Normalize the feature vector
-            features = np.array(features)
-            features = self.l2_normalizer.transform([features])[0]
-            
-            return features
-            
+            return self.feature_extractor.extract_face_features(face_img)
         except Exception as e:
             print(f"❌ Error extracting face features: {e}")
             return None
     
-    def get_lbp_features(self, gray_img):
-        """Extract LBP-like features manually."""
-        h, w = gray_img.shape
-        lbp_features = []
-        
-        # Calculate simple gradient features in different directions
-        for i in range(1, h-1, 4):
-            for j in range(1, w-1, 4):
-                # Get the 3x3 neighborhood
-                patch = gray_img[i-1:i+2, j-1:j+2]
-                center = patch[1, 1]
-                # Calculate gradient magnitudes
-                dx = abs(int(patch[1, 2]) - int(patch[1, 0]))
-                dy = abs(int(patch[2, 1]) - int(patch[0, 1]))
-                diag1 = abs(int(patch[2, 2]) - int(patch[0, 0]))
-                diag2 = abs(int(patch[2, 0]) - int(patch[0, 2]))
-                
-                lbp_features.extend([dx, dy, diag1, diag2])
+    def extract_batch_features(self, face_imgs):
+        """Extract features for several face images at once.
         
-        return lbp_features
+        Returns:
+            numpy.ndarray: (N, 2564) feature matrix, or None on error
+        """
+        try:
+            return self.feature_extractor.extract_batch(face_imgs)
+        except Exception as e:
+            print(f"❌ Error extracting face features: {e}")
+            return None
+    
+    def get_lbp_features(self, gray_img):
+        """Extract LBP-like gradient features from a grayscale face."""
+        return self.feature_extractor.get_gradient_features(gray_img).tolist()
     
     def process_images_and_extract_features(self):
-        """Process images in the dataset directory, extract features, and then remove the images."""
+        """Process images in the dataset directory, extract features, and then remove the images.
+        
+        Returns:
+            dict: Mapping of user IDs to the features of the new images, or None
+        """
         print("🔄 Processing images and extracting features...")
         
         if not os.path.exists(DATASET_DIR):
@@ -102,19 +81,17 @@ class ModelTrainer:
             print("❌ No images found in dataset directory!")
             return None
             
-        # Load existing features if available
+        # Only the new samples are collected, they are appended to the stored features
         feature_dict = {}
-        if os.path.exists(EMBEDDINGS_PATH):
-            try:
-                with open(EMBEDDINGS_PATH, 'rb') as f:
-                    feature_dict = pickle.load(f)
-                print(f"✅ Loaded existing features from {EMBEDDINGS_PATH}")
-            except Exception as e:
-                print(f"⚠️ Could not load existing features: {e}")
         
         # Track processed files for deletion later
         processed_files = []
         
+        # Face crops waiting for feature extraction
+        face_imgs = []
+        face_ids = []
+        face_paths = []
+        
         for image_path in tqdm(image_paths, desc="Extracting Features"):
             # Load the image
             img = cv2.imread(image_path)
@@ -129,23 +106,29 @@ class ModelTrainer:
                 print(f"⚠️ Invalid filename format: {image_path}")
                 continue
                 
-            # Detect faces in the image
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            faces = self.detector.detectMultiScale(gray)
+            # Detect faces in the image, a crop without a detection is the face itself
+            faces = self.detector.detect(img)
+            if len(faces) == 0:
+                faces = [(0, 0, img.shape[1], img.shape[0])]
             
             if len(faces) != 1:
                 print(f"⚠️ Image {image_path} has {len(faces)} faces, expected 1")
                 continue
                 
-            # Extract the face region and compute features
+            # Keep the face region, features are computed for all faces at once
             for (x, y, w, h) in faces:
-                face_img = img[y:y+h, x:x+w]
-                features = self.extract_face_features(face_img)
-                
-                if features is not None:
+                face_imgs.append(img[y:y+h, x:x+w])
+                face_ids.append(id_)
+                face_paths.append(image_path)
+        
+        # Describe every collected face in a single vectorized call
+        if face_imgs:
+            features = self.extract_batch_features(face_imgs)
+            if features is not None:
+                for id_, image_path, face_features in zip(face_ids, face_paths, features):
                     if id_ not in feature_dict:
                         feature_dict[id_] = []
-                    feature_dict[id_].append(features)
+                    feature_dict[id_].append(face_features)
                     processed_files.append(image_path)
         
         # Remove processed images
@@ -161,7 +144,7 @@ class ModelTrainer:
         return feature_dict
 
     def train(self):
-        """Extract features from faces, build the KNN model, and save the features."""
+        """Extract features from faces and save them for the recognition gallery."""
         print("🔄 Training face recognition model...")
         
         # Process images, extract features, and remove them
@@ -171,17 +154,124 @@ class ModelTrainer:
             print("❌ No face features extracted")
             return False
             
-        # Save the extracted features
+        # Append the new features to the enrollment log
         try:
-            with open(EMBEDDINGS_PATH, 'wb') as f:
-                pickle.dump(feature_dict, f)
-            print(f"✅ Face features saved to {EMBEDDINGS_PATH}")
+            # Carry over users from a pickle file that was never migrated
+            if not os.path.exists(EMBEDDINGS_STORE_PATH) and os.path.exists(EMBEDDINGS_PATH):
+                rows = migrate_pickle(EMBEDDINGS_PATH, EMBEDDINGS_STORE_PATH, EMBEDDING_STORAGE)
+                print(f"✅ Migrated {rows} existing features from {EMBEDDINGS_PATH}")
+            
+            sequence = self.embedding_log.append(feature_dict)
+            print(f"✅ Face features appended as segment {sequence} in {EMBEDDINGS_SEGMENTS_DIR} ({EMBEDDING_STORAGE})")
             
             # Display summary
             total_features = sum(len(feat) for feat in feature_dict.values())
-            print(f"📊 Generated features for {len(feature_dict)} users with {total_features} total face samples")
+            print(f"📊 Generated features for {len(feature_dict)} users with {total_features} new face samples")
+            
+            # Update the prototypes of the enrolled users from all their samples
+            self.save_prototypes(self.embedding_log.user_features(feature_dict.keys()))
+            
+            # Refit the dimensionality reduction at compaction, or earlier if the new samples drifted
+            pending = self.embedding_log.pending_segment_count()
+            compacting = pending >= COMPACTION_SEGMENT_LIMIT
+            if PROJECTION_DIM and self.projection_needs_refit(feature_dict, compacting):
+                self.save_projection(self.embedding_log.to_feature_dict())
+            
+            # Merge the segments into the base store once enough have accumulated
+            if compacting:
+                print(f"🔄 Compacting {pending} enrollment segments in the background...")
+                self.embedding_log.compact_in_background()
             
             return True
         except Exception as e:
             print(f"❌ Error saving face features: {e}")
-            return False
\ No newline at end of file
+            return False
+    
+    def save_prototypes(self, feature_dict):
+        """Compute prototypes for some users and save them next to the features.
+        
+        Prototypes of users not in feature_dict are kept from the existing file.
+        
+        Args:
+            feature_dict: Mapping of user IDs to all of their feature vectors
+            
+        Returns:
+            bool: True if the prototypes were saved, False otherwise
+        """
+        try:
+            prototypes = {}
+            if os.path.exists(PROTOTYPES_PATH):
+                with open(PROTOTYPES_PATH, 'rb') as f:
+                    prototypes = pickle.load(f)
+            prototypes.update(compute_prototype_dict(feature_dict, PROTOTYPES_PER_USER))
+            
+            fd, tmp_path = tempfile.mkstemp(dir=MODELS_DIR, prefix=".tmp_", suffix=".pkl")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(prototypes, f)
+                os.replace(tmp_path, PROTOTYPES_PATH)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            
+            total_prototypes = sum(len(p) for p in prototypes.values())
+            print(f"✅ Saved {total_prototypes} prototypes for {len(prototypes)} users to {PROTOTYPES_PATH}")
+            return True
+        except Exception as e:
+            print(f"⚠️ Could not save prototypes: {e}")
+            return False
+    
+    def projection_needs_refit(self, feature_dict, compacting):
+        """Decide whether the PCA projection has to be fitted again after an enrollment.
+        
+        Refitting scans the whole gallery, so it is done when the segments are
+        compacted, when the saved projection is missing or was fitted with other
+        settings, or when the new samples lose more than PROJECTION_REFIT_DRIFT
+        of their variance beyond what the gallery loses.
+        
+        Args:
+            feature_dict: Mapping of user IDs to their newly extracted feature vectors
+            compacting: Whether the segments are about to be compacted
+            
+        Returns:
+            bool: True if the projection should be refitted
+        """
+        if compacting or not os.path.exists(PROJECTION_PATH):
+            return True
+        try:
+            projection = PCAProjection.load(PROJECTION_PATH)
+        except Exception as e:
+            print(f"⚠️ Could not load projection, refitting: {e}")
+            return True
+        if projection.whiten != PROJECTION_WHITEN or projection.requested_components != PROJECTION_DIM:
+            return True
+        
+        features = np.array([f for user_features in feature_dict.values() for f in user_features])
+        drift = projection.unexplained_ratio(features) - projection.unexplained_ratio()
+        if drift > PROJECTION_REFIT_DRIFT:
+            print(f"ℹ️ New samples lose {drift * 100:.1f}% more variance than the gallery, refitting the projection")
+            return True
+        print(f"ℹ️ Projection kept until the next compaction (drift {max(drift, 0.0) * 100:.1f}%)")
+        return False
+    
+    def save_projection(self, feature_dict):
+        """Fit the PCA projection on all stored features and save it.
+        
+        Args:
+            feature_dict: Mapping of user IDs to lists of feature vectors
+            
+        Returns:
+            bool: True if the projection was saved, False otherwise
+        """
+        try:
+            features = np.array([f for user_features in feature_dict.values() for f in user_features])
+            projection = PCAProjection(PROJECTION_DIM, whiten=PROJECTION_WHITEN).fit(features)
+            projection.save(PROJECTION_PATH)
+            
+            retained = projection.explained_variance_ratio.sum() * 100
+            print(f"✅ Saved {projection.n_components}-dim projection ({retained:.1f}% variance retained) "
+                  f"to {PROJECTION_PATH}")
+            return True
+        except Exception as e:
+            print(f"⚠️ Could not save projection: {e}")
+            return False
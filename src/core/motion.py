@@ -0,0 +1,140 @@
+"""
+Motion gating module for the Face Recognition Attendance System.
+Compares downscaled frames with a background model so face detection can be
+skipped on a static scene and limited to the moving regions otherwise.
+"""
+
+import cv2
+import numpy as np
+
+# Supported background models
+METHODS = ("difference", "mog2")
+
+
+class MotionResult:
+    """Outcome of the motion gate for one frame."""
+
+    def __init__(self, has_motion, rois, score):
+        """Store the result.
+
+        Args:
+            has_motion: Whether enough of the frame changed
+            rois: (x, y, w, h) regions of the full-size frame that moved, or
+                None when detection should cover the whole frame
+            score: Fraction of the downscaled frame that changed
+        """
+        self.has_motion = has_motion
+        self.rois = rois
+        self.score = score
+
+
+class MotionGate:
+    """Cheap motion detector in front of the face detector."""
+
+    def __init__(self, method="difference", width=160, pixel_threshold=25, min_area=0.002,
+                 roi_padding=0.5, full_frame_area=0.3, learning_rate=0.05):
+        """Create the gate.
+
+        Args:
+            method: "difference" against a running average or "mog2"
+                (OpenCV's Gaussian-mixture background subtractor)
+            width: Width of the downscaled frame the gate works on
+            pixel_threshold: Grey-level difference (0-255) counted as changed
+            min_area: Fraction of the frame that must change to count as motion
+            roi_padding: Margin added around each moving region, relative to
+                its size, so the whole face fits in the region
+            full_frame_area: Moving fraction above which the whole frame is
+                detected instead of separate regions
+            learning_rate: How fast the running average follows the scene
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown motion gate method '{method}', expected one of {list(METHODS)}")
+
+        self.method = method
+        self.width = width
+        self.pixel_threshold = pixel_threshold
+        self.min_area = min_area
+        self.roi_padding = roi_padding
+        self.full_frame_area = full_frame_area
+        self.learning_rate = learning_rate
+
+        self.background = None
+        self.subtractor = None
+        if method == "mog2":
+            self.subtractor = cv2.createBackgroundSubtractorMOG2(history=300, varThreshold=pixel_threshold,
+                                                                 detectShadows=False)
+        self.kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
+
+    def reset(self):
+        """Forget the background model."""
+        self.background = None
+        if self.subtractor is not None:
+            self.subtractor = cv2.createBackgroundSubtractorMOG2(history=300, varThreshold=self.pixel_threshold,
+                                                                 detectShadows=False)
+
+    def foreground_mask(self, small):
+        """Return the binary mask of changed pixels of a downscaled grey frame."""
+        if self.subtractor is not None:
+            return self.subtractor.apply(small, learningRate=self.learning_rate)
+
+        blurred = cv2.GaussianBlur(small, (5, 5), 0).astype(np.float32)
+        if self.background is None:
+            self.background = blurred
+            return np.zeros(small.shape, dtype=np.uint8)
+
+        difference = cv2.absdiff(blurred, self.background)
+        cv2.accumulateWeighted(blurred, self.background, self.learning_rate)
+        return (difference > self.pixel_threshold).astype(np.uint8) * 255
+
+    def check(self, frame):
+        """Update the background model with a frame and report its motion.
+
+        Args:
+            frame: BGR camera frame
+
+        Returns:
+            MotionResult: Whether the frame moved and which regions did
+        """
+        height, width = frame.shape[:2]
+        scale = width / float(self.width)
+        small = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY),
+                           (self.width, max(1, int(round(height / scale)))), interpolation=cv2.INTER_AREA)
+
+        mask = cv2.dilate(self.foreground_mask(small), self.kernel, iterations=2)
+        score = float(np.count_nonzero(mask)) / mask.size
+        if score < self.min_area:
+            return MotionResult(False, [], score)
+        if score > self.full_frame_area:
+            return MotionResult(True, None, score)
+
+        # Bounding boxes of the moving blobs, grown and scaled to the full frame
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        rois = []
+        for contour in contours:
+            x, y, w, h = cv2.boundingRect(contour)
+            pad_x, pad_y = int(w * self.roi_padding), int(h * self.roi_padding)
+            x0, y0 = max(0, int((x - pad_x) * scale)), max(0, int((y - pad_y) * scale))
+            x1, y1 = min(width, int((x + w + pad_x) * scale)), min(height, int((y + h + pad_y) * scale))
+            rois.append((x0, y0, x1 - x0, y1 - y0))
+        return MotionResult(True, merge_rois(rois), score)
+
+
+def merge_rois(rois):
+    """Merge overlapping (x, y, w, h) regions until none overlap."""
+    rois = list(rois)
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(rois)):
+            for j in range(i + 1, len(rois)):
+                a, b = rois[i], rois[j]
+                if a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]:
+                    x0, y0 = min(a[0], b[0]), min(a[1], b[1])
+                    x1, y1 = max(a[0] + a[2], b[0] + b[2]), max(a[1] + a[3], b[1] + b[3])
+                    rois[i] = (x0, y0, x1 - x0, y1 - y0)
+                    del rois[j]
+                    merged = True
+                    break
+            if merged:
+                break
+    return rois
@@ -0,0 +1,225 @@
+"""
+Multi-camera module for the Face Recognition Attendance System.
+Serves several frame sources from one process with a single FaceRecognizer
+(one gallery in memory however many cameras are added) and a single
+DatabaseManager.
+
+    capture thread (camera 1) ──> latest frame ─┐
+    capture thread (camera 2) ──> latest frame ─┼─> recognition thread (round robin) ──> database
+    capture thread (camera N) ──> latest frame ─┘
+
+Each stream keeps its own detection scheduler, motion gate and tracker. The
+recognition thread visits the streams in turn and processes the newest
+frame of each, so a busy camera cannot starve the others and recognition
+and attendance writes never run concurrently.
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Add project root to path to allow imports from config
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.core.attendance import AttendanceProcessor
+from src.core.face_recognition import FaceRecognizer
+from src.core.frame_source import open_source
+from src.core.pipeline import DropOldestQueue, StageStats
+from src.database.db_manager import DatabaseManager
+from src.database.attendance_writer import AttendanceWriter
+from config.settings import DB_PATH, ATTENDANCE_WRITE_BEHIND
+
+
+class CameraStream:
+    """One frame source with its capture thread, processor and statistics."""
+
+    def __init__(self, name, source, processor):
+        """Create the stream.
+
+        Args:
+            name: Name of the stream in statistics and logs
+            source: Opened FrameSource
+            processor: AttendanceProcessor holding this stream's tracking state
+        """
+        self.name = name
+        self.source = source
+        self.processor = processor
+        # Only the newest frame is worth recognizing
+        self.frame_queue = DropOldestQueue(1)
+        self.recognition_stats = StageStats()
+        self.captured = 0
+        self.processed = 0
+        self.last_result = None
+        self.capture_error = False
+        self.finished = False
+        self.thread = None
+
+    def capture_loop(self, stop_event, frame_ready):
+        """Read frames into the stream's queue until stopped or the source ends."""
+        while not stop_event.is_set():
+            ret, frame = self.source.read()
+            if not ret and self.source.finished:
+                self.finished = True
+                frame_ready.set()
+                break
+            if not ret:
+                self.capture_error = True
+                time.sleep(0.1)
+                continue
+
+            self.capture_error = False
+            self.captured += 1
+            self.frame_queue.put(frame)
+            frame_ready.set()
+
+    def process_next(self):
+        """Process the newest queued frame, returns False if there was none."""
+        frame = self.frame_queue.get_latest()
+        if frame is None:
+            return False
+
+        start = time.perf_counter()
+        self.last_result = self.processor.process_frame(frame)
+        self.recognition_stats.record(time.perf_counter() - start)
+        self.processed += 1
+        return True
+
+
+class MultiCameraRunner:
+    """Runs several frame sources against one shared gallery and database."""
+
+    def __init__(self, sources, db_path=DB_PATH, realtime=True):
+        """Open the sources and build the shared recognizer.
+
+        Args:
+            sources: Camera indices, video files, stream URLs or image folders
+            db_path: SQLite database attendance is recorded in
+            realtime: Play recordings at their frame rate, False reads them
+                as fast as possible
+        """
+        self.face_recognizer = FaceRecognizer()
+        self.db_manager = DatabaseManager(db_path)
+        self.attendance_writer = AttendanceWriter(db_path) if ATTENDANCE_WRITE_BEHIND else None
+        self.streams = []
+        logged_users, logged_names, attendance_status = {}, {}, {}
+        for i, spec in enumerate(sources):
+            source = open_source(spec, realtime=realtime)
+            if not source.is_opened():
+                print(f"❌ Could not open frame source: {spec}")
+                continue
+            processor = AttendanceProcessor(0, face_recognizer=self.face_recognizer, db_manager=self.db_manager,
+                                            attendance_writer=self.attendance_writer)
+            # A person recorded by one camera is not recorded again by another
+            processor.logged_users = logged_users
+            processor.logged_names = logged_names
+            processor.attendance_status = attendance_status
+            self.streams.append(CameraStream(f"cam{i}", source, processor))
+
+        self.stop_event = threading.Event()
+        self.frame_ready = threading.Event()
+        self.next_stream = 0
+        self.started_at = None
+
+    def start_capture(self):
+        """Start one capture thread per stream."""
+        self.stop_event.clear()
+        self.started_at = time.perf_counter()
+        for stream in self.streams:
+            stream.thread = threading.Thread(target=stream.capture_loop, args=(self.stop_event, self.frame_ready),
+                                             name=f"FrameCapture-{stream.name}", daemon=True)
+            stream.thread.start()
+
+    def process_round(self, max_frames=None):
+        """Process at most one frame of every stream, starting after the last stream served.
+
+        Args:
+            max_frames: Streams that processed this many frames are skipped
+
+        Returns:
+            int: Number of frames processed
+        """
+        processed = 0
+        count = len(self.streams)
+        for offset in range(count):
+            stream = self.streams[(self.next_stream + offset) % count]
+            if max_frames is not None and stream.processed >= max_frames:
+                continue
+            try:
+                if stream.process_next():
+                    processed += 1
+            except Exception as e:
+                print(f"❌ Error processing frame from {stream.name}: {e}")
+        # Rotate the starting stream so no camera is always served first
+        self.next_stream = (self.next_stream + 1) % max(1, count)
+        return processed
+
+    def run(self, stop_event=None, max_seconds=None, max_frames=None):
+        """Capture and recognize until stopped, timed out or every source ended.
+
+        Args:
+            stop_event: Optional threading.Event that ends the run when set
+            max_seconds: Stop after this many seconds (None runs until stopped)
+            max_frames: Stop once every stream processed this many frames
+        """
+        if stop_event is not None:
+            self.stop_event = stop_event
+        self.start_capture()
+        try:
+            while not self.stop_event.is_set():
+                if max_seconds is not None and time.perf_counter() - self.started_at >= max_seconds:
+                    break
+                if all((stream.finished and len(stream.frame_queue) == 0) or
+                       (max_frames is not None and stream.processed >= max_frames) for stream in self.streams):
+                    break
+                self.frame_ready.clear()
+                if self.process_round(max_frames) == 0:
+                    # Nothing new from any camera, wait for the next frame
+                    self.frame_ready.wait(0.05)
+        finally:
+            self.stop()
+
+    def stop(self, timeout=2.0):
+        """Stop the capture threads."""
+        self.stop_event.set()
+        for stream in self.streams:
+            if stream.thread is not None:
+                stream.thread.join(timeout)
+                stream.thread = None
+
+    def get_stats(self):
+        """Report the capture and recognition rate of every stream.
+
+        Returns:
+            dict: Per stream name, the source, frames captured and processed,
+            capture and processed fps, dropped frames and recognition latency
+        """
+        elapsed = max(time.perf_counter() - self.started_at, 1e-9) if self.started_at else 1e-9
+        stats = {}
+        for stream in self.streams:
+            stats[stream.name] = {
+                "source": stream.source.describe(),
+                "captured": stream.captured,
+                "processed": stream.processed,
+                "capture_fps": stream.captured / elapsed,
+                "processed_fps": stream.processed / elapsed,
+                "dropped": stream.frame_queue.dropped,
+                "recognition_ms": stream.recognition_stats.as_dict()["average_ms"],
+            }
+        return stats
+
+    def format_stats(self):
+        """Return a one-line summary of get_stats()."""
+        return " | ".join(f"{name} {s['processed_fps']:.1f}/{s['capture_fps']:.1f} fps {s['recognition_ms']:.1f} ms"
+                          for name, s in self.get_stats().items())
+
+    def close(self):
+        """Stop the streams and release the sources and the database."""
+        self.stop()
+        for stream in self.streams:
+            stream.processor.close()
+            stream.source.release()
+        if self.attendance_writer is not None:
+            self.attendance_writer.close()
+            for stream in self.streams:
+                stream.processor.apply_attendance_results()
+        self.db_manager.close()
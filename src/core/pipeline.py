@@ -0,0 +1,282 @@
+"""
+Frame pipeline module for the Face Recognition Attendance System.
+Runs camera capture and face recognition on background threads so the GUI
+thread only displays finished frames.
+
+    capture thread ──> frame queue ──> recognition thread ──> result queue ──> GUI
+
+Both queues are bounded and drop their oldest entry when full, so a slow
+stage skips stale frames instead of building up latency. run_source() is
+the synchronous alternative for replays, processing every frame in order.
+"""
+
+import threading
+import time
+from collections import deque
+
+
+class DropOldestQueue:
+    """Bounded thread-safe queue that discards the oldest item when full."""
+
+    def __init__(self, maxsize=2):
+        """Create the queue.
+
+        Args:
+            maxsize: Maximum number of items kept
+        """
+        self.items = deque(maxlen=maxsize)
+        self.condition = threading.Condition()
+        self.dropped = 0
+
+    def put(self, item):
+        """Add an item, dropping the oldest one if the queue is full."""
+        with self.condition:
+            if len(self.items) == self.items.maxlen:
+                self.dropped += 1
+            self.items.append(item)
+            self.condition.notify()
+
+    def get(self, timeout=None):
+        """Remove and return the oldest item, or None if none arrived in time."""
+        with self.condition:
+            if not self.items:
+                self.condition.wait(timeout)
+            return self.items.popleft() if self.items else None
+
+    def get_latest(self):
+        """Remove all items and return the newest one (None if empty), without blocking."""
+        with self.condition:
+            if not self.items:
+                return None
+            latest = self.items.pop()
+            self.dropped += len(self.items)
+            self.items.clear()
+            return latest
+
+    def __len__(self):
+        return len(self.items)
+
+
+class StageStats:
+    """Latency statistics of one pipeline stage."""
+
+    def __init__(self, smoothing=0.1):
+        """Create empty statistics.
+
+        Args:
+            smoothing: Weight of the newest sample in the moving average
+        """
+        self.smoothing = smoothing
+        self.lock = threading.Lock()
+        self.count = 0
+        self.last_ms = 0.0
+        self.average_ms = 0.0
+
+    def record(self, seconds):
+        """Add one stage latency measurement."""
+        ms = seconds * 1000
+        with self.lock:
+            self.average_ms = ms if self.count == 0 else (
+                self.smoothing * ms + (1 - self.smoothing) * self.average_ms)
+            self.last_ms = ms
+            self.count += 1
+
+    def as_dict(self):
+        """Return the statistics as a dictionary."""
+        with self.lock:
+            return {"count": self.count, "last_ms": self.last_ms, "average_ms": self.average_ms}
+
+
+class FramePipeline:
+    """Capture and recognition stages running on their own threads."""
+
+    def __init__(self, capture, processor, frame_queue_size=2, result_queue_size=2):
+        """Create the pipeline (call start() to run it).
+
+        Args:
+            capture: FrameSource, or any object with a cv2.VideoCapture-like read() method
+            processor: AttendanceProcessor used to annotate frames
+            frame_queue_size: Frames waiting for recognition
+            result_queue_size: Processed frames waiting for display
+        """
+        self.capture = capture
+        self.processor = processor
+        workers = processor.pool.workers if processor.pool is not None else 1
+        self.frame_queue = DropOldestQueue(max(frame_queue_size, workers))
+        self.result_queue = DropOldestQueue(result_queue_size)
+        self.stats = {"capture": StageStats(), "recognition": StageStats(), "end_to_end": StageStats()}
+        self.capture_error = False
+        self.finished = False
+        self.stop_event = threading.Event()
+        self.threads = []
+
+    def start(self):
+        """Start the capture and recognition threads."""
+        self.stop_event.clear()
+        self.threads = [
+            threading.Thread(target=self.capture_loop, name="FrameCapture", daemon=True),
+            threading.Thread(target=self.recognition_loop, name="FrameRecognition", daemon=True),
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self, timeout=2.0):
+        """Stop the threads and wait for them to finish.
+
+        Args:
+            timeout: Seconds to wait for each thread (None waits until it exits)
+
+        Returns:
+            bool: True if every thread exited; otherwise a thread is still
+            inside a capture or recognition call and the capture and the
+            processor must not be closed yet (call stop() again to wait)
+        """
+        self.stop_event.set()
+        for thread in self.threads:
+            thread.join(timeout)
+        self.threads = [thread for thread in self.threads if thread.is_alive()]
+        return not self.threads
+
+    def capture_loop(self):
+        """Read camera frames into the frame queue."""
+        while not self.stop_event.is_set():
+            start = time.perf_counter()
+            ret, frame = self.capture.read()
+            if not ret and getattr(self.capture, 'finished', False):
+                # End of a recorded source
+                self.finished = True
+                break
+            if not ret:
+                self.capture_error = True
+                time.sleep(0.1)
+                continue
+
+            self.capture_error = False
+            self.stats["capture"].record(time.perf_counter() - start)
+            self.frame_queue.put((time.perf_counter(), frame))
+
+    def recognition_loop(self):
+        """Detect, recognize and annotate queued frames."""
+        try:
+            self.recognize_queued_frames()
+        finally:
+            # The thread's own database connections end with it
+            self.processor.release_thread()
+
+    def recognize_queued_frames(self):
+        """Process queued frames until the pipeline is stopped."""
+        while not self.stop_event.is_set():
+            item = self.frame_queue.get(timeout=0.1)
+            if item is None:
+                continue
+
+            # With worker processes, hand them every queued frame at once
+            items = [item]
+            while self.processor.pool is not None and len(items) < self.processor.pool.workers:
+                item = self.frame_queue.get(timeout=0)
+                if item is None:
+                    break
+                items.append(item)
+
+            start = time.perf_counter()
+            try:
+                results = self.processor.process_frames([frame for _, frame in items])
+            except Exception as e:
+                print(f"❌ Error processing frame: {e}")
+                continue
+            elapsed = time.perf_counter() - start
+            for (captured_at, _), (frame, face_count) in zip(items, results):
+                self.stats["recognition"].record(elapsed / len(items))
+                self.result_queue.put((captured_at, frame, face_count))
+
+    def get_result(self):
+        """Return the newest processed (frame, face_count) pair, or None.
+
+        Called from the display thread; older undisplayed results are dropped.
+        """
+        item = self.result_queue.get_latest()
+        if item is None:
+            return None
+
+        captured_at, frame, face_count = item
+        self.stats["end_to_end"].record(time.perf_counter() - captured_at)
+        return frame, face_count
+
+    def get_stats(self):
+        """Report per-stage latency and queue state.
+
+        Returns:
+            dict: Latency statistics of each stage plus the depth and the
+            number of dropped frames of each queue
+        """
+        stats = {name: stage.as_dict() for name, stage in self.stats.items()}
+        stats["frame_queue"] = {"depth": len(self.frame_queue), "dropped": self.frame_queue.dropped}
+        stats["result_queue"] = {"depth": len(self.result_queue), "dropped": self.result_queue.dropped}
+        stats["scheduler"] = self.processor.scheduler.get_stats()
+        return stats
+
+    def format_stats(self):
+        """Return a one-line summary of get_stats() for a status bar."""
+        stats = self.get_stats()
+        return (f"Detect 1/{stats['scheduler']['interval']} ({stats['scheduler']['policy']}) | "
+                f"{stats['scheduler']['effective_fps']:.1f} fps | "
+                f"Capture {stats['capture']['average_ms']:.1f} ms | "
+                f"Recognition {stats['recognition']['average_ms']:.1f} ms | "
+                f"Latency {stats['end_to_end']['average_ms']:.0f} ms | "
+                f"Queues {stats['frame_queue']['depth']}/{stats['result_queue']['depth']} | "
+                f"Dropped {stats['frame_queue']['dropped']}/{stats['result_queue']['dropped']}")
+
+
+def run_source(source, processor, max_frames=None, on_result=None, stop_event=None):
+    """Process every frame of a source in order on the calling thread.
+
+    Used for headless replays and benchmarks: unlike FramePipeline no frame
+    is dropped, so a replay as fast as possible measures the processing
+    throughput.
+
+    Args:
+        source: FrameSource to read from until it finishes
+        processor: AttendanceProcessor used to annotate frames
+        max_frames: Stop after this many frames (None reads the whole source)
+        on_result: Optional callback receiving each (frame, face_count)
+        stop_event: Optional threading.Event that ends the run when set
+
+    Returns:
+        dict: Frames processed, seconds, frames per second and the number
+        of frames with faces
+    """
+    batch_size = processor.pool.workers if processor.pool is not None else 1
+    frames_done = 0
+    frames_with_faces = 0
+    start = time.perf_counter()
+
+    while max_frames is None or frames_done < max_frames:
+        if stop_event is not None and stop_event.is_set():
+            break
+        batch = []
+        while len(batch) < batch_size and (max_frames is None or frames_done + len(batch) < max_frames):
+            ret, frame = source.read()
+            if not ret:
+                break
+            batch.append(frame)
+        if not batch:
+            if getattr(source, 'finished', True):
+                break
+            # A live source without a frame yet
+            time.sleep(0.01)
+            continue
+
+        for frame, face_count in processor.process_frames(batch):
+            frames_done += 1
+            if face_count > 0:
+                frames_with_faces += 1
+            if on_result is not None:
+                on_result(frame, face_count)
+
+    elapsed = time.perf_counter() - start
+    return {
+        "frames": frames_done,
+        "seconds": elapsed,
+        "fps": frames_done / elapsed if elapsed > 0 else 0.0,
+        "frames_with_faces": frames_with_faces,
+    }
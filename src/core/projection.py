@@ -0,0 +1,153 @@
+"""
+Dimensionality reduction module for the Face Recognition Attendance System.
+Learns a PCA projection that shrinks the 2,564-dim descriptor before matching.
+"""
+
+import os
+import sys
+import pickle
+import numpy as np
+
+# Add project root to path to allow imports from src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.utils.vector_utils import l2_normalize
+
+# Maximum number of samples used to estimate the covariance matrix
+MAX_FIT_SAMPLES = 20000
+
+
+class PCAProjection:
+    """Linear PCA (optionally whitened) projection of face descriptors.
+
+    Projected vectors are L2-normalized again, so they can be stored in a
+    GalleryIndex and compared with dot products like the raw descriptors.
+    Cosine distances are measured around the gallery mean after projection,
+    so the stranger threshold has to be calibrated for the projected space.
+    """
+
+    def __init__(self, n_components=128, whiten=False):
+        """Create an unfitted projection.
+
+        Args:
+            n_components: Output dimensionality
+            whiten: Scale each component to unit variance
+        """
+        self.n_components = n_components
+        self.requested_components = n_components
+        self.whiten = whiten
+        self.mean = None
+        self.components = None
+        self.explained_variance = None
+        self.explained_variance_ratio = None
+
+    @property
+    def is_fitted(self):
+        """Whether the projection has been fitted."""
+        return self.components is not None
+
+    def fit(self, features, seed=0):
+        """Learn the projection from a set of descriptors.
+
+        Args:
+            features: (N, D) array of descriptors
+            seed: Random seed used when subsampling large galleries
+
+        Returns:
+            PCAProjection: self
+        """
+        features = np.asarray(features, dtype=np.float64)
+        if len(features) > MAX_FIT_SAMPLES:
+            rng = np.random.default_rng(seed)
+            features = features[rng.choice(len(features), MAX_FIT_SAMPLES, replace=False)]
+
+        self.mean = features.mean(axis=0)
+        centered = features - self.mean
+
+        # Eigen-decomposition of the (D, D) covariance, largest components first
+        covariance = centered.T @ centered / max(1, len(features) - 1)
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        order = np.argsort(eigenvalues)[::-1][:self.n_components]
+
+        # Drop directions without variance (fewer samples than components)
+        order = order[eigenvalues[order] > eigenvalues[order[0]] * 1e-10]
+
+        self.components = eigenvectors[:, order].T.astype(np.float32)
+        self.explained_variance = np.maximum(eigenvalues[order], 0.0)
+        self.explained_variance_ratio = self.explained_variance / max(eigenvalues.clip(min=0).sum(), 1e-12)
+        self.mean = self.mean.astype(np.float32)
+        self.n_components = len(self.components)
+
+        if self.whiten:
+            # Fold the whitening scale into the components
+            scale = 1.0 / np.sqrt(self.explained_variance)
+            self.components *= scale[:, np.newaxis].astype(np.float32)
+
+        return self
+
+    def transform(self, features):
+        """Project descriptors and L2-normalize the result.
+
+        Args:
+            features: (N, D) array or a single (D,) descriptor
+
+        Returns:
+            numpy.ndarray: float32 array of shape (N, n_components), or
+            (n_components,) for a single descriptor
+        """
+        features = np.asarray(features, dtype=np.float32)
+        single = features.ndim == 1
+        projected = l2_normalize((np.atleast_2d(features) - self.mean) @ self.components.T)
+        return projected[0] if single else projected
+
+    def unexplained_ratio(self, features=None):
+        """Return the share of the variance the projection discards.
+
+        Args:
+            features: (N, D) array of descriptors, or None for the ratio of
+                the descriptors the projection was fitted on
+
+        Returns:
+            float: Variance outside the retained components divided by the
+            total variance, between 0 and 1
+        """
+        if features is None:
+            return float(1.0 - self.explained_variance_ratio.sum())
+
+        centered = np.atleast_2d(np.asarray(features, dtype=np.float32)) - self.mean
+        # Undo the whitening scale to measure against the orthonormal components
+        basis = self.components / np.linalg.norm(self.components, axis=1, keepdims=True)
+        total = float((centered ** 2).sum())
+        retained = float(((centered @ basis.T) ** 2).sum())
+        return max(0.0, 1.0 - retained / total) if total > 0 else 0.0
+
+    def memory_footprint(self):
+        """Return the memory used by the projection in bytes."""
+        return self.mean.nbytes + self.components.nbytes if self.is_fitted else 0
+
+    def save(self, path):
+        """Save the fitted projection to a file."""
+        with open(path, 'wb') as f:
+            pickle.dump({
+                'n_components': self.n_components,
+                'requested_components': self.requested_components,
+                'whiten': self.whiten,
+                'mean': self.mean,
+                'components': self.components,
+                'explained_variance': self.explained_variance,
+                'explained_variance_ratio': self.explained_variance_ratio,
+            }, f)
+
+    @classmethod
+    def load(cls, path):
+        """Load a projection saved with save()."""
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+
+        projection = cls(state['n_components'], state['whiten'])
+        # Fitting keeps fewer components than requested when the gallery has fewer samples
+        projection.requested_components = state.get('requested_components', state['n_components'])
+        projection.mean = state['mean']
+        projection.components = state['components']
+        projection.explained_variance = state['explained_variance']
+        projection.explained_variance_ratio = state['explained_variance_ratio']
+        return projection
@@ -0,0 +1,197 @@
+"""
+Prototype prefilter module for the Face Recognition Attendance System.
+Matches queries against a few prototypes per user before scoring full samples.
+"""
+
+import copy
+import os
+import sys
+import numpy as np
+
+# Add project root to path to allow imports from src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.utils.vector_utils import l2_normalize, spherical_kmeans
+
+
+def compute_prototypes(features, n_prototypes=1, seed=0):
+    """Summarize one user's samples by a few unit-length prototypes.
+
+    Args:
+        features: (S, D) array of the user's L2-normalized samples
+        n_prototypes: 1 for the normalized centroid, more for k-means
+            centroids (roughly one per capture pose)
+        seed: Random seed for the k-means initialization
+
+    Returns:
+        numpy.ndarray: float32 array of shape (P, D) with P <= n_prototypes
+    """
+    features = np.asarray(features, dtype=np.float32)
+    if n_prototypes <= 1 or len(features) <= n_prototypes:
+        if n_prototypes <= 1:
+            return l2_normalize(features.mean(axis=0, keepdims=True))
+        return l2_normalize(features)
+    return spherical_kmeans(features, n_prototypes, seed=seed)
+
+
+def compute_prototype_dict(feature_dict, n_prototypes=1):
+    """Compute prototypes for every user of a {user_id: [feature, ...]} dictionary."""
+    return {
+        user_id: compute_prototypes(features, n_prototypes)
+        for user_id, features in feature_dict.items() if len(features) > 0
+    }
+
+
+class PrototypeMatcher:
+    """Two-stage matcher in front of a GalleryIndex.
+
+    Stage one scores the query against the prototypes of every user and keeps
+    the ``top_m`` closest users. Stage two rescores all samples of only those
+    users, so the returned distances and indices are exact for the samples
+    that were considered.
+    """
+
+    def __init__(self, gallery_index, prototype_dict=None, top_m=5, n_prototypes=1):
+        """Create the matcher.
+
+        Args:
+            gallery_index: GalleryIndex with samples grouped by identity
+            prototype_dict: {user_id: (P, D) array}; users without stored
+                prototypes get a centroid computed from the gallery
+            top_m: Number of candidate users rescored in stage two
+            n_prototypes: Prototypes per user computed for missing users
+        """
+        self.gallery_index = gallery_index
+        self.top_m = top_m
+        prototype_dict = prototype_dict or {}
+
+        blocks = []
+        for label, user_id in enumerate(gallery_index.label_names):
+            prototypes = prototype_dict.get(user_id)
+            if prototypes is None or len(prototypes) == 0:
+                start = gallery_index.offsets[label]
+                samples = gallery_index.vectors(start, start + gallery_index.counts[label])
+                prototypes = compute_prototypes(samples, n_prototypes)
+            blocks.append(np.asarray(prototypes, dtype=np.float32))
+
+        self.set_blocks(blocks)
+        self.reset_stats()
+
+    def set_blocks(self, blocks):
+        """Pack the per-user prototype arrays, one block per gallery label."""
+        self.prototypes = np.ascontiguousarray(np.concatenate(blocks, axis=0))
+        self.owners = np.repeat(np.arange(len(blocks), dtype=np.int32), [len(block) for block in blocks])
+        self.prototype_offsets = np.concatenate(
+            ([0], np.cumsum([len(block) for block in blocks])[:-1])
+        ).astype(np.int64)
+
+    def user_prototypes(self, label):
+        """Return the prototypes of one gallery label."""
+        start = self.prototype_offsets[label]
+        end = self.prototype_offsets[label + 1] if label + 1 < len(self.prototype_offsets) else len(self.prototypes)
+        return self.prototypes[start:end]
+
+    def with_prototypes(self, prototype_dict):
+        """Return a matcher over the same gallery with changed prototypes replaced.
+
+        Only users of the gallery whose prototypes differ from the current
+        ones are replaced; the gallery index is shared, not rebuilt.
+
+        Args:
+            prototype_dict: {user_id: (P, D) array} in the gallery's space
+
+        Returns:
+            tuple: (matcher, number of users whose prototypes changed)
+        """
+        blocks = []
+        changed = 0
+        for label, user_id in enumerate(self.gallery_index.label_names):
+            current = self.user_prototypes(label)
+            prototypes = prototype_dict.get(user_id)
+            if prototypes is not None and len(prototypes) > 0:
+                prototypes = np.asarray(prototypes, dtype=np.float32)
+                if prototypes.shape != current.shape or not np.array_equal(prototypes, current):
+                    blocks.append(prototypes)
+                    changed += 1
+                    continue
+            blocks.append(current)
+
+        matcher = copy.copy(self)
+        if changed:
+            matcher.set_blocks(blocks)
+        matcher.reset_stats()
+        return matcher, changed
+
+    def reset_stats(self):
+        """Reset the distance computation counters."""
+        self.query_count = 0
+        self.distance_computations = 0
+
+    def memory_footprint(self):
+        """Return the memory used by the prototype arrays in bytes."""
+        return self.prototypes.nbytes + self.owners.nbytes + self.prototype_offsets.nbytes
+
+    def candidate_identities(self, queries):
+        """Return the top_m closest identities of each query by prototype score."""
+        scores = queries @ self.prototypes.T
+        best = np.maximum.reduceat(scores, self.prototype_offsets, axis=1)
+        top_m = min(self.top_m, best.shape[1])
+        if top_m < best.shape[1]:
+            return np.argpartition(-best, top_m - 1, axis=1)[:, :top_m]
+        return np.broadcast_to(np.arange(best.shape[1]), best.shape)
+
+    def search(self, queries, k=1):
+        """Find the k nearest samples of each query among the candidate users.
+
+        Args:
+            queries: (Q, D) array of L2-normalized query features
+            k: Number of neighbours to return
+
+        Returns:
+            tuple: (distances, indices) arrays of shape (Q, k) sorted by
+            increasing cosine distance, indices referring to the gallery
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        index = self.gallery_index
+        candidates = self.candidate_identities(queries)
+
+        k = min(k, index.size)
+        distances = np.empty((len(queries), k))
+        indices = np.empty((len(queries), k), dtype=np.int64)
+
+        for q, (query, labels) in enumerate(zip(queries, candidates)):
+            # Each identity is a contiguous slice of the gallery matrix
+            ranges = [(index.offsets[label], index.offsets[label] + index.counts[label]) for label in labels]
+            rows = np.concatenate([np.arange(start, end) for start, end in ranges])
+            scores = np.concatenate([index.score_rows(query, start, end)[0] for start, end in ranges])
+            self.distance_computations += len(self.prototypes) + len(rows)
+
+            top_k = min(k, len(rows))
+            top = np.argpartition(-scores, top_k - 1)[:top_k] if top_k < len(rows) else np.arange(len(rows))
+            top = top[np.argsort(-scores[top])]
+
+            # Pad with the worst match if the candidates hold fewer than k samples
+            top = np.concatenate([top, np.repeat(top[-1:], k - len(top))])
+            indices[q] = rows[top]
+            distances[q] = 1.0 - scores[top]
+
+        self.query_count += len(queries)
+        return np.clip(distances, 0.0, 2.0), indices
+
+    def label_of(self, indices):
+        """Map gallery sample indices to user IDs."""
+        return self.gallery_index.label_of(indices)
+
+    def get_stats(self):
+        """Report how many distance computations the prefilter saved.
+
+        Returns:
+            dict: Queries served, distance computations performed, the
+            computations an exhaustive search would need and their ratio
+        """
+        exhaustive = self.query_count * self.gallery_index.size
+        return {
+            "queries": self.query_count,
+            "distance_computations": self.distance_computations,
+            "exhaustive_computations": exhaustive,
+            "reduction": exhaustive / self.distance_computations if self.distance_computations else 0.0,
+        }
@@ -0,0 +1,89 @@
+"""
+Quantization module for the Face Recognition Attendance System.
+Converts face feature matrices to compact float16 / int8 storage and back.
+"""
+
+import numpy as np
+
+# Supported storage modes and the NumPy dtype used for each
+STORAGE_DTYPES = {
+    'float64': np.float64,
+    'float32': np.float32,
+    'float16': np.float16,
+    'int8': np.int8,
+}
+
+# Largest int8 magnitude used by the symmetric per-vector quantization
+INT8_LEVELS = 127.0
+
+
+def quantize(matrix, storage='float32'):
+    """Convert a feature matrix to the given storage mode.
+
+    int8 storage uses one float32 scale per row so that
+    ``row ~= data.astype(float32) * scale``.
+
+    Args:
+        matrix: (N, D) array of features
+        storage: One of 'float64', 'float32', 'float16' or 'int8'
+
+    Returns:
+        tuple: (data, scales) where scales is a float32 (N,) array for
+        int8 storage and None otherwise
+    """
+    if storage not in STORAGE_DTYPES:
+        raise ValueError(f"Unknown storage mode '{storage}', expected one of {list(STORAGE_DTYPES)}")
+
+    if storage != 'int8':
+        return np.ascontiguousarray(matrix, dtype=STORAGE_DTYPES[storage]), None
+
+    matrix = np.asarray(matrix, dtype=np.float32)
+    scales = np.abs(matrix).max(axis=1) / INT8_LEVELS if len(matrix) else np.empty(0, dtype=np.float32)
+    scales[scales == 0] = 1.0
+    data = np.rint(matrix / scales[:, np.newaxis]).clip(-INT8_LEVELS, INT8_LEVELS).astype(np.int8)
+    return np.ascontiguousarray(data), scales.astype(np.float32)
+
+
+def dequantize(data, scales=None):
+    """Convert stored features back to a float32 matrix."""
+    matrix = np.asarray(data, dtype=np.float32)
+    if scales is not None:
+        matrix = matrix * np.asarray(scales, dtype=np.float32)[:, np.newaxis]
+    return matrix
+
+
+def storage_of(data, scales=None):
+    """Return the storage mode name of an already quantized matrix."""
+    if data.dtype == np.int8 and scales is not None:
+        return 'int8'
+    for storage, dtype in STORAGE_DTYPES.items():
+        if data.dtype == dtype:
+            return storage
+    return None
+
+
+def quantized_dot(queries, data, scales=None, chunk_size=16384):
+    """Dot products between float32 queries and stored (quantized) rows.
+
+    Rows are converted to float32 one chunk at a time, so the temporary
+    memory stays bounded whatever the gallery size. For int8 rows the
+    per-row scale is applied to the products instead of the data.
+
+    Args:
+        queries: (Q, D) float32 array
+        data: (N, D) stored matrix
+        scales: (N,) per-row scales for int8 storage
+
+    Returns:
+        numpy.ndarray: float32 array of shape (Q, N)
+    """
+    if data.dtype == np.float32:
+        return queries @ data.T
+
+    scores = np.empty((len(queries), len(data)), dtype=np.float32)
+    for start in range(0, len(data), chunk_size):
+        chunk = data[start:start + chunk_size].astype(np.float32)
+        np.matmul(queries, chunk.T, out=scores[:, start:start + len(chunk)])
+    if scales is not None:
+        scores *= scales
+    return scores
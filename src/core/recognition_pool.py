@@ -0,0 +1,217 @@
+"""
+Recognition worker pool for the Face Recognition Attendance System.
+Runs face detection and recognition in separate processes so one attendance
+station can use every CPU core.
+
+Frames are copied into slots of one shared-memory block instead of being
+pickled; only the slot number goes through the task queue and only the face
+boxes and matches come back. Each worker builds its own FaceRecognizer, whose
+gallery is memory-mapped from the feature store, so the operating system
+shares its pages between the workers.
+
+A frame takes two tasks: the workers first detect its faces (in the motion
+regions, if any), then the parent links the boxes to its tracks and sends
+back only the boxes of the tracks that need a recognition. The frame stays
+in its slot between the two tasks.
+"""
+
+import multiprocessing
+import os
+import sys
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Add project root to path to allow imports from src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Seconds to wait for a worker result before assuming the worker died
+WORKER_TIMEOUT = 30.0
+
+
+def worker_main(shm_name, slot_bytes, tasks, results):
+    """Worker process loop: detect and recognize faces in frames from shared memory."""
+    from src.core.face_recognition import FaceRecognizer
+
+    # Spawned workers share the parent's resource tracker, which unlinks the block once
+    shm = shared_memory.SharedMemory(name=shm_name)
+    recognizer = FaceRecognizer()
+    results.put(('ready', os.getpid()))
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+
+        kind, slot, frame_id, shape, payload = task
+        start = time.perf_counter()
+        try:
+            frame = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=slot * slot_bytes)
+            if kind == 'detect':
+                # payload: regions to search, None for the whole frame
+                recognizer.check_for_updates()
+                regions = recognizer.detect_faces(frame, payload)
+                boxes = [tuple(int(v) for v in region[:4]) for region in regions]
+                del frame, regions
+                results.put(('detect', frame_id, slot, boxes, time.perf_counter() - start))
+            else:
+                # payload: boxes of the faces to recognize
+                ids, distances, known = recognizer.recognize_faces(
+                    [frame[y:y+h, x:x+w] for (x, y, w, h) in payload])
+                del frame
+                results.put(('recognize', frame_id, slot, list(ids), distances.tolist(), known.tolist(),
+                             time.perf_counter() - start))
+        except Exception as e:
+            print(f"❌ Error in recognition worker {os.getpid()}: {e}")
+            if kind == 'detect':
+                results.put(('detect', frame_id, slot, [], time.perf_counter() - start))
+            else:
+                results.put(('recognize', frame_id, slot, [], [], [], time.perf_counter() - start))
+
+    shm.close()
+
+
+class RecognitionPool:
+    """Pool of worker processes that detect and recognize faces in frames."""
+
+    def __init__(self, workers=2, slots_per_worker=2):
+        """Create the pool; processes start with the first frames.
+
+        Args:
+            workers: Number of worker processes
+            slots_per_worker: Frame buffers per worker, so a worker can pick
+                up its next frame while the previous result is being handled
+        """
+        self.workers = workers
+        self.slot_count = workers * slots_per_worker
+        self.slot_bytes = 0
+        self.shm = None
+        self.processes = []
+        self.context = multiprocessing.get_context('spawn')
+        self.tasks = None
+        self.results = None
+        self.free_slots = []
+        self.worker_time = 0.0
+        self.frames_processed = 0
+
+    def start(self, slot_bytes):
+        """Allocate the shared frame buffers and start the worker processes.
+
+        Args:
+            slot_bytes: Size of one frame buffer in bytes
+        """
+        self.close()
+        self.slot_bytes = slot_bytes
+        self.shm = shared_memory.SharedMemory(create=True, size=self.slot_count * slot_bytes)
+        self.tasks = self.context.Queue()
+        self.results = self.context.Queue()
+        self.free_slots = list(range(self.slot_count))
+
+        self.processes = [
+            self.context.Process(target=worker_main, args=(self.shm.name, slot_bytes, self.tasks, self.results),
+                                 name=f"RecognitionWorker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for process in self.processes:
+            process.start()
+
+        # Wait until every worker has loaded its model
+        for _ in self.processes:
+            self.results.get(timeout=WORKER_TIMEOUT * 4)
+        print(f"✅ Started {self.workers} recognition workers")
+
+    def recognize_frames(self, frames, rois=None, select=None):
+        """Detect and recognize the faces of several frames in parallel.
+
+        Args:
+            frames: List of BGR uint8 frames
+            rois: Regions to limit the detection to, one list (or None for
+                the whole frame) per frame
+            select: Optional callback receiving (frame index, boxes) in frame
+                order once a frame's faces are detected and returning the
+                indices of the boxes to recognize (all boxes if None)
+
+        Returns:
+            list: One (boxes, indices, ids, distances, is_known) tuple per
+            frame, in the order of the frames, with the matches of the boxes
+            at the selected indices
+        """
+        if not frames:
+            return []
+        largest = max(frame.nbytes for frame in frames)
+        if self.shm is None or largest > self.slot_bytes:
+            self.start(largest)
+        if rois is None:
+            rois = [None] * len(frames)
+
+        outputs = [None] * len(frames)
+        detected = {}  # Frames whose faces are detected, waiting for the frames before them
+        next_selection = 0
+        in_flight = 0
+
+        def release(slot):
+            self.free_slots.append(slot)
+            self.frames_processed += 1
+
+        def collect():
+            nonlocal next_selection, in_flight
+            message = self.results.get(timeout=WORKER_TIMEOUT)
+            kind, frame_id, slot = message[:3]
+            self.worker_time += message[-1]
+            in_flight -= 1
+
+            if kind == 'recognize':
+                boxes, indices = outputs[frame_id]
+                ids, distances, known = message[3:6]
+                outputs[frame_id] = (boxes, indices, np.array(ids, dtype=object),
+                                     np.array(distances, dtype=np.float64), np.array(known, dtype=bool))
+                release(slot)
+                return
+
+            # Selections follow the frame order, the parent's tracks continue from frame to frame
+            detected[frame_id] = (slot, message[3])
+            while next_selection in detected:
+                slot, boxes = detected.pop(next_selection)
+                indices = list(select(next_selection, boxes)) if select is not None else list(range(len(boxes)))
+                if indices:
+                    outputs[next_selection] = (boxes, indices)
+                    self.tasks.put(('recognize', slot, next_selection, frames[next_selection].shape,
+                                    [boxes[i] for i in indices]))
+                    in_flight += 1
+                else:
+                    outputs[next_selection] = (boxes, [], np.array([], dtype=object),
+                                               np.array([], dtype=np.float64), np.array([], dtype=bool))
+                    release(slot)
+                next_selection += 1
+
+        for frame_id, frame in enumerate(frames):
+            # A held slot always waits on a task in flight, so one frees up
+            while not self.free_slots:
+                collect()
+
+            slot = self.free_slots.pop()
+            target = np.ndarray(frame.shape, dtype=np.uint8, buffer=self.shm.buf, offset=slot * self.slot_bytes)
+            target[...] = frame
+            del target
+            self.tasks.put(('detect', slot, frame_id, frame.shape, rois[frame_id]))
+            in_flight += 1
+
+        while in_flight:
+            collect()
+        return outputs
+
+    def close(self):
+        """Stop the workers and release the shared frame buffers."""
+        for _ in self.processes:
+            self.tasks.put(None)
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
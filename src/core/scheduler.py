@@ -0,0 +1,145 @@
+"""
+Detection scheduling module for the Face Recognition Attendance System.
+Decides on which camera frames face detection and recognition run; the other
+frames reuse the last results so the display keeps up with the camera.
+"""
+
+import math
+import time
+
+import cv2
+import numpy as np
+
+# Supported scheduling policies
+POLICIES = ("every_frame", "fixed", "adaptive")
+
+# Size of the thumbnail compared between frames to estimate motion
+MOTION_THUMBNAIL = (32, 24)
+
+
+class DetectionScheduler:
+    """Chooses the detection interval N (detect on one frame out of N).
+
+    Policies:
+        every_frame: detect on every frame
+        fixed: detect every ``interval`` frames
+        adaptive: detect every ``min_interval`` frames while faces or motion
+            are present, back off towards ``max_interval`` while the scene is
+            empty, and never detect more often than the measured processing
+            time allows at ``camera_fps``
+    """
+
+    def __init__(self, policy="adaptive", interval=3, min_interval=1, max_interval=10,
+                 camera_fps=30.0, motion_threshold=4.0):
+        """Create the scheduler.
+
+        Args:
+            policy: One of POLICIES
+            interval: Detection interval of the fixed policy
+            min_interval: Adaptive interval while faces or motion are present
+            max_interval: Adaptive interval reached in an empty, static scene
+            camera_fps: Frame rate the display should keep up with
+            motion_threshold: Mean absolute thumbnail difference (0-255)
+                counted as motion
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown detection policy '{policy}', expected one of {list(POLICIES)}")
+
+        self.policy = policy
+        self.fixed_interval = max(1, interval)
+        self.min_interval = max(1, min_interval)
+        self.max_interval = max(self.min_interval, max_interval)
+        self.camera_fps = camera_fps
+        self.motion_threshold = motion_threshold
+
+        self.interval = self.fixed_interval if policy == "fixed" else self.min_interval
+        self.frames_since_detection = self.interval
+        self.previous_thumbnail = None
+        self.processing_time = 0.0
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Reset the frame counters used for the reported rates."""
+        self.stats_start = time.perf_counter()
+        self.frame_count = 0
+        self.detection_count = 0
+
+    def measure_motion(self, frame):
+        """Return the mean absolute difference to the previous frame's thumbnail."""
+        thumbnail = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), MOTION_THUMBNAIL,
+                               interpolation=cv2.INTER_AREA).astype(np.int16)
+        previous, self.previous_thumbnail = self.previous_thumbnail, thumbnail
+        if previous is None:
+            return float('inf')
+        return float(np.mean(np.abs(thumbnail - previous)))
+
+    def should_detect(self, frame, has_motion=None):
+        """Decide whether detection runs on this frame.
+
+        Args:
+            frame: The camera frame
+            has_motion: Motion decision of a motion gate, measured here from
+                frame thumbnails if None
+
+        Returns:
+            bool: True if the frame should be detected and recognized
+        """
+        self.frame_count += 1
+        self.frames_since_detection += 1
+
+        if self.policy == "adaptive":
+            if has_motion is None:
+                has_motion = self.measure_motion(frame) > self.motion_threshold
+            if has_motion:
+                # Something changed, come back to the fastest cadence
+                self.interval = min(self.interval, self.floor_interval())
+
+        if self.policy == "every_frame" or self.frames_since_detection >= self.interval:
+            self.frames_since_detection = 0
+            self.detection_count += 1
+            return True
+        return False
+
+    def skip_frame(self):
+        """Count a frame that was skipped before scheduling (e.g. by a motion gate)."""
+        self.frame_count += 1
+        self.frames_since_detection += 1
+
+    def floor_interval(self):
+        """Smallest interval the measured processing time allows at camera rate."""
+        frame_budget = 1.0 / self.camera_fps
+        return max(self.min_interval, math.ceil(self.processing_time / frame_budget))
+
+    def record_detection(self, face_count, elapsed):
+        """Update the interval after a detection.
+
+        Args:
+            face_count: Number of faces found in the frame
+            elapsed: Seconds spent detecting and recognizing the frame
+        """
+        self.processing_time = elapsed if self.processing_time == 0 else (
+            0.2 * elapsed + 0.8 * self.processing_time)
+
+        if self.policy != "adaptive":
+            return
+        if face_count > 0:
+            self.interval = self.floor_interval()
+        else:
+            # Empty scene: back off gradually
+            self.interval = min(self.max_interval, max(self.interval + 1, self.floor_interval()))
+
+    def get_stats(self):
+        """Report the policy, current interval and achieved rates.
+
+        Returns:
+            dict: Policy, interval, frames/sec seen, detections/sec and the
+            average processing time of a detection in ms
+        """
+        elapsed = max(time.perf_counter() - self.stats_start, 1e-9)
+        return {
+            "policy": self.policy,
+            "interval": 1 if self.policy == "every_frame" else self.interval,
+            "effective_fps": self.frame_count / elapsed,
+            "detection_fps": self.detection_count / elapsed,
+            "processing_ms": self.processing_time * 1000,
+        }
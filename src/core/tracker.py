@@ -0,0 +1,168 @@
+"""
+Face tracking module for the Face Recognition Attendance System.
+Links face detections across frames into tracks so each person is recognized
+once (plus occasional confirmations) and labels are voted over several frames.
+"""
+
+from collections import deque
+
+import numpy as np
+
+
+def box_iou(a, b):
+    """Intersection over union of two (x, y, w, h) boxes."""
+    ix = max(0, min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0]))
+    iy = max(0, min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1]))
+    intersection = ix * iy
+    union = a[2] * a[3] + b[2] * b[3] - intersection
+    return intersection / union if union > 0 else 0.0
+
+
+def centroid_distance(a, b):
+    """Distance between box centres relative to the size of box a."""
+    dx = (a[0] + a[2] / 2) - (b[0] + b[2] / 2)
+    dy = (a[1] + a[3] / 2) - (b[1] + b[3] / 2)
+    return float(np.hypot(dx, dy)) / max(a[2], a[3], 1)
+
+
+class Track:
+    """One face followed across detections, with its recognition votes."""
+
+    def __init__(self, track_id, box, vote_window=15):
+        """Start a track.
+
+        Args:
+            track_id: Persistent integer ID
+            box: (x, y, w, h) box of the first detection
+            vote_window: Number of most recent votes kept
+        """
+        self.track_id = track_id
+        self.box = tuple(box)
+        self.missed = 0
+        self.updates = 0
+        self.last_recognized = None
+        self.votes = deque(maxlen=vote_window)
+
+    def add_vote(self, user_id, distance, is_known):
+        """Add one recognition result (strangers vote for None)."""
+        self.votes.append((user_id if is_known else None, float(distance)))
+        self.last_recognized = self.updates
+
+    def identity(self):
+        """Return the voted (user_id, distance, is_known, vote_count) of the track.
+
+        Each vote is weighted by its similarity (1 - distance); the distance
+        reported is the mean over the winning votes.
+        """
+        if not self.votes:
+            return None, 1.0, False, 0
+
+        scores = {}
+        for user_id, distance in self.votes:
+            scores[user_id] = scores.get(user_id, 0.0) + (1.0 - distance)
+        winner = max(scores, key=scores.get)
+        distances = [distance for user_id, distance in self.votes if user_id == winner]
+        return winner, float(np.mean(distances)), winner is not None, len(distances)
+
+
+class FaceTracker:
+    """Greedy IoU tracker with a centroid fallback for fast movement."""
+
+    def __init__(self, iou_threshold=0.3, max_missed=5, recheck_interval=15, min_votes=3,
+                 vote_window=15, max_centroid_distance=0.5):
+        """Create the tracker.
+
+        Args:
+            iou_threshold: Minimum IoU to continue a track
+            max_missed: Detections a track may go unmatched before it ends
+            recheck_interval: Detections between confirmation recognitions
+            min_votes: Votes a track needs before its identity is confirmed
+            vote_window: Number of most recent votes kept per track
+            max_centroid_distance: Centre distance, relative to the track's
+                box size, accepted when boxes do not overlap enough
+        """
+        self.iou_threshold = iou_threshold
+        self.max_missed = max_missed
+        self.recheck_interval = recheck_interval
+        self.min_votes = min_votes
+        self.vote_window = vote_window
+        self.max_centroid_distance = max_centroid_distance
+        self.tracks = []
+        self.next_id = 1
+
+    def update(self, boxes):
+        """Associate new detections with the existing tracks.
+
+        Args:
+            boxes: (x, y, w, h) boxes detected in the current frame
+
+        Returns:
+            list: The Track of each box, in the order of the boxes
+        """
+        # Score every (track, box) pair, best overlaps are matched first
+        pairs = []
+        for t, track in enumerate(self.tracks):
+            for b, box in enumerate(boxes):
+                iou = box_iou(track.box, box)
+                if iou >= self.iou_threshold:
+                    pairs.append((1.0 + iou, t, b))
+                else:
+                    distance = centroid_distance(track.box, box)
+                    if distance <= self.max_centroid_distance:
+                        pairs.append((1.0 - distance, t, b))
+        pairs.sort(reverse=True)
+
+        assigned = [None] * len(boxes)
+        used_tracks = set()
+        for _, t, b in pairs:
+            if t in used_tracks or assigned[b] is not None:
+                continue
+            used_tracks.add(t)
+            assigned[b] = self.tracks[t]
+
+        # Age unmatched tracks and drop the lost ones
+        for t, track in enumerate(self.tracks):
+            if t not in used_tracks:
+                track.missed += 1
+        self.tracks = [track for track in self.tracks if track.missed <= self.max_missed]
+
+        for b, box in enumerate(boxes):
+            track = assigned[b]
+            if track is None:
+                track = Track(self.next_id, box, self.vote_window)
+                self.next_id += 1
+                self.tracks.append(track)
+                assigned[b] = track
+            track.box = tuple(box)
+            track.missed = 0
+            track.updates += 1
+        return assigned
+
+    def needs_recognition(self, track):
+        """Whether a track should be recognized in the current frame.
+
+        Tracks are recognized until their identity is confirmed, after that
+        only every recheck_interval detections to confirm the identity.
+        """
+        if not self.is_confirmed(track) or track.last_recognized is None:
+            return True
+        return track.updates - track.last_recognized >= self.recheck_interval
+
+    def is_confirmed(self, track, vote_count=None):
+        """Whether the voted identity of a track has enough votes to act on.
+
+        Only the votes for the winning identity count, so one close match
+        cannot outweigh several stranger votes.
+
+        Args:
+            track: The Track
+            vote_count: Votes of the winning identity, from track.identity()
+                (computed if None)
+        """
+        if vote_count is None:
+            vote_count = track.identity()[3]
+        return vote_count >= self.min_votes
+
+    def reset(self):
+        """Forget all tracks."""
+        self.tracks = []
@@ -0,0 +1,171 @@
+"""
+Write-behind attendance writer for the Face Recognition Attendance System.
+Records attendance on a background thread so the frame loop never waits for
+a SQLite commit. Events are queued with the time of the arrival and written
+in batches, one transaction (and one fsync) per batch.
+
+Each submitted event returns a Future resolved with the dedup result once its
+batch is written: True if attendance was recorded, False if it was already
+recorded that day, None if the write failed.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+
+# Add project root to path to allow imports from config
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.database.db_manager import DatabaseManager
+from config.settings import DB_PATH, ATTENDANCE_BATCH_SIZE, ATTENDANCE_FLUSH_INTERVAL
+
+# Queue markers
+_FLUSH = object()
+_STOP = object()
+
+
+class AttendanceWriter:
+    """Background thread draining a queue of attendance events into the database."""
+
+    def __init__(self, db_path=DB_PATH, batch_size=ATTENDANCE_BATCH_SIZE, flush_interval=ATTENDANCE_FLUSH_INTERVAL):
+        """Start the writer thread.
+
+        Args:
+            db_path: SQLite database attendance is recorded in
+            batch_size: Maximum events written per transaction
+            flush_interval: Seconds to wait for more events after the first
+                event of a batch
+        """
+        self.db_path = db_path
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue()
+        self.batches_written = 0
+        self.events_written = 0
+        self.closed = False
+        self.lock = threading.Lock()  # Makes the closed check and the queueing atomic with close()
+        self.ready = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="AttendanceWriter", daemon=True)
+        self.thread.start()
+        self.ready.wait()
+
+        # Guarantee pending events are written even if close() is never called
+        atexit.register(self.close)
+
+    def submit(self, user_id, name):
+        """Queue an attendance event stamped with the current date and time.
+
+        Args:
+            user_id: ID of the user
+            name: Name of the user
+
+        Returns:
+            Future: Resolved with True (recorded), False (already recorded
+            today) or None (write failed)
+        """
+        future = Future()
+        now = datetime.now()
+        with self.lock:
+            if self.closed:
+                future.set_result(None)
+                return future
+            self.queue.put(((user_id, name, now.strftime("%Y-%m-%d"), now.strftime("%H:%M:%S")), future))
+        return future
+
+    def flush(self, timeout=None):
+        """Wait until every event submitted so far is written.
+
+        Returns:
+            bool: True if the queue was flushed within the timeout
+        """
+        done = threading.Event()
+        with self.lock:
+            if self.closed:
+                return True
+            self.queue.put((_FLUSH, done))
+        return done.wait(timeout)
+
+    def run(self):
+        """Writer thread: collect batches from the queue and write them."""
+        # The connection belongs to this thread
+        try:
+            db_manager = DatabaseManager(self.db_path)
+        except Exception as e:
+            logging.error(f"❌ Attendance writer could not open the database: {e}")
+            with self.lock:
+                self.closed = True
+            self.ready.set()
+            return
+        self.ready.set()
+
+        stopping = False
+        while not stopping:
+            item = self.queue.get()
+            batch, markers = [], []
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item[0] is _STOP:
+                    stopping = True
+                elif item[0] is _FLUSH:
+                    markers.append(item[1])
+                else:
+                    batch.append(item)
+
+                # Write now on a full batch, a flush, shutdown or the deadline
+                if len(batch) >= self.batch_size or markers or stopping:
+                    break
+                try:
+                    item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+
+            if stopping:
+                # Drain whatever arrived before the stop marker was processed
+                while True:
+                    try:
+                        item = self.queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item[0] is _FLUSH:
+                        markers.append(item[1])
+                    elif item[0] is not _STOP:
+                        batch.append(item)
+
+            for start in range(0, len(batch), self.batch_size):
+                self.write_batch(db_manager, batch[start:start + self.batch_size])
+            for marker in markers:
+                marker.set()
+
+        db_manager.close()
+
+    def write_batch(self, db_manager, batch):
+        """Write one batch and resolve the futures of its events."""
+        results = db_manager.record_attendance_many([event for event, _ in batch])
+        if results is None:
+            results = [None] * len(batch)
+        else:
+            self.batches_written += 1
+            self.events_written += len(batch)
+        for (_, future), result in zip(batch, results):
+            try:
+                future.set_result(result)
+            except Exception as e:
+                logging.error(f"❌ Error reporting attendance result: {e}")
+
+    def close(self, timeout=10.0):
+        """Write every pending event and stop the writer thread."""
+        with self.lock:
+            if self.closed:
+                return
+            # Events submitted from now on are resolved with None instead of queued
+            self.closed = True
+            self.queue.put((_STOP, None))
+        self.thread.join(timeout)
+        if self.thread.is_alive():
+            logging.error("❌ Attendance writer did not finish writing pending events")
+        atexit.unregister(self.close)
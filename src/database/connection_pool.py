@@ -0,0 +1,197 @@
+"""
+Connection pool for the Face Recognition Attendance System.
+Every DatabaseManager of a process shares one pool per database file, so
+opening a window or starting a processor no longer connects and runs the
+schema statements again.
+
+Each thread gets its own connections (sqlite3 connections and cursors must
+not be used by two threads at once). With a WAL journal, reads go through a
+separate query-only connection per thread that never blocks on the writer;
+with a rollback journal a separate reader gains nothing, so reads and writes
+share the thread's connection.
+"""
+
+import logging
+import sqlite3
+import threading
+import weakref
+
+from src.database.schema import USERS_TABLE, ATTENDANCE_TABLE, INDEXES, TRIGGERS
+
+# Order the profile PRAGMAs are applied in; busy_timeout first so changing the
+# journal mode waits for other connections instead of failing
+PROFILE_PRAGMAS = ("busy_timeout", "journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store")
+
+
+def apply_connection_profile(conn, settings):
+    """Apply a connection profile (journal mode, synchronous, cache...) to a connection.
+
+    Args:
+        conn: sqlite3 connection
+        settings: Dict of PRAGMA values, a profile of SQLITE_PROFILES
+
+    Returns:
+        str: Journal mode in effect after the profile was applied
+    """
+    for pragma in PROFILE_PRAGMAS:
+        if pragma in settings:
+            conn.execute(f"PRAGMA {pragma} = {settings[pragma]}")
+
+    journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    requested = settings.get("journal_mode")
+    in_memory = not conn.execute("PRAGMA database_list").fetchone()[2]
+    if requested and journal_mode.lower() != requested.lower() and not in_memory:
+        # e.g. WAL is not available on some network file systems
+        logging.warning(f"⚠️ Database journal mode is {journal_mode}, {requested} could not be enabled")
+    return journal_mode
+
+
+class ThreadConnections:
+    """Cursors of one thread by role; dropped with the thread, which closes its connections."""
+
+    def __init__(self):
+        self.cursors = {}
+
+
+class ConnectionPool:
+    """Thread-local SQLite connections to one database file."""
+
+    def __init__(self, db_path, settings):
+        """Open the first connection and create the schema.
+
+        Args:
+            db_path: SQLite database file
+            settings: Dict of PRAGMA values applied to every connection
+        """
+        self.db_path = db_path
+        self.settings = settings
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        # Weak references, so threads that end without release_thread() do not leak connections
+        self.threads = weakref.WeakSet()
+        self.connections_opened = 0
+
+        # An in-memory database exists once per connection, so all threads share one
+        self.shared = self.open() if db_path == ":memory:" else None
+        self.split = False
+
+        self.create_schema()
+        self.journal_mode = self.connection().execute("PRAGMA journal_mode").fetchone()[0].lower()
+        self.split = self.journal_mode == "wal"
+
+    def open(self, read_only=False):
+        """Open a new connection with the pool's profile applied."""
+        try:
+            # Enable foreign key support on every connection
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA foreign_keys = ON")
+            apply_connection_profile(conn, self.settings)
+            if read_only:
+                conn.execute("PRAGMA query_only = ON")
+        except sqlite3.Error as e:
+            logging.error(f"❌ Database connection error: {e}")
+            raise
+
+        with self.lock:
+            self.connections_opened += 1
+        logging.info(f"✅ Connected to database: {self.db_path}"
+                     f"{' (read-only)' if read_only else ''} on {threading.current_thread().name}")
+        return conn
+
+    def cursor(self, read_only=False):
+        """Return the calling thread's cursor, opening its connection on first use.
+
+        Args:
+            read_only: Return the thread's reader cursor (on the writer
+                connection unless the journal mode is WAL)
+        """
+        role = "reader" if read_only and self.split else "writer"
+        thread = getattr(self.local, "connections", None)
+        if thread is None:
+            thread = self.local.connections = ThreadConnections()
+            with self.lock:
+                self.threads.add(thread)
+
+        cursor = thread.cursors.get(role)
+        if cursor is None:
+            conn = self.shared if self.shared is not None else self.open(role == "reader")
+            cursor = thread.cursors[role] = conn.cursor()
+        return cursor
+
+    def connection(self, read_only=False):
+        """Return the calling thread's reader or writer connection."""
+        return self.cursor(read_only).connection
+
+    def create_schema(self):
+        """Create the tables, indexes and triggers if they don't exist."""
+        conn = self.connection()
+        try:
+            # Create tables from schema definitions
+            conn.execute(USERS_TABLE)
+            conn.execute(ATTENDANCE_TABLE)
+
+            # Create indexes for query optimization
+            for index in INDEXES:
+                conn.execute(index)
+
+            # Create triggers
+            for trigger in TRIGGERS:
+                conn.execute(trigger)
+
+            conn.commit()
+            logging.info("✅ Database tables, indexes, and triggers created successfully")
+        except sqlite3.Error as e:
+            logging.error(f"❌ Error creating database structure: {e}")
+            raise
+
+    def release_thread(self):
+        """Close the calling thread's connections (they reopen on next use)."""
+        thread = getattr(self.local, "connections", None)
+        if thread is None:
+            return
+        cursors, thread.cursors = thread.cursors, {}
+        for cursor in cursors.values():
+            conn = cursor.connection
+            if conn is self.shared:
+                continue
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logging.error(f"❌ Error closing database connection: {e}")
+
+    def get_stats(self):
+        """Report the open and total connections of the pool.
+
+        Returns:
+            dict: Journal mode, whether reads use separate connections, open
+            connections and connections opened since the pool was created
+        """
+        with self.lock:
+            connections = {id(cursor.connection) for thread in list(self.threads)
+                           for cursor in thread.cursors.values()}
+            return {
+                "journal_mode": self.journal_mode,
+                "read_write_split": self.split,
+                "open_connections": len(connections),
+                "connections_opened": self.connections_opened,
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_connection_pool(db_path, settings):
+    """Return the process-wide connection pool of a database file.
+
+    The schema is created when the pool of a file is first requested; the
+    profile of that first request applies to every connection of the file,
+    and a later request with different settings is logged as a warning.
+    """
+    with _pools_lock:
+        if db_path not in _pools:
+            _pools[db_path] = ConnectionPool(db_path, settings)
+        pool = _pools[db_path]
+    if settings != pool.settings:
+        logging.warning(f"⚠️ Connection pool of {db_path} already uses {pool.settings}, "
+                        f"ignoring the requested profile {settings}")
+    return pool
@@ -11,51 +11,103 @@ import logging
 
 # Add project root to path to allow imports from config
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
-from config.settings import DB_PATH
+from config.settings import DB_PATH, USER_CACHE_SIZE, USER_CACHE_TTL, SQLITE_PROFILE, SQLITE_PROFILES
 
 # Import schema definitions
-from src.database.schema import USERS_TABLE, ATTENDANCE_TABLE, INDEXES, TRIGGERS, QUERY_EXAMPLES
+from src.database.schema import QUERY_EXAMPLES
+from src.database.connection_pool import get_connection_pool
+from src.database.user_cache import get_user_directory, MISSING
+
+# RETURNING needs SQLite 3.35, older libraries record a batch row by row
+SQLITE_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+# Events per INSERT statement, within SQLite's default limit of 999 parameters
+ATTENDANCE_STATEMENT_ROWS = 200
 
 class DatabaseManager:
-    def __init__(self):
-        """Initialize database connection and create tables if they don't exist."""
-        self.conn = None
-        self.cursor = None
+    def __init__(self, db_path=DB_PATH, profile=SQLITE_PROFILE):
+        """Attach to the process-wide connection pool of a database file.
+        
+        The first manager of a file creates the pool and the tables; later
+        managers reuse both, so constructing one is cheap.
+        
+        Args:
+            db_path: SQLite database file (defaults to DB_PATH)
+            profile: Connection profile, a name in SQLITE_PROFILES or a dict
+                of PRAGMA values (defaults to SQLITE_PROFILE); the first
+                manager of a file sets the profile of its pool
+        """
+        self.db_path = db_path
+        self.profile = profile
         self.connect()
-        self.create_tables()
+        
+        # User details are served from a process-wide cache, loaded once
+        self.user_cache = get_user_directory(db_path, USER_CACHE_SIZE, USER_CACHE_TTL)
+        if not self.user_cache.entries:
+            self.preload_users()
 
     def connect(self):
-        """Connect to the SQLite database."""
-        try:
-            # Enable foreign key support
-            self.conn = sqlite3.connect(DB_PATH)
-            self.conn.execute("PRAGMA foreign_keys = ON")
-            self.cursor = self.conn.cursor()
-            logging.info(f"✅ Connected to database: {DB_PATH}")
-        except sqlite3.Error as e:
-            logging.error(f"❌ Database connection error: {e}")
-            raise
+        """Connect to the SQLite database through its connection pool."""
+        settings = SQLITE_PROFILES[self.profile] if isinstance(self.profile, str) else self.profile
+        self.pool = get_connection_pool(self.db_path, settings)
+        self.journal_mode = self.pool.journal_mode
+
+    @property
+    def conn(self):
+        """The calling thread's read-write connection."""
+        return self.pool.connection()
+
+    @property
+    def cursor(self):
+        """The calling thread's cursor on its read-write connection."""
+        return self.pool.cursor()
+
+    @property
+    def read_cursor(self):
+        """The calling thread's cursor for queries (a separate connection in WAL mode)."""
+        return self.pool.cursor(read_only=True)
 
     def create_tables(self):
         """Create necessary tables if they don't exist."""
+        self.pool.create_schema()
+
+    def preload_users(self):
+        """Load the user directory cache with up to its capacity of users."""
         try:
-            # Create tables from schema definitions
-            self.cursor.execute(USERS_TABLE)
-            self.cursor.execute(ATTENDANCE_TABLE)
-            
-            # Create indexes for query optimization
-            for index in INDEXES:
-                self.cursor.execute(index)
-                
-            # Create triggers
-            for trigger in TRIGGERS:
-                self.cursor.execute(trigger)
-                
-            self.conn.commit()
-            logging.info("✅ Database tables, indexes, and triggers created successfully")
+            cursor = self.read_cursor
+            cursor.execute(
+                "SELECT id, name, enrollment_date, last_updated, active FROM users LIMIT ?",
+                (self.user_cache.capacity,)
+            )
+            self.user_cache.load(self._user_details(row) for row in cursor.fetchall())
         except sqlite3.Error as e:
-            logging.error(f"❌ Error creating database structure: {e}")
-            raise
+            logging.error(f"❌ Error loading user directory: {e}")
+
+    @staticmethod
+    def _user_details(row):
+        """Convert a users row to a user details dict."""
+        return {
+            'id': row[0],
+            'name': row[1],
+            'enrollment_date': row[2],
+            'last_updated': row[3],
+            'active': bool(row[4])
+        }
+
+    def get_cache_stats(self):
+        """Get hit/miss statistics of the user directory cache.
+        
+        Returns:
+            dict: Cached users, capacity, hits, misses, hit rate and evictions
+        """
+        return self.user_cache.get_stats()
+
+    def get_pool_stats(self):
+        """Get the connection statistics of the database file's pool.
+        
+        Returns:
+            dict: Journal mode, reader/writer split, open and opened connections
+        """
+        return self.pool.get_stats()
 
     def _execute_with_transaction(self, query, params=None):
         """Execute a query with proper transaction handling.
@@ -92,8 +144,9 @@ class DatabaseManager:
             bool: True if the user ID already exists, False otherwise
         """
         try:
-            self.cursor.execute("SELECT id FROM users WHERE id=?", (user_id,))
-            result = self.cursor.fetchone()
+            cursor = self.read_cursor
+            cursor.execute("SELECT id FROM users WHERE id=?", (user_id,))
+            result = cursor.fetchone()
             return result is not None
         except sqlite3.Error as e:
             logging.error(f"❌ Error checking if user exists: {e}")
@@ -114,6 +167,7 @@ class DatabaseManager:
                 "INSERT INTO users (id, name) VALUES (?, ?)",
                 (user_id, name)
             )
+            self.user_cache.invalidate(user_id)
             logging.info(f"✅ User registered: {name} (ID: {user_id})")
             return True
         except sqlite3.Error as e:
@@ -135,6 +189,7 @@ class DatabaseManager:
                 "UPDATE users SET name=? WHERE id=?",
                 (name, user_id)
             )
+            self.user_cache.invalidate(user_id)
             return self.cursor.rowcount > 0
         except sqlite3.Error as e:
             logging.error(f"❌ Error updating user: {e}")
@@ -154,6 +209,7 @@ class DatabaseManager:
                 "UPDATE users SET active=0 WHERE id=?",
                 (user_id,)
             )
+            self.user_cache.invalidate(user_id)
             return self.cursor.rowcount > 0
         except sqlite3.Error as e:
             logging.error(f"❌ Error deactivating user: {e}")
@@ -173,6 +229,7 @@ class DatabaseManager:
                 "UPDATE users SET active=1 WHERE id=?",
                 (user_id,)
             )
+            self.user_cache.invalidate(user_id)
             return self.cursor.rowcount > 0
         except sqlite3.Error as e:
             logging.error(f"❌ Error reactivating user: {e}")
@@ -188,40 +245,103 @@ class DatabaseManager:
         Returns:
             bool: True if attendance was recorded, False if already recorded today or error
         """
+        # Get current date and time
+        now = datetime.now()
+        date = now.strftime("%Y-%m-%d")
+        time = now.strftime("%H:%M:%S")
+        
+        # If name not provided, get from database
+        if name is None:
+            name = self.get_user_name(user_id)
+            if name is None:
+                logging.error(f"❌ Cannot record attendance - User ID {user_id} not found")
+                return False
+        
+        results = self.record_attendance_many([(user_id, name, date, time)])
+        if results is None or results[0] is None:
+            return False
+        if results[0]:
+            logging.info(f"✅ Attendance recorded: {name} (ID: {user_id})")
+            return True
+        logging.info(f"ℹ️ Attendance already recorded today for {user_id}")
+        return False
+
+    def record_attendance_many(self, events):
+        """Record a batch of attendance events in a single transaction.
+        
+        UNIQUE(id, date) decides which events are new: each chunk of events is
+        one INSERT ... ON CONFLICT DO NOTHING RETURNING statement, so there is
+        no separate "already recorded?" query and two writers cannot both
+        record the same user on the same day.
+        
+        Args:
+            events: List of (user_id, name, date, time) tuples, with the date
+                and time of the arrival rather than of the write
+            
+        Returns:
+            list: One result per event, True if it was recorded, False if
+            attendance was already recorded that day and None if the event
+            was rejected (unknown user); None instead of a list if the batch
+            failed
+        """
         try:
-            # Get current date and time
-            now = datetime.now()
-            date = now.strftime("%Y-%m-%d")
-            time = now.strftime("%H:%M:%S")
+            if SQLITE_RETURNING:
+                results = []
+                for start in range(0, len(events), ATTENDANCE_STATEMENT_ROWS):
+                    results.extend(self._insert_attendance(events[start:start + ATTENDANCE_STATEMENT_ROWS]))
+            else:
+                results = [self._insert_attendance_row(event) for event in events]
             
-            # If name not provided, get from database
-            if name is None:
-                name = self.get_user_name(user_id)
-                if name is None:
-                    logging.error(f"❌ Cannot record attendance - User ID {user_id} not found")
-                    return False
+            # One commit (and fsync) for the whole batch
+            self.conn.commit()
+            return results
             
-            # Check if attendance already recorded for today
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            logging.error(f"❌ Error recording attendance batch: {e}")
+            return None
+
+    def _insert_attendance(self, events):
+        """Insert a chunk of events with one statement and classify each event."""
+        # Joining users skips events of unknown users instead of failing the
+        # statement on the foreign key (WHERE 1 lets SQLite parse ON CONFLICT)
+        rows = ", ".join(["(?, ?, ?, ?)"] * len(events))
+        self.cursor.execute(
+            f"""INSERT INTO attendance (id, name, date, time)
+            SELECT e.column1, e.column2, e.column3, e.column4
+            FROM (VALUES {rows}) AS e JOIN users u ON u.id = e.column1
+            WHERE 1
+            ON CONFLICT(id, date) DO NOTHING
+            RETURNING id, date""",
+            [value for event in events for value in event]
+        )
+        inserted = set(self.cursor.fetchall())
+        
+        results = []
+        for user_id, name, date, time in events:
+            if (user_id, date) in inserted:
+                # A user listed twice in the chunk is only new the first time
+                inserted.discard((user_id, date))
+                results.append(True)
+            elif self.get_user_details(user_id) is None:
+                logging.error(f"❌ Error recording attendance for {user_id}: user not found")
+                results.append(None)
+            else:
+                results.append(False)
+        return results
+
+    def _insert_attendance_row(self, event):
+        """Insert one event on SQLite versions without RETURNING."""
+        try:
             self.cursor.execute(
-                "SELECT * FROM attendance WHERE id=? AND date=?", 
-                (user_id, date)
+                "INSERT INTO attendance (id, name, date, time) VALUES (?, ?, ?, ?) ON CONFLICT(id, date) DO NOTHING",
+                event
             )
-            
-            if not self.cursor.fetchone():
-                # Record new attendance
-                self._execute_with_transaction(
-                    "INSERT INTO attendance (id, name, date, time) VALUES (?, ?, ?, ?)",
-                    (user_id, name, date, time)
-                )
-                logging.info(f"✅ Attendance recorded: {name} (ID: {user_id})")
-                return True
-            else:
-                logging.info(f"ℹ️ Attendance already recorded today for {user_id}")
-                return False
-                
-        except sqlite3.Error as e:
-            logging.error(f"❌ Error recording attendance: {e}")
-            return False
+            return self.cursor.rowcount > 0
+        except sqlite3.IntegrityError as e:
+            # Only this statement is rolled back, e.g. a deleted user
+            logging.error(f"❌ Error recording attendance for {event[0]}: {e}")
+            return None
 
     def get_user_name(self, user_id):
         """Get user name by ID.
@@ -232,13 +352,8 @@ class DatabaseManager:
         Returns:
             str: User name or None if not found
         """
-        try:
-            self.cursor.execute("SELECT name FROM users WHERE id=? AND active=1", (user_id,))
-            result = self.cursor.fetchone()
-            return result[0] if result else None
-        except sqlite3.Error as e:
-            logging.error(f"❌ Error getting user name: {e}")
-            return None
+        details = self.get_user_details(user_id)
+        return details['name'] if details and details['active'] else None
 
     def get_user_details(self, user_id):
         """Get complete user details by ID.
@@ -249,22 +364,22 @@ class DatabaseManager:
         Returns:
             dict: User details or None if not found
         """
+        details = self.user_cache.get(user_id)
+        if details is not MISSING:
+            return dict(details) if details else None
+        
         try:
-            self.cursor.execute(
+            cursor = self.read_cursor
+            cursor.execute(
                 "SELECT id, name, enrollment_date, last_updated, active FROM users WHERE id=?", 
                 (user_id,)
             )
-            result = self.cursor.fetchone()
+            result = cursor.fetchone()
             
-            if result:
-                return {
-                    'id': result[0],
-                    'name': result[1],
-                    'enrollment_date': result[2],
-                    'last_updated': result[3],
-                    'active': bool(result[4])
-                }
-            return None
+            # Unknown IDs are cached too, registering the user invalidates them
+            details = self._user_details(result) if result else None
+            self.user_cache.put(user_id, details)
+            return dict(details) if details else None
             
         except sqlite3.Error as e:
             logging.error(f"❌ Error getting user details: {e}")
@@ -280,12 +395,13 @@ class DatabaseManager:
             dict: Dictionary mapping user IDs to names
         """
         try:
+            cursor = self.read_cursor
             if active_only:
-                self.cursor.execute("SELECT id, name FROM users WHERE active=1 ORDER BY name")
+                cursor.execute("SELECT id, name FROM users WHERE active=1 ORDER BY name")
             else:
-                self.cursor.execute("SELECT id, name FROM users ORDER BY name")
+                cursor.execute("SELECT id, name FROM users ORDER BY name")
                 
-            return {row[0]: row[1] for row in self.cursor.fetchall()}
+            return {row[0]: row[1] for row in cursor.fetchall()}
             
         except sqlite3.Error as e:
             logging.error(f"❌ Error getting users: {e}")
@@ -302,6 +418,7 @@ class DatabaseManager:
             list: List of attendance records
         """
         try:
+            cursor = self.read_cursor
             query = """
                 SELECT a.id, u.name, a.date, a.time 
                 FROM attendance a
@@ -323,8 +440,8 @@ class DatabaseManager:
             # Add ordering
             query += " ORDER BY a.date DESC, a.time DESC"
             
-            self.cursor.execute(query, params)
-            return self.cursor.fetchall()
+            cursor.execute(query, params)
+            return cursor.fetchall()
             
         except sqlite3.Error as e:
             logging.error(f"❌ Error getting attendance records: {e}")
@@ -340,6 +457,7 @@ class DatabaseManager:
             list: List of statistics records
         """
         try:
+            cursor = self.read_cursor
             if period == 'daily':
                 query = """
                     SELECT date, COUNT(DISTINCT id) as student_count 
@@ -364,8 +482,8 @@ class DatabaseManager:
                     FROM attendance
                 """
                 
-            self.cursor.execute(query)
-            return self.cursor.fetchall()
+            cursor.execute(query)
+            return cursor.fetchall()
             
         except sqlite3.Error as e:
             logging.error(f"❌ Error getting attendance statistics: {e}")
@@ -381,19 +499,20 @@ class DatabaseManager:
             dict: Attendance summary for the user
         """
         try:
+            cursor = self.read_cursor
             # Get total days present
-            self.cursor.execute(
+            cursor.execute(
                 "SELECT COUNT(*) FROM attendance WHERE id=?", 
                 (user_id,)
             )
-            days_present = self.cursor.fetchone()[0]
+            days_present = cursor.fetchone()[0]
             
             # Get first and last attendance dates
-            self.cursor.execute(
+            cursor.execute(
                 "SELECT MIN(date), MAX(date) FROM attendance WHERE id=?", 
                 (user_id,)
             )
-            first_date, last_date = self.cursor.fetchone()
+            first_date, last_date = cursor.fetchone()
             
             # Get user details
             user_details = self.get_user_details(user_id)
@@ -423,6 +542,7 @@ class DatabaseManager:
                 "DELETE FROM users WHERE id=?", 
                 (user_id,)
             )
+            self.user_cache.invalidate(user_id)
             return self.cursor.rowcount > 0
             
         except sqlite3.Error as e:
@@ -430,9 +550,10 @@ class DatabaseManager:
             return False
 
     def close(self):
-        """Close the database connection."""
-        if self.conn:
-            self.conn.close()
-            self.conn = None
-            self.cursor = None
-            logging.info("✅ Database connection closed")
\ No newline at end of file
+        """Close the calling thread's database connections.
+        
+        Other managers on the same thread reopen them on next use, without
+        creating the schema again.
+        """
+        self.pool.release_thread()
+        logging.info("✅ Database connection closed")
\ No newline at end of file
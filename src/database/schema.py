@@ -63,7 +63,7 @@ QUERY_EXAMPLES = {
     "reactivate_user": "UPDATE users SET active = 1 WHERE id = ?",
     
     # Attendance management
-    "record_attendance": "INSERT INTO attendance (id, name, date, time) VALUES (?, ?, ?, ?)",
+    "record_attendance": "INSERT INTO attendance (id, name, date, time) VALUES (?, ?, ?, ?) ON CONFLICT(id, date) DO NOTHING RETURNING id, date",
     "check_attendance": "SELECT * FROM attendance WHERE id=? AND date=?",
     "get_attendance_by_date": "SELECT a.id, u.name, a.time FROM attendance a JOIN users u ON a.id = u.id WHERE a.date=? ORDER BY a.time",
     "get_attendance_by_user": "SELECT date, time FROM attendance WHERE id=? ORDER BY date DESC, time DESC",
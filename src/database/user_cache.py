@@ -0,0 +1,108 @@
+"""
+User directory cache for the Face Recognition Attendance System.
+Keeps the details of registered users in memory so recognized faces can be
+labelled without a SQLite query per face and frame.
+
+The cache is shared by every DatabaseManager of a process that uses the same
+database file, so a change made through one manager (e.g. the database
+window deactivating a user) invalidates it for all of them. Changes made by
+other processes are picked up when entries expire after the configured TTL.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+# Marks a user ID that is known not to exist
+MISSING = object()
+
+
+class UserDirectory:
+    """Bounded LRU map of user ID -> user details with hit/miss counters."""
+
+    def __init__(self, capacity=10000, ttl=300.0):
+        """Create an empty directory.
+
+        Args:
+            capacity: Maximum number of users kept, least recently used
+                entries are evicted first
+            ttl: Seconds after which an entry is reloaded from the database
+                (None keeps entries until they are invalidated or evicted)
+        """
+        self.capacity = capacity
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, user_id):
+        """Return the cached details of a user.
+
+        Returns:
+            The details dict, None for a user known not to exist, or MISSING
+            when the user has to be loaded from the database
+        """
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None or (self.ttl is not None and time.monotonic() - entry[1] > self.ttl):
+                self.misses += 1
+                return MISSING
+            self.entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, user_id, details):
+        """Store the details of a user (None records that the user does not exist)."""
+        with self.lock:
+            self.entries[user_id] = (details, time.monotonic())
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def load(self, users):
+        """Fill the directory with the details of many users at once.
+
+        Args:
+            users: Iterable of user details dicts with an 'id' key
+        """
+        for details in users:
+            self.put(details['id'], details)
+
+    def invalidate(self, user_id=None):
+        """Forget one user, or every user if user_id is None."""
+        with self.lock:
+            if user_id is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(user_id, None)
+
+    def get_stats(self):
+        """Report the size and hit rate of the directory.
+
+        Returns:
+            dict: Cached users, capacity, hits, misses, hit rate and evictions
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self.entries),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+_directories = {}
+_directories_lock = threading.Lock()
+
+def get_user_directory(db_path, capacity=10000, ttl=300.0):
+    """Return the process-wide user directory of a database file."""
+    with _directories_lock:
+        if db_path not in _directories:
+            _directories[db_path] = UserDirectory(capacity, ttl)
+        return _directories[db_path]
@@ -0,0 +1,279 @@
+"""
+Headless attendance service for the Face Recognition Attendance System.
+Runs the capture -> detect -> recognize -> record loop without the GUI, for
+gate cameras that do not need a display. Only the core modules are imported
+(no PyQt5, matplotlib or pandas), so the service starts quickly and uses
+much less memory than app.py.
+
+Usage:
+    python -m src.service.attendance_daemon
+    python -m src.service.attendance_daemon --source rtsp://gate-camera/stream --log-format json
+    python -m src.service.attendance_daemon --source recording.mp4 --fast --stats-interval 5
+    python -m src.service.attendance_daemon --source 0 1 rtsp://gate-camera/stream
+
+SIGINT and SIGTERM stop the loop after the current frame; the camera, the
+recognition workers and the database connection are then closed cleanly.
+"""
+
+import argparse
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+
+# Add project root to path to allow imports from src and config
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.core.attendance import AttendanceProcessor
+from src.core.frame_source import open_source
+from src.core.multi_camera import MultiCameraRunner
+from src.core.pipeline import run_source
+from config.settings import CAMERA_INDEX, FRAME_SOURCE, RECOGNITION_WORKERS, DB_PATH
+
+logger = logging.getLogger('AttendanceDaemon')
+
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as one JSON object per line."""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        # Fields passed with extra={"fields": {...}}
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class LogWriter:
+    """File-like object that turns printed lines into log records.
+
+    The core modules report progress with print(); redirecting stdout here
+    keeps all service output in the configured log format.
+    """
+
+    def __init__(self, log):
+        self.log = log
+        self.buffer = ""
+
+    def write(self, text):
+        self.buffer += text
+        while "\n" in self.buffer:
+            line, self.buffer = self.buffer.split("\n", 1)
+            if line.strip():
+                level = logging.WARNING if line.startswith(("⚠️", "❌")) else logging.INFO
+                self.log.log(level, line)
+
+    def flush(self):
+        pass
+
+
+def setup_logging(log_format="text", log_file=None, level=logging.INFO):
+    """Configure the root logger for the service.
+
+    Args:
+        log_format: "text" or "json" (one object per line)
+        log_file: Optional file the log is also written to
+        level: Minimum level logged
+    """
+    handlers = [logging.StreamHandler(sys.stderr)]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file, encoding='utf-8'))
+
+    if log_format == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    logging.basicConfig(level=level, handlers=handlers, force=True)
+
+
+class AttendanceDaemon:
+    """Runs frame sources through the attendance processing until stopped."""
+
+    def __init__(self, source, workers=RECOGNITION_WORKERS, db_path=DB_PATH, realtime=True,
+                 stats_interval=60.0, max_frames=None):
+        """Prepare the service (the camera and models load in run()).
+
+        Args:
+            source: Camera index, video file, stream URL or image folder
+            workers: Recognition worker processes
+            db_path: SQLite database attendance is recorded in
+            realtime: Play recordings at their frame rate, False replays them
+                as fast as possible
+            stats_interval: Seconds between statistics log entries
+            max_frames: Stop after this many frames (None runs until stopped)
+        """
+        self.source_spec = source
+        self.workers = workers
+        self.db_path = db_path
+        self.realtime = realtime
+        self.stats_interval = stats_interval
+        self.max_frames = max_frames
+        self.stop_event = threading.Event()
+        self.processor = None
+        self.source = None
+        self.frames = 0
+        self.last_stats = time.perf_counter()
+        self.last_stats_frames = 0
+
+    def stop(self, signum=None, frame=None):
+        """Ask the loop to stop after the current frame (also the signal handler)."""
+        if signum is not None:
+            logger.info(f"🔄 Received {signal.Signals(signum).name}, shutting down",
+                        extra={"fields": {"event": "shutdown", "signal": signal.Signals(signum).name}})
+        self.stop_event.set()
+
+    def on_result(self, frame, face_count):
+        """Count processed frames and log statistics periodically."""
+        self.frames += 1
+        now = time.perf_counter()
+        if now - self.last_stats >= self.stats_interval:
+            self.log_stats(now)
+
+    def log_stats(self, now):
+        """Log the frame rate since the last entry and the attendance statistics."""
+        fps = (self.frames - self.last_stats_frames) / max(now - self.last_stats, 1e-9)
+        scheduler = self.processor.scheduler.get_stats()
+        stats = self.processor.daily_stats
+        fields = {
+            "event": "stats",
+            "frames": self.frames,
+            "fps": round(fps, 2),
+            "detection_interval": scheduler["interval"],
+            "detection_ms": round(scheduler["processing_ms"], 2),
+            "motion_gated_frames": self.processor.gated_frames,
+            "attendance_recorded": stats["attendance_recorded"],
+            "strangers_detected": stats["strangers_detected"],
+        }
+        logger.info(f"📊 {fps:.1f} fps, {stats['attendance_recorded']} attendance records",
+                    extra={"fields": fields})
+        self.last_stats = now
+        self.last_stats_frames = self.frames
+
+    def run(self):
+        """Open the source and process frames until stopped or the source ends.
+
+        Returns:
+            int: Process exit code (0 on a clean shutdown)
+        """
+        start = time.perf_counter()
+        self.source = open_source(self.source_spec, realtime=self.realtime)
+        if not self.source.is_opened():
+            logger.error(f"❌ Could not open frame source: {self.source_spec}",
+                         extra={"fields": {"event": "error", "source": str(self.source_spec)}})
+            return 1
+
+        try:
+            self.processor = AttendanceProcessor(self.workers, self.db_path)
+            logger.info(f"✅ Attendance service started on {self.source.describe()} "
+                        f"in {time.perf_counter() - start:.2f} s",
+                        extra={"fields": {"event": "started", "source": self.source.describe(),
+                                          "workers": self.workers,
+                                          "startup_s": round(time.perf_counter() - start, 3)}})
+
+            result = run_source(self.source, self.processor, self.max_frames, self.on_result, self.stop_event)
+            self.log_stats(time.perf_counter())
+            logger.info(f"✅ Attendance service stopped after {result['frames']} frames",
+                        extra={"fields": {"event": "stopped", "frames": result["frames"],
+                                          "seconds": round(result["seconds"], 2)}})
+            return 0
+        except Exception:
+            logger.exception("❌ Attendance service failed", extra={"fields": {"event": "error"}})
+            return 1
+        finally:
+            if self.processor is not None:
+                self.processor.close()
+            self.source.release()
+
+    def run_cameras(self, sources):
+        """Serve several sources with one shared gallery and database until stopped.
+
+        Args:
+            sources: Camera indices, video files, stream URLs or image folders
+
+        Returns:
+            int: Process exit code (0 on a clean shutdown)
+        """
+        start = time.perf_counter()
+        runner = MultiCameraRunner(sources, self.db_path, self.realtime)
+        if not runner.streams:
+            logger.error("❌ Could not open any frame source", extra={"fields": {"event": "error"}})
+            runner.close()
+            return 1
+
+        logger.info(f"✅ Attendance service started on {len(runner.streams)} cameras "
+                    f"in {time.perf_counter() - start:.2f} s",
+                    extra={"fields": {"event": "started",
+                                      "sources": [stream.source.describe() for stream in runner.streams],
+                                      "startup_s": round(time.perf_counter() - start, 3)}})
+
+        # Recognition runs on its own thread, this one handles signals and statistics
+        thread = threading.Thread(target=runner.run, args=(self.stop_event, None, self.max_frames),
+                                  name="MultiCamera")
+        thread.start()
+        try:
+            while thread.is_alive():
+                thread.join(self.stats_interval)
+                self.log_camera_stats(runner)
+            return 0
+        finally:
+            self.stop_event.set()
+            thread.join()
+            runner.close()
+            logger.info("✅ Attendance service stopped", extra={"fields": {"event": "stopped"}})
+
+    def log_camera_stats(self, runner):
+        """Log the frame rates of every camera of a MultiCameraRunner."""
+        for name, stats in runner.get_stats().items():
+            fields = {"event": "stats", "stream": name}
+            fields.update({key: round(value, 2) if isinstance(value, float) else value
+                           for key, value in stats.items()})
+            logger.info(f"📊 {name}: {stats['processed_fps']:.1f} fps processed of "
+                        f"{stats['capture_fps']:.1f} fps captured", extra={"fields": fields})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless face recognition attendance service")
+    parser.add_argument("--source", nargs="+", default=[FRAME_SOURCE if FRAME_SOURCE is not None else CAMERA_INDEX],
+                        help="Camera index, video file, RTSP/HTTP URL or image folder (several run as multi-camera)")
+    parser.add_argument("--workers", type=int, default=RECOGNITION_WORKERS,
+                        help="Recognition worker processes (single source only)")
+    parser.add_argument("--database", default=DB_PATH, help="SQLite database file")
+    parser.add_argument("--fast", action="store_true", help="Replay recordings as fast as possible")
+    parser.add_argument("--max-frames", type=int, default=None, help="Stop after this many frames (per source)")
+    parser.add_argument("--stats-interval", type=float, default=60.0, help="Seconds between statistics entries")
+    parser.add_argument("--log-format", choices=["text", "json"], default="text", help="Log line format")
+    parser.add_argument("--log-file", help="Also write the log to this file")
+    args = parser.parse_args()
+    if len(args.source) > 1 and args.workers > 0:
+        # The cameras share one in-process recognizer, worker processes serve a single source
+        parser.error("--workers must be 0 with several sources (multi-camera mode recognizes in-process)")
+
+    setup_logging(args.log_format, args.log_file)
+    daemon = AttendanceDaemon(args.source[0], args.workers, args.database, not args.fast,
+                              args.stats_interval, args.max_frames)
+    signal.signal(signal.SIGINT, daemon.stop)
+    signal.signal(signal.SIGTERM, daemon.stop)
+
+    # Route the core modules' printed progress through the log
+    stdout = sys.stdout
+    sys.stdout = LogWriter(logging.getLogger('AttendanceCore'))
+    try:
+        if len(args.source) > 1:
+            return daemon.run_cameras(args.source)
+        return daemon.run()
+    finally:
+        sys.stdout = stdout
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,8 @@
 Attendance window UI for Face Recognition Attendance System.
 """
 
+import threading
+
 import cv2
 from PyQt5.QtWidgets import (QWidget, QLabel, QVBoxLayout, QPushButton, 
                            QHBoxLayout, QFrame, QScrollArea, QGridLayout)
@@ -9,9 +11,11 @@ from PyQt5.QtGui import QImage, QPixmap
 from PyQt5.QtCore import QTimer, Qt, QSize
 
 from src.core.attendance import AttendanceProcessor
+from src.core.pipeline import FramePipeline
+from src.core.frame_source import open_source
 from src.ui.style import MAIN_STYLE, TITLE_STYLE, CARD_STYLE, MAIN_BUTTON_STYLE
 from src.ui.icons import get_camera_icon
-from config.settings import CAMERA_INDEX
+from config.settings import CAMERA_INDEX, FRAME_SOURCE
 
 class AttendanceWindow(QWidget):
     def __init__(self):
@@ -115,6 +119,12 @@ class AttendanceWindow(QWidget):
         
         self.status_label = QLabel("System ready")
         status_layout.addWidget(self.status_label)
+        status_layout.addStretch()
+        
+        # Pipeline stage latency and queue depth
+        self.pipeline_label = QLabel("")
+        self.pipeline_label.setStyleSheet("color: #666;")
+        status_layout.addWidget(self.pipeline_label)
         
         main_layout.addWidget(status_bar)
         
@@ -122,27 +132,35 @@ class AttendanceWindow(QWidget):
         self.processor = AttendanceProcessor()
         self.attendance_records = set()  # Keep track of logged attendance for display
         
-        # Start camera with configured index
-        self.cap = cv2.VideoCapture(CAMERA_INDEX)
-        if self.cap.isOpened():
+        # Start camera with configured index, or replay the configured recording
+        self.cap = open_source(FRAME_SOURCE if FRAME_SOURCE is not None else CAMERA_INDEX)
+        if self.cap.is_opened():
             self.camera_status.setText("Camera active. Detecting faces...")
         else:
             self.camera_status.setText("Error: Could not open camera")
             self.status_label.setText("Camera error")
             
+        # Capture and recognition run on background threads, this window only displays
+        self.pipeline = FramePipeline(self.cap, self.processor)
+        self.camera_stopped = False
+        if self.cap.is_opened():
+            self.pipeline.start()
+        
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_frame)
         self.timer.start(30)  # 30ms refresh rate (approx. 33 fps)
 
     def update_frame(self):
-        """Update the camera feed frame and process for attendance."""
-        ret, frame = self.cap.read()
-        if not ret:
+        """Display the newest processed frame from the pipeline."""
+        if self.pipeline.finished:
+            self.camera_status.setText("Recording finished")
+        elif self.pipeline.capture_error:
             self.camera_status.setText("Error: Could not read from camera")
+            
+        result = self.pipeline.get_result()
+        if result is None:
             return
-
-        # Process frame for attendance (detect and recognize faces)
-        frame, face_count = self.processor.process_frame(frame)
+        frame, face_count = result
         
         # Update status based on faces detected
         if face_count > 0:
@@ -166,24 +184,27 @@ class AttendanceWindow(QWidget):
         
         # Update attendance records display
         self.update_attendance_display()
+        
+        # Show per-stage latency and queue depth
+        self.pipeline_label.setText(self.pipeline.format_stats())
 
     def update_attendance_display(self):
         """Update the attendance records display."""
-        # Get the current attendance records from the processor
-        if hasattr(self.processor, 'logged_users') and self.processor.logged_users:
+        # Copy the records, the recognition thread keeps adding to them
+        logged_names = dict(self.processor.logged_names)
+        attendance_status = dict(self.processor.attendance_status)
+        if logged_names:
             # If new records are found
-            if len(self.processor.logged_users) > len(self.attendance_records):
+            if len(logged_names) > len(self.attendance_records):
                 # Clear the no records label
                 if self.no_records_label.isVisible():
                     self.no_records_label.setVisible(False)
                 
                 # Add new records
-                for user_id in self.processor.logged_users:
+                for user_id, name in logged_names.items():
                     if user_id not in self.attendance_records:
                         self.attendance_records.add(user_id)
                         
-                        # Get user name
-                        name = self.processor.db_manager.get_user_name(str(user_id))
                         if not name:
                             name = f"User {user_id}"
                         
@@ -203,21 +224,46 @@ class AttendanceWindow(QWidget):
                         record_layout.addWidget(name_label, 0, 0)
                         record_layout.addWidget(id_label, 1, 0)
                         
-                        status_label = QLabel("Present ✓")
-                        status_label.setStyleSheet("color: green; font-weight: bold;")
+                        # Users who checked in earlier today (e.g. before a restart) are listed too
+                        if attendance_status.get(user_id, True):
+                            status_label = QLabel("Present ✓")
+                            status_label.setStyleSheet("color: green; font-weight: bold;")
+                            status_text = f"Attendance recorded for {name}"
+                        else:
+                            status_label = QLabel("Already recorded ✓")
+                            status_label.setStyleSheet("color: #b36b00; font-weight: bold;")
+                            status_text = f"Attendance already recorded today for {name}"
                         record_layout.addWidget(status_label, 0, 1, 2, 1, Qt.AlignRight)
                         
                         self.attendance_layout.addWidget(record_frame)
                         
                         # Update status
-                        self.status_label.setText(f"Attendance recorded for {name}")
+                        self.status_label.setText(status_text)
 
     def stop_camera(self):
         """Stop the camera and release resources."""
+        # The stop button closes the window, which stops the camera again
+        if self.camera_stopped:
+            return
+        self.camera_stopped = True
         self.timer.stop()
+        if self.pipeline.stop():
+            self.release_resources()
+        else:
+            # A thread is still inside read() or process_frames(), release once it returns
+            print("⚠️ Pipeline still busy, releasing the camera once it stops")
+            threading.Thread(target=self.release_when_stopped, name="PipelineShutdown").start()
+        self.close()
+
+    def release_when_stopped(self):
+        """Wait for the pipeline threads to exit, then release the camera and processor."""
+        self.pipeline.stop(timeout=None)
+        self.release_resources()
+
+    def release_resources(self):
+        """Release the camera and close the processor (pipeline threads must have exited)."""
         self.cap.release()
         self.processor.close()
-        self.close()
         
     def closeEvent(self, event):
         """Handle window close event."""
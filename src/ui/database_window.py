@@ -210,7 +210,7 @@ class DatabaseWindow(QWidget):
             self.status_label.setText("Loading students...")
             
             # Get all students, including inactive ones
-            self.cursor = self.db_manager.conn.cursor()
+            self.cursor = self.db_manager.read_cursor
             self.cursor.execute(
                 "SELECT id, name, enrollment_date, last_updated, active FROM users ORDER BY name"
             )
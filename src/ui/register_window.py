@@ -12,6 +12,7 @@ from PyQt5.QtGui import QPixmap
 
 from src.database.db_manager import DatabaseManager
 from src.core.model_training import ModelTrainer
+from src.core.face_detector import get_face_detector
 from config.settings import DATASET_DIR, FACE_SAMPLE_COUNT, CAMERA_INDEX
 from src.ui.style import MAIN_STYLE, TITLE_STYLE, CARD_STYLE, MAIN_BUTTON_STYLE
 from src.ui.icons import get_user_plus_icon, get_check_icon
@@ -254,7 +255,7 @@ class RegisterWindow(QWidget):
                 return None, None
                 
             gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            faces = face_detector.detectMultiScale(gray, 1.3, 5)
+            faces = face_detector.detect(img)
             
             if len(faces) >= min_faces:
                 return img, gray
@@ -280,7 +281,7 @@ class RegisterWindow(QWidget):
             
             # Initialize camera with configured index
             cam = cv2.VideoCapture(CAMERA_INDEX)
-            face_detector = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
+            face_detector = get_face_detector()
 
             # Create dataset directory if it doesn't exist
             if not os.path.exists(DATASET_DIR):
@@ -326,7 +327,7 @@ class RegisterWindow(QWidget):
                     if img is None:
                         break
                     
-                    faces = face_detector.detectMultiScale(gray, 1.3, 5)
+                    faces = face_detector.detect(img)
                     
                     if len(faces) > 0:
                         # Only process the first detected face
@@ -0,0 +1,72 @@
+"""
+Vector utility functions for Face Recognition Attendance System.
+"""
+import numpy as np
+
+def l2_normalize(vectors):
+    """
+    L2-normalize the rows of a 2-D array (zero rows are left unchanged).
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+def assign_to_centroids(vectors, centroids, bias=None, chunk_size=8192):
+    """
+    Assign each row to the centroid with the highest dot product.
+    An optional per-centroid bias is subtracted from the scores, which lets
+    callers assign mean-centred vectors without copying them.
+    Returns (assignments, similarities) arrays of length N.
+    """
+    assignments = np.empty(len(vectors), dtype=np.int32)
+    similarities = np.empty(len(vectors), dtype=np.float32)
+
+    # Work in chunks to bound the size of the score matrix
+    for start in range(0, len(vectors), chunk_size):
+        chunk = np.asarray(vectors[start:start + chunk_size], dtype=np.float32)
+        scores = chunk @ centroids.T
+        if bias is not None:
+            scores -= bias
+        assignments[start:start + len(chunk)] = np.argmax(scores, axis=1)
+        similarities[start:start + len(chunk)] = np.max(scores, axis=1)
+
+    return assignments, similarities
+
+def spherical_kmeans(vectors, n_clusters, n_iter=10, sample_size=None, seed=0):
+    """
+    Cluster L2-normalized vectors by cosine similarity.
+    Centroids are re-normalized after every update, so they can be searched
+    with dot products like the vectors themselves.
+    Returns a (n_clusters, D) float32 array of unit-length centroids.
+    """
+    rng = np.random.default_rng(seed)
+    n_clusters = max(1, min(n_clusters, len(vectors)))
+
+    # Optionally train on a random subset to bound the clustering cost
+    if sample_size is not None and len(vectors) > sample_size:
+        rows = np.sort(rng.choice(len(vectors), sample_size, replace=False))
+        sample = np.asarray(vectors[rows], dtype=np.float32)
+    else:
+        sample = np.asarray(vectors, dtype=np.float32)
+
+    centroids = sample[rng.choice(len(sample), n_clusters, replace=False)].copy()
+
+    for _ in range(n_iter):
+        assignments, _ = assign_to_centroids(sample, centroids)
+
+        # Sum the members of each cluster with one sorted reduction
+        order = np.argsort(assignments, kind='stable')
+        counts = np.bincount(assignments, minlength=n_clusters)
+        non_empty = np.flatnonzero(counts)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[non_empty]
+        sums = np.add.reduceat(sample[order], starts, axis=0)
+
+        centroids[non_empty] = l2_normalize(sums)
+
+        # Re-seed empty clusters with random samples
+        empty = np.flatnonzero(counts == 0)
+        if len(empty) > 0:
+            centroids[empty] = sample[rng.choice(len(sample), len(empty), replace=False)]
+
+    return centroids
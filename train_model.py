@@ -16,7 +16,7 @@ logger = logging.getLogger('ModelTrainer')
 # Add project root to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from src.core.model_training import ModelTrainer
-from config.settings import DATASET_DIR, MODELS_DIR, EMBEDDINGS_PATH
+from config.settings import DATASET_DIR, MODELS_DIR, EMBEDDINGS_PATH, EMBEDDINGS_STORE_PATH, EMBEDDINGS_SEGMENTS_DIR
 
 def train_model():
     """Extract face features from images and build the KNN recognition model."""
@@ -32,7 +32,7 @@ def train_model():
     image_count = len([f for f in os.listdir(DATASET_DIR) if os.path.isfile(os.path.join(DATASET_DIR, f))])
     if image_count == 0:
         # If no new images but we have existing features, we're good
-        if os.path.exists(EMBEDDINGS_PATH):
+        if any(os.path.exists(path) for path in (EMBEDDINGS_STORE_PATH, EMBEDDINGS_PATH, EMBEDDINGS_SEGMENTS_DIR)):
             logger.info("✅ No new images to process, using existing features.")
             print("✅ No new images to process. Using existing face features.")
             return True